@@ -0,0 +1,133 @@
+"""
+End-to-end agent benchmark without a model: runs the Main_program agent against the fake
+Ollama server (Benchmarks/fake_ollama.py) and the embedded SQLite copy of the dump.
+
+With scripted completions and a fixed per-token delay, the remaining variation is the
+agent's own overhead (prompt building, output parsing, tool dispatch), which is reported per
+question together with LLM/tool call counts, parsing-error retries and model load time.
+--load-delay simulates a cold model load and --warm runs the startup warm-up first.
+--async runs the agent with ainvoke(), so planner steps with several tool calls run them concurrently.
+
+    python Benchmarks/agent_benchmark.py --token-delay 0.01 --repeats 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "Main_program"))
+
+import db_pool
+from agent_factory import (build_tools, build_system_prompt, build_model, build_cascade_model, build_agent,
+                           ToolSubsetAgents, warm_model, get_warmup_status)
+from agent_tracing import AgentTraceHandler
+from fake_ollama import start_server, load_script, load_recordings
+from tool_benchmark import DEFAULT_PINNED_TIME, pin_clock, percentile
+
+DEFAULT_SCRIPT = os.path.join(BENCHMARKS_DIR, "agent_script.json")
+
+# Questions matched by the rules in agent_script.json (one tool call, two calls, a parse retry, ...)
+BENCHMARK_QUESTIONS = [
+    "is abhay free now?",
+    "show geeta's weekly timetable",
+    "who works on machine learning research?",
+    "what is the email of sandeep singh?",
+    "give me the availability of sandeep",
+    "are abhay and geeta both free?",
+    "when is abhay next free?",
+    "what is the canteen menu today?",
+]
+
+
+def run_question(agent, question, use_async=False):
+    tracer = AgentTraceHandler(question)
+    if use_async:
+        asyncio.run(agent.ainvoke(question, config={"callbacks": [tracer]}))
+    else:
+        agent.invoke(question, config={"callbacks": [tracer]})
+    tracer.finish()
+    summary = tracer.summary()
+    summary["overhead_ms"] = round(summary["total_ms"] - summary["llm_ms"] - summary["tool_ms"], 1)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the agent against a fake Ollama server.")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT)
+    parser.add_argument("--recordings", help="JSONL of recorded completions (see fake_ollama.py --record)")
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--load-delay", type=float, default=0.0)
+    parser.add_argument("--prompt-token-delay", type=float, default=0.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--at", default=DEFAULT_PINNED_TIME, help="Pinned 'now' for the tools (YYYY-MM-DD HH:MM)")
+    parser.add_argument("--cascade", action="store_true", help="Use the small-to-large model cascade")
+    parser.add_argument("--select-tools", action="store_true", help="Offer each question only its top-k tools")
+    parser.add_argument("--no-planner", action="store_true", help="One tool call per step (plain ReAct format)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run the agent with ainvoke()")
+    parser.add_argument("--warm", action="store_true", help="Warm up the model(s) before the first question")
+    parser.add_argument("--output", help="Write the per-question results to this JSON file")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    pin_clock(datetime.strptime(args.at, "%Y-%m-%d %H:%M"))
+    db_pool.configure_pool(backend="sqlite")
+
+    server = start_server(script=load_script(args.script), recordings=load_recordings(args.recordings),
+                          token_delay=args.token_delay, load_delay=args.load_delay,
+                          prompt_token_delay=args.prompt_token_delay)
+    tools = build_tools()
+    system_prompt = build_system_prompt()
+    if args.cascade:
+        model = build_cascade_model(system_prompt, tools, base_url=server.base_url)
+    else:
+        model = build_model(system_prompt, base_url=server.base_url)
+    agent = build_agent(model, tools, system_prompt, [], planner=not args.no_planner)
+    agent.verbose = False
+    subset_agents = ToolSubsetAgents(model, tools, planner=not args.no_planner) if args.select_tools else None
+    if args.warm:
+        warm_model(model, agent)
+        print(f"Warm-up: {get_warmup_status()}")
+
+    results = {}
+    print(f"{'question':42} {'total':>8} {'llm':>8} {'tool':>7} {'overhead':>8} {'llm#':>5} {'tool#':>5} "
+          f"{'retry':>5} {'prompt tok':>10} {'load':>7}")
+    for question in BENCHMARK_QUESTIONS:
+        question_agent = subset_agents.for_question(question)[0] if subset_agents else agent
+        question_agent.verbose = False
+        runs = [run_question(question_agent, question, args.use_async) for _ in range(args.repeats)]
+        row = {
+            "total_ms_p50": percentile([r["total_ms"] for r in runs], 0.5),
+            "total_ms_p95": percentile([r["total_ms"] for r in runs], 0.95),
+            "llm_ms_p50": percentile([r["llm_ms"] for r in runs], 0.5),
+            "tool_ms_p50": percentile([r["tool_ms"] for r in runs], 0.5),
+            "overhead_ms_p50": percentile([r["overhead_ms"] for r in runs], 0.5),
+            "llm_calls": runs[-1]["llm_calls"],
+            "tool_calls": runs[-1]["tool_calls"],
+            "parse_retries": runs[-1]["parse_retries"],
+            "prompt_tokens": round(statistics.fmean(r["prompt_tokens"] for r in runs)),
+            "load_ms_max": max(r["load_ms"] for r in runs),
+        }
+        results[question] = row
+        print(f"{question[:42]:42} {row['total_ms_p50']:8.1f} {row['llm_ms_p50']:8.1f} {row['tool_ms_p50']:7.1f} "
+              f"{row['overhead_ms_p50']:8.1f} {row['llm_calls']:5} {row['tool_calls']:5} {row['parse_retries']:5} "
+              f"{row['prompt_tokens']:10} {row['load_ms_max']:7.1f}")
+
+    print(f"\nFake server: {server.stats}")
+    if args.cascade:
+        print(f"Cascade: {json.dumps(model.get_stats()['tiers'], indent=2)}")
+    if subset_agents:
+        print(f"Tool selection: {json.dumps(subset_agents.get_stats(), indent=2)}")
+    server.shutdown()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"token_delay": args.token_delay, "repeats": args.repeats, "questions": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+"""
+Local stand-in for the Ollama HTTP API, for deterministic agent performance tests.
+
+Serves /api/generate and /api/chat (streamed NDJSON or single JSON), /api/tags, /api/version
+and /api/ps. Completions come from, in order:
+
+  1. recordings  - JSONL of {"prompt": ..., "response": ...} (exact prompt match), written by
+                   --record while proxying to a real Ollama server;
+  2. a script    - JSON {"rules": [{"match": regex, "steps": [...]}], "default": "..."}.
+                   The regex is tried against the ReAct "Question:" line (or the last chat
+                   message); steps[n] is answered after n observations. "{observation}" is
+                   replaced with the text of the last observation and "{observations}" with
+                   all of them. A rule with a "model" regex only applies to matching models
+                   (e.g. a weaker small model), one with a "prompt" regex only to prompts
+                   containing it (e.g. the planner format instructions);
+  3. the script's "default" completion.
+
+Each completion is streamed word by word with --token-delay seconds between chunks. Like the
+real server, a model stays loaded for the request's keep_alive (default 5m, negative = forever;
+a string needs a unit, "-1" gets a 400 like from Ollama)
+and the first request after that waits --load-delay seconds (a cold model load). The prompt
+prefix shared with the model's previous prompt counts as cached: only the remaining tokens are
+reported in prompt_eval_count and pay --prompt-token-delay each.
+
+    python Benchmarks/fake_ollama.py --port 11435 --script Benchmarks/agent_script.json --token-delay 0.02
+    OLLAMA_BASE_URL=http://127.0.0.1:11435 streamlit run main.py
+"""
+import argparse
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DEFAULT_PORT = 11435
+DEFAULT_COMPLETION = "Final Answer: No data found."
+# Ollama unloads an idle model after 5 minutes unless the request says otherwise
+DEFAULT_KEEP_ALIVE = 300
+# A keep_alive string is a Go duration: "30m", "1h30m", "-1m" (a unit is required, except for "0")
+KEEP_ALIVE_PATTERN = re.compile(r"^[-+]?(?:\d+(?:\.\d*)?(?:ns|us|µs|ms|s|m|h))+$")
+KEEP_ALIVE_PART_PATTERN = re.compile(r"(\d+(?:\.\d*)?)(ns|us|µs|ms|s|m|h)")
+KEEP_ALIVE_UNITS = {"ns": 1e-9, "us": 1e-6, "µs": 1e-6, "ms": 0.001, "s": 1, "m": 60, "h": 3600}
+TOKEN_PATTERN = re.compile(r"\s*\S+|\s+")
+QUESTION_PATTERN = re.compile(r"^Question:\s*(.*)$", re.M)
+OBSERVATION_PATTERN = re.compile(r"Observation:\s*(.*?)(?=\nThought:|\Z)", re.S)
+
+
+def split_tokens(text):
+    """
+    Word-sized chunks (leading whitespace kept), roughly what a model streams.
+    """
+    return TOKEN_PATTERN.findall(text) or [""]
+
+
+def parse_keep_alive(value):
+    """
+    Seconds a model stays loaded after a request (None = forever), from a JSON number of seconds
+    or a duration string such as "30s", "10m" or "-1m". Like the real server, a string without a
+    unit ("-1", "300") raises ValueError, which the handler answers with a 400.
+    """
+    if value is None:
+        return DEFAULT_KEEP_ALIVE
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = float(value)
+    elif isinstance(value, str) and value.lstrip("-+") == "0":
+        seconds = 0.0
+    elif isinstance(value, str) and KEEP_ALIVE_PATTERN.match(value):
+        seconds = sum(float(amount) * KEEP_ALIVE_UNITS[unit]
+                      for amount, unit in KEEP_ALIVE_PART_PATTERN.findall(value))
+        seconds = -seconds if value.startswith("-") else seconds
+    elif isinstance(value, str) and re.fullmatch(r"[-+]?\d+(?:\.\d*)?", value):
+        raise ValueError(f"time: missing unit in duration {json.dumps(value)}")
+    else:
+        raise ValueError(f"time: invalid duration {json.dumps(value)}")
+    return None if seconds < 0 else seconds
+
+
+def common_prefix_length(a, b):
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+def apply_stop(text, stop):
+    """
+    Truncates the completion at the first stop sequence, like the real server.
+    """
+    cut = len(text)
+    for sequence in stop or []:
+        index = text.find(sequence)
+        if index != -1:
+            cut = min(cut, index)
+    return text[:cut]
+
+
+class CompletionSource:
+    """
+    Chooses the completion for a prompt: recordings first, then the scripted rules.
+    """
+
+    def __init__(self, script=None, recordings=None):
+        script = script or {}
+        self.rules = [(re.compile(rule["match"], re.I), re.compile(rule.get("model", ""), re.I),
+                       re.compile(rule.get("prompt", ""), re.I), rule["steps"])
+                      for rule in script.get("rules", [])]
+        self.default = script.get("default", DEFAULT_COMPLETION)
+        self.recordings = {}
+        for record in recordings or []:
+            self.recordings[self.key(record["prompt"])] = record["response"]
+
+    @staticmethod
+    def key(prompt):
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def complete(self, prompt, question=None, model=""):
+        recorded = self.recordings.get(self.key(prompt))
+        if recorded is not None:
+            return recorded, "recording"
+
+        if question is None:
+            questions = QUESTION_PATTERN.findall(prompt)
+            question = questions[-1] if questions else prompt
+        # Only the scratchpad after the question counts (the prompt template has its own examples)
+        scratchpad = prompt[prompt.rfind(question) + len(question):] if question in prompt else prompt
+        observations = [o.strip() for o in OBSERVATION_PATTERN.findall(scratchpad)]
+
+        for pattern, model_pattern, prompt_pattern, steps in self.rules:
+            if pattern.search(question) and model_pattern.search(model) and prompt_pattern.search(prompt):
+                step = steps[min(len(observations), len(steps) - 1)]
+                step = step.replace("{observations}", " ".join(observations))
+                return step.replace("{observation}", observations[-1] if observations else ""), "script"
+        return self.default, "default"
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, source, token_delay=0.0, load_delay=0.0, proxy=None, record_file=None,
+                 prompt_token_delay=0.0):
+        super().__init__(address, FakeOllamaHandler)
+        self.source = source
+        self.token_delay = token_delay
+        self.load_delay = load_delay
+        self.prompt_token_delay = prompt_token_delay
+        self.proxy = proxy
+        self.record_file = record_file
+        self._lock = threading.Lock()
+        # model -> unload time (None = stays loaded), and the tokens of its last prompt (the KV cache)
+        self.loaded_models = {}
+        self.cached_prompts = {}
+        self.stats = {"generate": 0, "chat": 0, "cold_loads": 0, "unloads": 0, "tokens": 0, "prompt_tokens": 0,
+                      "prompt_tokens_cached": 0, "recording": 0, "script": 0, "default": 0, "proxied": 0}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def resident_models(self):
+        now = time.monotonic()
+        with self._lock:
+            return sorted(m for m, until in self.loaded_models.items() if until is None or until > now)
+
+    def load_model(self, model, keep_alive=None):
+        """
+        Returns the simulated load time; only a request for a model that is not loaded pays it.
+        The model then stays loaded for keep_alive seconds (a keep_alive of 0 unloads it).
+        """
+        keep_seconds = parse_keep_alive(keep_alive)
+        now = time.monotonic()
+        with self._lock:
+            until = self.loaded_models.get(model, 0)
+            cold = until is not None and until <= now
+            if cold:
+                self.stats["cold_loads"] += 1
+                self.cached_prompts.pop(model, None)
+            self.loaded_models[model] = None if keep_seconds is None else now + keep_seconds
+        if cold:
+            time.sleep(self.load_delay)
+        return self.load_delay if cold else 0.0
+
+    def unload_model(self, model):
+        with self._lock:
+            if self.loaded_models.pop(model, None) is not None or model in self.cached_prompts:
+                self.stats["unloads"] += 1
+            self.cached_prompts.pop(model, None)
+
+    def evaluate_prompt(self, model, prompt):
+        """
+        Returns (evaluated, cached) prompt token counts; the prefix shared with the model's previous
+        prompt is reused, the rest pays prompt_token_delay per token.
+        """
+        tokens = split_tokens(prompt)
+        with self._lock:
+            cached = common_prefix_length(self.cached_prompts.get(model, ()), tokens)
+            self.cached_prompts[model] = tokens
+            self.stats["prompt_tokens"] += len(tokens) - cached
+            self.stats["prompt_tokens_cached"] += cached
+        if self.prompt_token_delay:
+            time.sleep(self.prompt_token_delay * (len(tokens) - cached))
+        return len(tokens) - cached, cached
+
+    def proxy_completion(self, path, body):
+        # Ask the real server for the whole completion, and optionally record it for replay
+        upstream = dict(body, stream=False)
+        response = requests.post(f"{self.proxy}{path}", json=upstream, timeout=600)
+        response.raise_for_status()
+        data = response.json()
+        text = data.get("response") if path == "/api/generate" else data.get("message", {}).get("content", "")
+        self.count("proxied")
+        if self.record_file and path == "/api/generate":
+            with self._lock, open(self.record_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"prompt": full_prompt(body), "response": text}) + "\n")
+        return text
+
+
+def full_prompt(body):
+    # The system prompt is part of what the model sees, so it is part of the recording key
+    return (body.get("system") or "") + "\n\n" + (body.get("prompt") or "")
+
+
+def timestamp():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    server_version = "FakeOllama/1.0"
+
+    def log_message(self, format, *args):
+        logging.debug("fake-ollama: " + format, *args)
+
+    def _send_json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path in ("/", ""):
+            body = b"Ollama is running"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        elif self.path == "/api/tags":
+            models = self.server.resident_models() or ["qwen2.5:3b-instruct"]
+            self._send_json({"models": [{"name": m, "model": m, "modified_at": timestamp(), "size": 0}
+                                        for m in models]})
+        elif self.path == "/api/ps":
+            self._send_json({"models": [{"name": m, "model": m} for m in self.server.resident_models()]})
+        elif self.path == "/api/fake/stats":
+            with self.server._lock:
+                self._send_json(dict(self.server.stats))
+        else:
+            self._send_json({"error": f"unknown path {self.path}"}, status=404)
+
+    def do_POST(self):
+        if self.path not in ("/api/generate", "/api/chat"):
+            self._send_json({"error": f"unknown path {self.path}"}, status=404)
+            return
+        body = self._read_body()
+        model = body.get("model", "unknown")
+        options = body.get("options") or {}
+        stream = body.get("stream", True)
+        started = time.perf_counter()
+        keep_alive = body.get("keep_alive")
+        try:
+            parse_keep_alive(keep_alive)
+        except ValueError as err:
+            self._send_json({"error": str(err)}, status=400)
+            return
+        if self.path == "/api/generate" and not body.get("prompt") and parse_keep_alive(keep_alive) == 0:
+            # An empty prompt with keep_alive 0 unloads the model
+            self.server.unload_model(model)
+            self._send_json({"model": model, "created_at": timestamp(), "response": "", "done": True,
+                             "done_reason": "unload"})
+            return
+        load_seconds = self.server.load_model(model, keep_alive)
+
+        if self.path == "/api/generate":
+            self.server.count("generate")
+            prompt = full_prompt(body)
+            question = None
+        else:
+            self.server.count("chat")
+            messages = body.get("messages") or []
+            prompt = "\n\n".join(m.get("content", "") for m in messages)
+            question = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+
+        # An empty prompt is how clients ask Ollama to just load (or unload) the model
+        if self.path == "/api/generate" and not body.get("prompt"):
+            text, origin = "", "default"
+        elif self.server.proxy:
+            text, origin = self.server.proxy_completion(self.path, body), "proxied"
+        else:
+            text, origin = self.server.source.complete(prompt, question, model)
+            self.server.count(origin)
+        text = apply_stop(text, options.get("stop") or body.get("stop"))
+        if options.get("num_predict") is not None and options["num_predict"] >= 0:
+            text = "".join(split_tokens(text)[:options["num_predict"]]) if text else text
+        tokens = split_tokens(text) if text else []
+        prompt_evaluated, prompt_cached = self.server.evaluate_prompt(model, prompt) if prompt.strip() else (0, 0)
+        self.server.count("tokens", len(tokens))
+
+        def chunk(piece, done):
+            payload = {"model": model, "created_at": timestamp(), "done": done}
+            if self.path == "/api/generate":
+                payload["response"] = piece
+            else:
+                payload["message"] = {"role": "assistant", "content": piece}
+            if done:
+                total = time.perf_counter() - started
+                payload.update({
+                    "done_reason": "stop",
+                    "total_duration": int(total * 1e9),
+                    "load_duration": int(load_seconds * 1e9),
+                    "prompt_eval_count": prompt_evaluated,
+                    "prompt_cached_count": prompt_cached,
+                    "prompt_eval_duration": 0,
+                    "eval_count": len(tokens),
+                    "eval_duration": int(max(total - load_seconds, 0) * 1e9),
+                })
+            return payload
+
+        if not stream:
+            time.sleep(self.server.token_delay * len(tokens))
+            result = chunk("", True)
+            if self.path == "/api/generate":
+                result["response"] = text
+            else:
+                result["message"]["content"] = text
+            self._send_json(result)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for piece in tokens:
+                if self.server.token_delay:
+                    time.sleep(self.server.token_delay)
+                self.wfile.write((json.dumps(chunk(piece, False)) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write((json.dumps(chunk("", True)) + "\n").encode("utf-8"))
+        except (BrokenPipeError, ConnectionResetError):
+            logging.warning("fake-ollama: client disconnected mid-stream")
+
+
+def load_script(path):
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_recordings(path):
+    if not path:
+        return []
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def start_server(host="127.0.0.1", port=0, script=None, recordings=None, token_delay=0.0, load_delay=0.0,
+                 proxy=None, record_file=None, prompt_token_delay=0.0):
+    """
+    Starts the server on a background thread; port 0 picks a free port (see server.base_url).
+    """
+    server = FakeOllamaServer((host, port), CompletionSource(script, recordings), token_delay=token_delay,
+                              load_delay=load_delay, proxy=proxy, record_file=record_file,
+                              prompt_token_delay=prompt_token_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server with scripted / recorded completions.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--script", help="JSON script of rules and a default completion")
+    parser.add_argument("--recordings", help="JSONL of recorded {prompt, response} pairs to replay")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--load-delay", type=float, default=0.0, help="Seconds added to the first request per model")
+    parser.add_argument("--prompt-token-delay", type=float, default=0.0,
+                        help="Seconds per prompt token not covered by the cached prefix")
+    parser.add_argument("--proxy", help="Forward to a real Ollama server (e.g. http://localhost:11434)")
+    parser.add_argument("--record", help="With --proxy, append each {prompt, response} to this JSONL file")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer((args.host, args.port),
+                              CompletionSource(load_script(args.script), load_recordings(args.recordings)),
+                              token_delay=args.token_delay, load_delay=args.load_delay,
+                              proxy=args.proxy, record_file=args.record, prompt_token_delay=args.prompt_token_delay)
+    logging.info(f"Fake Ollama listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
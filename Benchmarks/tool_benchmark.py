@@ -0,0 +1,395 @@
+"""
+Times every LangChain tool in Main_program against the shipped dataset
+(DB Files/ManipalUniversityJaipur.sql, loaded into the embedded SQLite backend).
+
+For each scale (1x = the dump, 10x / 100x = synthetic copies of every faculty member and
+their timetable) it measures cold calls (fresh pool, empty caches) and warm calls, and
+reports p50/p95 latency and the number of SQL statements each call runs.
+
+    python Benchmarks/tool_benchmark.py                       # run and print
+    python Benchmarks/tool_benchmark.py --save-baseline       # write Benchmarks/baseline.json
+    python Benchmarks/tool_benchmark.py --compare             # compare against the baseline
+    python Benchmarks/tool_benchmark.py --scales 1 --concurrency 8 --query-delay 20
+
+--concurrency N runs every tool for N simulated users, once serially with invoke() and once
+concurrently with ainvoke() on the bounded tool executor, with each SQL statement delayed by
+--query-delay ms (a database round trip), to show how much of the I/O overlaps.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from time import perf_counter
+
+MAIN_PROGRAM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Main_program")
+sys.path.insert(0, MAIN_PROGRAM_DIR)
+
+import db_pool
+import sqlite_backend
+import timetable_index
+import faculty_directory
+import timetable_db_fetch
+from timetable_db_fetch import (check_if_free_now, get_weekly_timetable, get_daily_timetable, get_free_teachers,
+                                get_busy_teachers, get_teachers_free_during_periods, get_next_free_slot,
+                                get_faculty_availability)
+from faculty_detail_db import get_faculty_by_research_area, search_faculty_info_by_name, find_best_match_tool
+from async_tools import build_async_tools, configure_tool_executor
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (tool, input) pairs; names are deliberately partial or misspelled, as users type them
+BENCHMARK_CASES = [
+    (check_if_free_now, "abhay"),
+    (get_weekly_timetable, "geeta"),
+    (get_daily_timetable, "sandeep"),
+    (get_free_teachers, {}),
+    (get_busy_teachers, {}),
+    (get_teachers_free_during_periods, "3-5 Monday"),
+    (get_next_free_slot, "abhay"),
+    (get_faculty_availability, "sandeep"),
+    (get_faculty_by_research_area, "machine learning"),
+    (search_faculty_info_by_name, "sandeep singh"),
+    (find_best_match_tool, "somya goyel"),
+]
+
+# Tools read the clock; benchmarks pin it so every run answers the same question (a busy Monday morning)
+DEFAULT_PINNED_TIME = "2024-10-14 10:45"
+
+# Warm p50/p95 slower than the baseline by more than this fraction count as a regression
+DEFAULT_TOLERANCE = 0.25
+# ...and by more than this many milliseconds (sub-millisecond timings are mostly noise)
+MIN_REGRESSION_MS = 0.5
+
+
+# -------------------- Query counting --------------------
+
+class QueryCounter:
+    """
+    Wraps db_pool.get_connection so every cursor.execute/executemany is counted (and optionally
+    delayed by `delay` seconds, like a round trip to a database server).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.delay = 0.0
+        self._get_connection = db_pool.get_connection
+
+    def install(self):
+        db_pool.get_connection = lambda: CountingConnection(self._get_connection(), self)
+
+    def uninstall(self):
+        db_pool.get_connection = self._get_connection
+
+
+class CountingCursor:
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, *args, **kwargs):
+        self._counter.count += 1
+        if self._counter.delay:
+            time.sleep(self._counter.delay)
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._counter.count += 1
+        if self._counter.delay:
+            time.sleep(self._counter.delay)
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class CountingConnection:
+    def __init__(self, conn, counter):
+        self._conn = conn
+        self._counter = counter
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._conn.cursor(*args, **kwargs), self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+# -------------------- Dataset --------------------
+
+def pin_clock(moment):
+    """
+    Makes datetime.now() in the timetable tools return a fixed moment.
+    """
+    class PinnedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(moment.timestamp(), tz)
+
+    timetable_db_fetch.datetime = PinnedDatetime
+
+
+def build_database(path, scale):
+    """
+    Loads the dump into a SQLite file and appends (scale - 1) renamed copies of every
+    Faculty / FacultyInfo row and every timetable row.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    try:
+        sqlite_backend.load_dump(conn)
+        if scale > 1:
+            copies = "WITH RECURSIVE copies(k) AS (SELECT 2 UNION ALL SELECT k + 1 FROM copies WHERE k < ?) "
+            conn.execute(copies + """
+                INSERT INTO Faculty (name, position, email, phone, department, img_url, qualifications, expertise,
+                                     achievements)
+                SELECT name || ' ' || k, position, k || '.' || email, phone, department, img_url, qualifications,
+                       expertise, achievements
+                FROM Faculty, copies""", (scale,))
+            conn.execute(copies + """
+                INSERT INTO FacultyInfo (name, email, ext_number, phone_number, block_location, floor_location,
+                                         room_number, workstation, research_area, google_scholar_link)
+                SELECT name || ' ' || k, k || '.' || email, ext_number, phone_number, block_location,
+                       floor_location, room_number, workstation, research_area, google_scholar_link
+                FROM FacultyInfo, copies""", (scale,))
+            conn.execute(copies + """
+                INSERT INTO timetable (teacher_name, day, period_number, time_slot, subject, class_name, location)
+                SELECT teacher_name || ' ' || k, day, period_number, time_slot, subject, class_name, location
+                FROM timetable, copies""", (scale,))
+            conn.commit()
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("Faculty", "FacultyInfo", "timetable")}
+    finally:
+        conn.close()
+
+
+def reset_caches(database):
+    """
+    Starts from a cold process state: new pool, empty timetable index, directory and catalogue.
+    """
+    db_pool.configure_pool(backend="sqlite", sqlite_database=database)
+    timetable_index.timetable_index = timetable_index.TimetableIndex()
+    faculty_directory.faculty_directory = faculty_directory.FacultyDirectory()
+    timetable_db_fetch.teacher_catalogue.version = object()  # Forces a rebuild on next use
+
+
+# -------------------- Measurement --------------------
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_ms):
+    return {
+        "p50": round(percentile(samples_ms, 0.50), 3),
+        "p95": round(percentile(samples_ms, 0.95), 3),
+        "mean": round(statistics.fmean(samples_ms), 3),
+        "runs": len(samples_ms),
+    }
+
+
+def time_call(tool, tool_input, counter):
+    counter.count = 0
+    start = perf_counter()
+    tool.invoke(tool_input)
+    return (perf_counter() - start) * 1000, counter.count
+
+
+def benchmark_scale(database, cold_runs, warm_runs, counter):
+    results = {}
+    for tool, tool_input in BENCHMARK_CASES:
+        cold_ms, cold_queries = [], []
+        for _ in range(cold_runs):
+            reset_caches(database)
+            elapsed, queries = time_call(tool, tool_input, counter)
+            cold_ms.append(elapsed)
+            cold_queries.append(queries)
+
+        warm_ms, warm_queries = [], []
+        for _ in range(warm_runs):
+            elapsed, queries = time_call(tool, tool_input, counter)
+            warm_ms.append(elapsed)
+            warm_queries.append(queries)
+
+        results[tool.name] = {
+            "cold_ms": summarize(cold_ms),
+            "warm_ms": summarize(warm_ms),
+            "cold_queries": max(cold_queries),
+            "warm_queries": round(statistics.fmean(warm_queries), 2),
+        }
+    return results
+
+
+def benchmark_concurrency(database, users, query_delay_ms, counter):
+    """
+    Every benchmark case once per simulated user: serially with invoke(), then all at once with
+    ainvoke() on a fresh tool executor (one worker per pooled connection).
+    """
+    reset_caches(database)
+    for tool, tool_input in BENCHMARK_CASES:
+        tool.invoke(tool_input)  # Load the caches, so both runs measure warm calls
+    executor = configure_tool_executor()
+    async_tools = build_async_tools([tool for tool, _ in BENCHMARK_CASES], executor)
+    calls = [(tool, tool_input) for tool, (_, tool_input) in zip(async_tools, BENCHMARK_CASES)] * users
+
+    async def run_concurrently():
+        await asyncio.gather(*(tool.ainvoke(tool_input) for tool, tool_input in calls))
+
+    counter.delay = query_delay_ms / 1000
+    counter.count = 0
+    try:
+        start = perf_counter()
+        for tool, tool_input in calls:
+            tool.invoke(tool_input)
+        serial_ms = (perf_counter() - start) * 1000
+        queries = counter.count
+
+        start = perf_counter()
+        asyncio.run(run_concurrently())
+        concurrent_ms = (perf_counter() - start) * 1000
+    finally:
+        counter.delay = 0.0
+    return {
+        "users": users,
+        "calls": len(calls),
+        "queries": queries,
+        "query_delay_ms": query_delay_ms,
+        "serial_ms": round(serial_ms, 1),
+        "concurrent_ms": round(concurrent_ms, 1),
+        "speedup": round(serial_ms / concurrent_ms, 2) if concurrent_ms else None,
+        "executor": executor.get_stats(),
+    }
+
+
+def run_benchmarks(scales, cold_runs, warm_runs, pinned_time, concurrency=0, query_delay_ms=0.0):
+    pin_clock(pinned_time)
+    counter = QueryCounter()
+    counter.install()
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pinned_time": pinned_time.isoformat(timespec="minutes"),
+            "cold_runs": cold_runs,
+            "warm_runs": warm_runs,
+        },
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            for scale in scales:
+                database = os.path.join(tmp, f"bench_{scale}x.sqlite3")
+                rows = build_database(database, scale)
+                report["scales"][f"{scale}x"] = {"rows": rows,
+                                                 "tools": benchmark_scale(database, cold_runs, warm_runs, counter)}
+                if concurrency:
+                    report["scales"][f"{scale}x"]["concurrency"] = benchmark_concurrency(
+                        database, concurrency, query_delay_ms, counter)
+        finally:
+            counter.uninstall()
+            db_pool.get_pool().close_all()
+    return report
+
+
+# -------------------- Reporting --------------------
+
+def print_report(report):
+    for scale, scale_report in report["scales"].items():
+        print(f"\n=== {scale} ({', '.join(f'{t}: {n}' for t, n in scale_report['rows'].items())}) ===")
+        print(f"{'tool':34} {'cold p50':>9} {'cold p95':>9} {'warm p50':>9} {'warm p95':>9} {'q cold':>7} {'q warm':>7}")
+        for name, r in scale_report["tools"].items():
+            print(f"{name:34} {r['cold_ms']['p50']:9.2f} {r['cold_ms']['p95']:9.2f} {r['warm_ms']['p50']:9.3f} "
+                  f"{r['warm_ms']['p95']:9.3f} {r['cold_queries']:7} {r['warm_queries']:7}")
+        concurrency = scale_report.get("concurrency")
+        if concurrency:
+            print(f"\n{concurrency['users']} users x {len(BENCHMARK_CASES)} tools ({concurrency['queries']} queries, "
+                  f"+{concurrency['query_delay_ms']} ms each): serial {concurrency['serial_ms']:.1f} ms, "
+                  f"concurrent {concurrency['concurrent_ms']:.1f} ms ({concurrency['speedup']}x), "
+                  f"peak {concurrency['executor']['peak_active']} workers")
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """
+    Returns a list of regression messages (slower warm p50/p95 beyond tolerance, or more queries).
+    """
+    regressions = []
+    for scale, scale_report in report["scales"].items():
+        base_scale = baseline.get("scales", {}).get(scale)
+        if not base_scale:
+            continue
+        for name, current in scale_report["tools"].items():
+            base = base_scale["tools"].get(name)
+            if not base:
+                continue
+            for stat in ("p50", "p95"):
+                before, after = base["warm_ms"][stat], current["warm_ms"][stat]
+                change = (after - before) / before if before else 0.0
+                marker = "REGRESSION" if change > tolerance and after - before > MIN_REGRESSION_MS else ""
+                print(f"{scale:5} {name:34} warm {stat} {before:9.3f} -> {after:9.3f} ms ({change:+.0%}) {marker}")
+                if marker:
+                    regressions.append(f"{scale} {name} warm {stat}: {before:.3f} -> {after:.3f} ms ({change:+.0%})")
+            for stat in ("cold_queries", "warm_queries"):
+                if current[stat] > base[stat]:
+                    regressions.append(f"{scale} {name} {stat}: {base[stat]} -> {current[stat]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Main_program LangChain tools.")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated faculty multipliers (default 1,10,100)")
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--warm-runs", type=int, default=30)
+    parser.add_argument("--at", default=DEFAULT_PINNED_TIME, help="Pinned 'now' for the tools (YYYY-MM-DD HH:MM)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--concurrency", type=int, default=0, help="Simulated users for the serial vs async run")
+    parser.add_argument("--query-delay", type=float, default=0.0, help="Milliseconds added to every SQL statement")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    report = run_benchmarks(scales, args.cold_runs, args.warm_runs, datetime.strptime(args.at, "%Y-%m-%d %H:%M"),
+                            args.concurrency, args.query_delay)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    if args.compare:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first.")
+            return 1
+        print(f"\n=== Compared with baseline from {baseline['meta']['created']} ===")
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+-- Migration 001: normalised time columns and covering indexes for `timetable`
+--
+-- Adds integer minute columns (start_min / end_min, minutes since midnight) and a
+-- canonical day code (MON = 1 ... SUN = 7, 0 if unrecognised) derived from the
+-- existing `time_slot` and `day` strings.
+--
+-- The columns are STORED generated columns, so the ALTER below backfills every
+-- existing row, and rows written later by the ingestion / edit tools stay in sync
+-- without any change to their INSERT or UPDATE statements. Time slots that are not
+-- in 'HH:MM-HH:MM' form get NULL minutes instead of a bogus value.
+--
+-- Apply after importing ManipalUniversityJaipur.sql (phpMyAdmin "Import" or
+-- `mysql ManipalUniversityJaipur < "DB Files/migrations/001_timetable_time_columns.sql"`).
+--
+-- MySQL commits each ALTER TABLE on its own (DDL cannot be rolled back), so the two
+-- statements are not atomic: if the second one fails, re-run only that one.
+-- Without this migration the app still works, sorting and parsing `time_slot` itself
+-- (see timetable_index.execute_with_time_columns), but logs a warning on every query.
+
+ALTER TABLE `timetable`
+  ADD COLUMN `start_min` smallint(6) GENERATED ALWAYS AS (
+    CASE WHEN `time_slot` REGEXP '^[0-9]{1,2}:[0-9]{2}[[:space:]]*-[[:space:]]*[0-9]{1,2}:[0-9]{2}'
+      THEN CAST(SUBSTRING_INDEX(TRIM(SUBSTRING_INDEX(`time_slot`, '-', 1)), ':', 1) AS UNSIGNED) * 60
+         + CAST(SUBSTRING_INDEX(TRIM(SUBSTRING_INDEX(`time_slot`, '-', 1)), ':', -1) AS UNSIGNED)
+    END
+  ) STORED,
+  ADD COLUMN `end_min` smallint(6) GENERATED ALWAYS AS (
+    CASE WHEN `time_slot` REGEXP '^[0-9]{1,2}:[0-9]{2}[[:space:]]*-[[:space:]]*[0-9]{1,2}:[0-9]{2}'
+      THEN CAST(SUBSTRING_INDEX(TRIM(SUBSTRING_INDEX(`time_slot`, '-', -1)), ':', 1) AS UNSIGNED) * 60
+         + CAST(SUBSTRING_INDEX(TRIM(SUBSTRING_INDEX(`time_slot`, '-', -1)), ':', -1) AS UNSIGNED)
+    END
+  ) STORED,
+  ADD COLUMN `day_code` tinyint(4) GENERATED ALWAYS AS (
+    FIELD(UPPER(LEFT(TRIM(`day`), 3)), 'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')
+  ) STORED;
+
+--
+-- Indexes for the per-teacher lookups (weekly / daily / next slot) and the
+-- department-wide "who is busy at t" range scan. The trailing teacher_name makes
+-- the second index covering for that query.
+--
+ALTER TABLE `timetable`
+  ADD KEY `idx_timetable_teacher_day_start` (`teacher_name`, `day`, `start_min`),
+  ADD KEY `idx_timetable_day_start_end` (`day`, `start_min`, `end_min`, `teacher_name`);
@@ -0,0 +1,27 @@
+-- Migration 002: change counter for `timetable`
+--
+-- The in-memory timetable index, the teacher name catalogue and the response cache
+-- reload when the timetable version changes. (row count, MAX(id)) misses in-place
+-- UPDATEs, so every INSERT, UPDATE and DELETE on `timetable` now bumps a counter in
+-- the one-row `timetable_version` table (edits from the GUI, the ingestion CLI's
+-- --sync and manual phpMyAdmin changes alike).
+--
+-- Apply after 001:
+-- `mysql ManipalUniversityJaipur < "DB Files/migrations/002_timetable_version.sql"`.
+
+CREATE TABLE `timetable_version` (
+  `id` tinyint(4) NOT NULL,
+  `version` bigint(20) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`id`)
+);
+
+INSERT INTO `timetable_version` (`id`, `version`) VALUES (1, 0);
+
+CREATE TRIGGER `timetable_version_insert` AFTER INSERT ON `timetable`
+  FOR EACH ROW UPDATE `timetable_version` SET `version` = `version` + 1 WHERE `id` = 1;
+
+CREATE TRIGGER `timetable_version_update` AFTER UPDATE ON `timetable`
+  FOR EACH ROW UPDATE `timetable_version` SET `version` = `version` + 1 WHERE `id` = 1;
+
+CREATE TRIGGER `timetable_version_delete` AFTER DELETE ON `timetable`
+  FOR EACH ROW UPDATE `timetable_version` SET `version` = `version` + 1 WHERE `id` = 1;
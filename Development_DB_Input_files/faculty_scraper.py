@@ -0,0 +1,266 @@
+"""
+Faculty directory scraper: fetches the faculty listing pages concurrently (bounded thread pool)
+and parses every faculty card into the dict layout the Faculty table uses.
+
+Responses are kept in an on-disk cache (body + ETag/Last-Modified per URL), and later fetches
+are conditional (If-None-Match / If-Modified-Since), so an unchanged page costs a 304 and no
+download. With offline=True nothing goes to the network: pages come from the cache, which
+doubles as the saved-HTML fixture store.
+
+    scraper = FacultyScraper()                       # FACULTY_LIST_URLS, cache in SCRAPE_CACHE_DIR
+    faculty_list = scraper.scrape()
+    faculty_list = FacultyScraper(offline=True).scrape()
+    faculty_list = parse_faculty_files(["saved_page.html"])
+
+    python Development_DB_Input_files/faculty_scraper.py --workers 8 --json faculty.json
+    python Development_DB_Input_files/faculty_scraper.py --offline
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, time
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import requests
+from bs4 import BeautifulSoup
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Department listing pages to scrape
+FACULTY_LIST_URLS = [
+    'https://jaipur.manipal.edu/foe/faculty-list.php'
+]
+SCRAPE_CACHE_DIR = os.environ.get(
+    "MUJ_SCRAPE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "scrape_cache"))
+SCRAPE_WORKERS = 8
+REQUEST_TIMEOUT = 20  # Seconds per request
+
+# status: "fetched" (200), "not_modified" (304, cached body), "cached" (offline), "error"
+FetchResult = namedtuple('FetchResult', ['url', 'status', 'content', 'elapsed_ms', 'error'])
+
+
+# Function to clean up text by stripping whitespace and newlines
+def clean_text(text):
+    return text.strip().replace('\n', ' ').replace('  ', ' ')
+
+
+# Helper function to extract email and phone number
+def extract_contact_details(modal):
+    email = None
+    phone = None
+    contact_items = modal.find_all('li')  # Find all <li> tags that might contain contact info
+    for item in contact_items:
+        item_text = item.get_text()
+
+        # Check for email
+        if '@' in item_text:
+            email = clean_text(item_text)
+
+        # Check for phone number using a regex that matches 10-digit numbers (with or without +, spaces, etc.)
+        phone_match = re.search(r'\+?\d{10,}', item_text.replace(' ', ''))
+        if phone_match:
+            phone = clean_text(phone_match.group())
+    return email, phone
+
+
+def parse_faculty_page(content):
+    """
+    Parses one listing page (each faculty member is a div.home-faculty-box with a detail modal).
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    faculty_list = []
+    for box in soup.find_all('div', class_='home-faculty-box'):
+        name = clean_text(box.find('h2').text)
+        position = clean_text(box.find('h3').text) if box.find('h3') else None
+        department = clean_text(box.find('p').text) if box.find('p') else None
+        img_url = box.find('img')['src'] if box.find('img') else None
+
+        # Contact details, qualifications etc. are in the modal the card links to
+        link = box.find('a')
+        modal_id = link.get('data-bs-target') if link else None
+        modal = soup.find('div', id=modal_id.replace('#', '')) if modal_id else None
+        items = [clean_text(li.text) for li in modal.find_all('li')] if modal else []
+        email, phone = extract_contact_details(modal) if modal else (None, None)
+
+        faculty_list.append({
+            'name': name,
+            'position': position,
+            'email': email,
+            'phone': phone,
+            'department': department,
+            'img_url': img_url,
+            'qualifications': [i for i in items if 'PHD' in i or 'M.TECH' in i or 'B.SC' in i],
+            'expertise': [i for i in items if 'Applications' in i or 'Computer Vision' in i],
+            'achievements': [i for i in items if 'Excellence Award' in i],
+        })
+    return faculty_list
+
+
+def merge_faculty(pages):
+    # One entry per (name, department); a member listed on several pages keeps the first
+    seen, faculty_list = set(), []
+    for page in pages:
+        for faculty in page:
+            key = (faculty['name'], faculty['department'])
+            if key not in seen:
+                seen.add(key)
+                faculty_list.append(faculty)
+    return faculty_list
+
+
+def parse_faculty_files(paths):
+    """
+    Parses saved HTML pages (fixtures) without any network access.
+    """
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as file:
+            pages.append(parse_faculty_page(file.read()))
+    return merge_faculty(pages)
+
+
+class ResponseCache:
+    """
+    On-disk cache of one response per URL: <sha1>.html holds the body and <sha1>.json the URL,
+    ETag, Last-Modified and fetch time.
+    """
+
+    def __init__(self, cache_dir=SCRAPE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, extension):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + extension)
+
+    def get(self, url):
+        """
+        Returns (meta, content) or (None, None) when the URL is not cached.
+        """
+        try:
+            with open(self._path(url, '.json')) as file:
+                meta = json.load(file)
+            with open(self._path(url, '.html'), 'rb') as file:
+                return meta, file.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def put(self, url, content, etag=None, last_modified=None):
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified, 'fetched_at': time()}
+        # Write to temporary files and rename, so a crash never leaves a body without its metadata
+        for extension, data, mode in (('.html', content, 'wb'), ('.json', json.dumps(meta), 'w')):
+            path = self._path(url, extension)
+            with open(path + '.tmp', mode) as file:
+                file.write(data)
+            os.replace(path + '.tmp', path)
+
+
+class FacultyScraper:
+    """
+    Fetches listing pages on a bounded thread pool with conditional requests against the
+    response cache, and parses them into faculty dicts. offline=True serves only from the cache.
+    """
+
+    def __init__(self, urls=None, cache_dir=SCRAPE_CACHE_DIR, max_workers=SCRAPE_WORKERS,
+                 timeout=REQUEST_TIMEOUT, offline=False):
+        self.urls = list(urls or FACULTY_LIST_URLS)
+        self.cache = ResponseCache(cache_dir)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.offline = offline
+        self._local = threading.local()  # One requests.Session per worker thread
+        self._lock = threading.Lock()
+        self.stats = {"fetched": 0, "not_modified": 0, "cached": 0, "errors": 0, "bytes_downloaded": 0}
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _count(self, status, downloaded=0):
+        with self._lock:
+            self.stats["errors" if status == "error" else status] += 1
+            self.stats["bytes_downloaded"] += downloaded
+
+    def fetch(self, url):
+        started = perf_counter()
+        meta, cached = self.cache.get(url)
+        if self.offline:
+            status, content, error = ("cached", cached, None) if cached is not None else ("error", None, "not cached")
+            self._count(status)
+            return FetchResult(url, status, content, round((perf_counter() - started) * 1000, 1), error)
+
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            response = self._session().get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached is not None:
+                status, content, downloaded = "not_modified", cached, 0
+            else:
+                response.raise_for_status()
+                status, content, downloaded = "fetched", response.content, len(response.content)
+                self.cache.put(url, content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            error = None
+        except requests.RequestException as err:
+            # A stale copy is better than nothing when the site is down
+            logging.warning(f"Fetching {url} failed: {err}")
+            status, content, downloaded, error = "error", cached, 0, str(err)
+        self._count(status, downloaded)
+        return FetchResult(url, status, content, round((perf_counter() - started) * 1000, 1), error)
+
+    def fetch_all(self, urls=None):
+        """
+        Fetches the URLs concurrently (at most max_workers at a time); results are in URL order.
+        """
+        urls = list(dict.fromkeys(urls or self.urls))
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(urls))),
+                                thread_name_prefix="scrape") as pool:
+            return list(pool.map(self.fetch, urls))
+
+    def scrape(self, urls=None):
+        """
+        Fetches and parses every listing page; returns the merged faculty list.
+        """
+        started = perf_counter()
+        results = self.fetch_all(urls)
+        pages = [parse_faculty_page(result.content) for result in results if result.content is not None]
+        faculty_list = merge_faculty(pages)
+        logging.info(f"Scraped {len(faculty_list)} faculty members from {len(results)} page(s) in "
+                     f"{perf_counter() - started:.2f} s: {self.get_stats()}")
+        return faculty_list
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="*", help="Listing pages (default: FACULTY_LIST_URLS)")
+    parser.add_argument("--workers", type=int, default=SCRAPE_WORKERS, help="Concurrent requests")
+    parser.add_argument("--cache-dir", default=SCRAPE_CACHE_DIR, help="On-disk response cache")
+    parser.add_argument("--offline", action="store_true", help="Serve pages from the cache only")
+    parser.add_argument("--html", nargs="+", metavar="FILE", help="Parse saved HTML files instead of fetching")
+    parser.add_argument("--json", metavar="FILE", help="Write the faculty list to this file")
+    args = parser.parse_args()
+
+    if args.html:
+        faculty_list = parse_faculty_files(args.html)
+    else:
+        scraper = FacultyScraper(args.urls, cache_dir=args.cache_dir, max_workers=args.workers, offline=args.offline)
+        faculty_list = scraper.scrape()
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(faculty_list, file, indent=2)
+    print(f"{len(faculty_list)} faculty members")
+
+
+if __name__ == "__main__":
+    main()
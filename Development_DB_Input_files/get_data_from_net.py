@@ -1,86 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
 from fuzzywuzzy import process
-import re  # Import regex module
+from faculty_scraper import FacultyScraper
 
-# List of URLs to scrape
-urls = [
-    'https://jaipur.manipal.edu/foe/faculty-list.php'
-]
-
-# Create a list to hold all faculty details
+# Scraped on first use (see faculty_scraper.py), not at import time
 faculty_list = []
 
 
-# Function to clean up text by stripping whitespace and newlines
-def clean_text(text):
-    return text.strip().replace('\n', ' ').replace('  ', ' ')
-
-
-# Helper function to extract email and phone number
-def extract_contact_details(modal):
-    email = None
-    phone = None
-    contact_items = modal.find_all('li')  # Find all <li> tags that might contain contact info
-    for item in contact_items:
-        item_text = item.get_text()
-
-        # Check for email
-        if '@' in item_text:
-            email = clean_text(item_text)
-
-        # Check for phone number using a regex that matches 10-digit numbers (with or without +, spaces, etc.)
-        phone_match = re.search(r'\+?\d{10,}', item_text.replace(' ', ''))  # Match continuous digit sequences of 10 or more digits
-        if phone_match:
-            phone = clean_text(phone_match.group())  # Extract the matched phone number
-    return email, phone
-
-
-# Loop through each URL, send request, and extract faculty data
-for url in urls:
-    # Send a GET request to fetch the webpage content
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
-
-    # Extract all faculty boxes (assuming each faculty section is inside a div with class 'home-faculty-box')
-    faculty_boxes = soup.find_all('div', class_='home-faculty-box')
-
-    # Loop through each faculty box and extract information
-    for box in faculty_boxes:
-        name = clean_text(box.find('h2').text)  # Extract and clean name
-        position = clean_text(box.find('h3').text) if box.find('h3') else None
-        department = clean_text(box.find('p').text) if box.find('p') else None  # Extract department
-        img_url = box.find('img')['src'] if box.find('img') else None  # Extract image URL
-
-        # Extract additional details like email and phone
-        # Assume the contact details are found in another part of the page or modal
-        modal_id = box.find('a')['data-bs-target'] if box.find('a') else None
-        modal = soup.find('div', id=modal_id.replace('#', '')) if modal_id else None
-
-        # Extract email and phone using the helper function
-        email, phone = extract_contact_details(modal) if modal else (None, None)
-
-        # Extract qualifications, expertise, and achievements
-        qualifications = [clean_text(li.text) for li in modal.find_all('li') if 'PHD' in li.text or 'M.TECH' in li.text or 'B.SC' in li.text]
-        expertise = [clean_text(li.text) for li in modal.find_all('li') if 'Applications' in li.text or 'Computer Vision' in li.text]
-        achievements = [clean_text(li.text) for li in modal.find_all('li') if 'Excellence Award' in li.text]
-
-        details = {
-            'name': name,
-            'position': position,
-            'email': email,
-            'phone': phone,
-            'department': department,  # Add department information
-            'img_url': img_url,  # Add image URL
-            'qualifications': qualifications,  # Add qualifications
-            'expertise': expertise,  # Add expertise
-            'achievements': achievements,  # Add achievements
-        }
-        faculty_list.append(details)
+def load_faculty_list(refresh=False, offline=False):
+    """
+    Scrapes the faculty listing pages once (concurrently, with the on-disk response cache).
+    """
+    global faculty_list
+    if refresh or not faculty_list:
+        faculty_list = FacultyScraper(offline=offline).scrape()
+    return faculty_list
 
 
 # Fuzzy match function
 def get_best_matching_faculty(input_name):
+    faculty_list = load_faculty_list()
     faculty_names = [faculty['name'] for faculty in faculty_list]
     best_match, score = process.extractOne(input_name, faculty_names)
     if score > 70:  # Set a confidence threshold
@@ -107,12 +44,12 @@ def print_faculty_details(faculty):
         print("No matching faculty member found.")
 
 
-# Input name to search for
-input_name = "geeta rani"  # Example input
-
-# Get faculty details based on fuzzy matching
-matched_faculty = get_best_matching_faculty(input_name)
+if __name__ == "__main__":
+    # Input name to search for
+    input_name = "geeta rani"  # Example input
 
-# Print the matched faculty details
-print_faculty_details(matched_faculty)
+    # Get faculty details based on fuzzy matching
+    matched_faculty = get_best_matching_faculty(input_name)
 
+    # Print the matched faculty details
+    print_faculty_details(matched_faculty)
@@ -0,0 +1,100 @@
+"""
+Headless timetable ingestion: parses teacher-wise workbooks (one sheet per teacher) and loads
+them into the timetable table, without the PyQt GUI.
+
+Sheets are streamed with openpyxl's read-only reader and parsed in a process pool
+(timetable_ingest.read_workbooks), so memory stays at roughly one sheet per worker.
+
+    python Development_DB_Input_files/ingest_timetables.py "DB Files/B_Tech_CSE_IoT&IS_wef27Aug24Teacherwise.xlsx"
+    python Development_DB_Input_files/ingest_timetables.py "DB Files/" --workers 8          # every .xlsx in a folder
+    python Development_DB_Input_files/ingest_timetables.py "DB Files/" --dry-run --output timetable.sql
+    python Development_DB_Input_files/ingest_timetables.py "DB Files/" --sqlite /tmp/muj.db  # embedded backend
+    python Development_DB_Input_files/ingest_timetables.py revised.xlsx --sync               # apply only the edits
+
+--sync compares the workbook with the table on (teacher_name, day, period_number) and applies the
+inserts, updates and deletes in one transaction instead of appending every row again. Only the
+teachers in the workbook are touched unless --prune-all is given.
+
+Without --sqlite the rows go to the MySQL database in timetable_ingest.connect_db().
+"""
+import argparse
+import glob
+import logging
+import os
+import sys
+from time import perf_counter
+from timetable_ingest import read_workbooks, load_rows, sync_rows, connect_db, format_insert, INSERT_BATCH_SIZE
+
+MAIN_PROGRAM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Main_program")
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def find_workbooks(paths):
+    # Files as given; folders expand to the .xlsx files in them (Excel lock files skipped)
+    workbooks = []
+    for path in paths:
+        if os.path.isdir(path):
+            workbooks.extend(sorted(f for f in glob.glob(os.path.join(path, "*.xlsx"))
+                                    if not os.path.basename(f).startswith("~$")))
+        else:
+            workbooks.append(path)
+    return workbooks
+
+
+def connect(sqlite_database=None):
+    if sqlite_database is None:
+        return connect_db()
+    sys.path.insert(0, MAIN_PROGRAM_DIR)
+    import sqlite_backend
+    return sqlite_backend.connect(sqlite_database)
+
+
+def write_queries(rows, output_file):
+    with open(output_file, "w") as file:
+        for row in rows.to_dict("records"):
+            file.write(format_insert(row) + "\n")
+    logging.info(f"Wrote {len(rows)} INSERT statements to {output_file}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Teacher-wise .xlsx workbooks, or folders containing them")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Parser processes (default: one per core; 1 parses in this process)")
+    parser.add_argument("--batch-size", type=int, default=INSERT_BATCH_SIZE, help="Rows per executemany call")
+    parser.add_argument("--output", help="Also write the INSERT statements to this file")
+    parser.add_argument("--dry-run", action="store_true", help="Parse only; do not touch the database")
+    parser.add_argument("--sync", action="store_true",
+                        help="Apply only the differences with the table instead of appending every row")
+    parser.add_argument("--prune-all", action="store_true",
+                        help="With --sync, also delete rows of teachers that are not in the workbooks")
+    parser.add_argument("--sqlite", metavar="DATABASE",
+                        help="Load into the embedded SQLite backend (Main_program/sqlite_backend.py) instead of MySQL")
+    args = parser.parse_args()
+
+    workbooks = find_workbooks(args.paths)
+    if not workbooks:
+        parser.error("no .xlsx workbooks found")
+
+    started = perf_counter()
+    rows = read_workbooks(workbooks, workers=args.workers)
+    if args.output:
+        write_queries(rows, args.output)
+    if not args.dry_run:
+        conn = connect(args.sqlite)
+        try:
+            if args.sync:
+                sync_rows(conn, rows, batch_size=args.batch_size, prune_all=args.prune_all)
+            else:
+                load_rows(conn, rows, batch_size=args.batch_size)
+        finally:
+            conn.close()
+    elapsed = perf_counter() - started
+    print(f"{len(rows)} rows from {len(workbooks)} workbook(s) in {elapsed:.2f} s "
+          f"({len(rows) / elapsed if elapsed else 0:.0f} rows/s end to end)")
+
+
+if __name__ == "__main__":
+    main()
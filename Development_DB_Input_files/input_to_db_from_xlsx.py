@@ -7,6 +7,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QTextCursor, QTextCharFormat, QColor
 import mysql.connector
 from PyQt5.QtWidgets import QInputDialog
+from timetable_ingest import read_workbook, load_rows, sync_rows, connect_db, format_insert, UNKNOWN
 
 
 class TimetableApp(QWidget):
@@ -53,6 +54,10 @@ class TimetableApp(QWidget):
         self.execute_button.clicked.connect(self.execute_queries)
         layout.addWidget(self.execute_button)
 
+        self.sync_button = QPushButton("Sync Changes to Database", self)
+        self.sync_button.clicked.connect(self.sync_queries)
+        layout.addWidget(self.sync_button)
+
         self.save_button = QPushButton("Save Queries to File", self)
         self.save_button.clicked.connect(self.save_queries)
         layout.addWidget(self.save_button)
@@ -62,7 +67,8 @@ class TimetableApp(QWidget):
         # Allow file drag and drop
         self.setAcceptDrops(True)
 
-        # Variables to hold data
+        # Variables to hold data (one timetable row per query)
+        self.rows = pd.DataFrame()
         self.query_list = []
         self.current_index = 0
         self.excel_file = None
@@ -85,43 +91,18 @@ class TimetableApp(QWidget):
     # Load Excel data and generate SQL queries
     def load_excel_file(self, file_path):
         self.query_list = self.generate_sql_queries(file_path)
+        self.current_index = 0
         if self.query_list:
             self.display_query(self.current_index)
 
     def generate_sql_queries(self, excel_file):
         try:
-            xl = pd.ExcelFile(excel_file)
-            all_sql_queries = []
-
-            for sheet in xl.sheet_names:
-                df_timetable_full = pd.read_excel(xl, sheet_name=sheet, header=None)
-                df_timetable = df_timetable_full.iloc[4:].reset_index(drop=True)
-                df_timetable.columns = ['Day', 'Period_1', 'Period_2', 'Period_3', 'Period_4',
-                                        'Period_5', 'Period_6', 'Period_7', 'Period_8', 'Period_9', 'Period_10',
-                                        'Period_11', 'Period_12']
-                df_timetable.dropna(subset=['Day'], inplace=True)
-                time_slots = df_timetable_full.iloc[6, 1:].values
-                class_names = df_timetable_full.iloc[8, 1:].values
-                locations = df_timetable_full.iloc[10, 1:].values
-                teacher_name = df_timetable_full.iloc[4, 0]
-
-                for index, row in df_timetable.iloc[1:].iterrows():
-                    day = row['Day']
-                    if day == "Day / Time":
-                        continue
-
-                    for i, period in enumerate(row[1:], start=1):
-                        if pd.notna(period):
-                            time_slot = time_slots[i - 1]
-                            class_name = class_names[i - 1] if pd.notna(class_names[i - 1]) else "Unknown"
-                            location = locations[i - 1] if pd.notna(locations[i - 1]) else "Unknown"
-
-                            sql_query = f"INSERT INTO timetable (teacher_name, day, period_number, time_slot, subject, class_name, location) " \
-                                        f"VALUES ('{teacher_name}', '{day}', {i}, '{time_slot}', '{period}', '{class_name}', '{location}');"
-                            all_sql_queries.append(sql_query)
-
-            return all_sql_queries
+            # Every sheet is parsed in one pass (see timetable_ingest.py); the queries are only for preview/saving
+            self.rows = read_workbook(excel_file)
+            return [format_insert(row) for row in self.rows.to_dict("records")]
         except Exception as e:
+            # Never leave the rows of an earlier workbook behind a failed load
+            self.rows = pd.DataFrame()
             self.show_message("Error", str(e))
             return []
 
@@ -178,52 +159,55 @@ class TimetableApp(QWidget):
             location, ok_location = QInputDialog.getText(self, "Input", "Enter location:")
 
             if ok_class and ok_location:
-                updated_query = current_query.replace("Unknown", class_name, 1)
-                updated_query = updated_query.replace("Unknown", location, 1)
-                self.query_list[self.current_index] = updated_query
+                row = self.rows.index[self.current_index]
+                if self.rows.at[row, "class_name"] == UNKNOWN:
+                    self.rows.at[row, "class_name"] = class_name
+                if self.rows.at[row, "location"] == UNKNOWN:
+                    self.rows.at[row, "location"] = location
+                self.query_list[self.current_index] = format_insert(self.rows.loc[row])
                 self.display_query(self.current_index)
         else:
             self.show_message("Info", "No 'Unknown' values in this query.")
 
+    def rows_loaded(self):
+        # Execute and Sync need the parsed rows of a dropped workbook
+        if self.rows.empty:
+            self.show_message("Error", "No timetable rows loaded. Drag and drop an Excel file (.xlsx) first.")
+            return False
+        return True
+
     def execute_queries(self):
+        if not self.rows_loaded():
+            return
         try:
-            # Connect to MySQL
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",  # Set your MySQL password
-                database="ManipalUniversityJaipur"
-            )
-            cursor = conn.cursor()
-
-            # Create table if not exists
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS timetable (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                teacher_name VARCHAR(255),
-                day VARCHAR(50),
-                period_number INT,
-                time_slot VARCHAR(50),
-                subject VARCHAR(255),
-                class_name VARCHAR(255),
-                location VARCHAR(255)
-            );
-            """
-            cursor.execute(create_table_query)
-
-            # Execute each query
-            for query in self.query_list:
-                cursor.execute(query)
-
-            # Commit the changes and close the connection
-            conn.commit()
-            conn.close()
-
-            self.show_message("Success", "All queries executed successfully!")
+            # Batched inserts in a single transaction instead of one statement per period
+            conn = connect_db()
+            try:
+                stats = load_rows(conn, self.rows)
+            finally:
+                conn.close()
+
+            self.show_message("Success", f"Inserted {stats['rows']} rows in {stats['seconds']} s "
+                                         f"({stats['rows_per_second']} rows/s).")
         except mysql.connector.Error as err:
             self.show_message("Error", f"Error: {err}")
 
+    def sync_queries(self):
+        if not self.rows_loaded():
+            return
+        try:
+            # Only the rows that differ from the table (per teacher, day and period) are written
+            conn = connect_db()
+            try:
+                stats = sync_rows(conn, self.rows)
+            finally:
+                conn.close()
 
+            self.show_message("Success", f"Inserted {stats['inserted']}, updated {stats['updated']} and deleted "
+                                         f"{stats['deleted']} rows ({stats['unchanged']} unchanged) "
+                                         f"in {stats['seconds']} s.")
+        except mysql.connector.Error as err:
+            self.show_message("Error", f"Error: {err}")
 
     def save_queries(self):
         options = QFileDialog.Options()
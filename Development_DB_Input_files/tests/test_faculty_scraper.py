@@ -0,0 +1,117 @@
+import os
+
+import pytest
+import requests
+
+from faculty_scraper import FacultyScraper, parse_faculty_files, parse_faculty_page
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "faculty_list.html")
+URL = "https://jaipur.manipal.edu/foe/faculty-list.php"
+ETAG = '"5f2a-61c3"'
+
+
+def fixture_html():
+    with open(FIXTURE, "rb") as file:
+        return file.read()
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+class FakeSession:
+    """
+    Answers like a server holding one page version: 304 when If-None-Match carries its ETag.
+    """
+
+    def __init__(self, content, etag=ETAG, fail=False):
+        self.content = content
+        self.etag = etag
+        self.fail = fail
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if self.fail:
+            raise requests.ConnectionError("site unreachable")
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.content, {"ETag": self.etag})
+
+
+def scraper_with(session, cache_dir, **kwargs):
+    scraper = FacultyScraper([URL], cache_dir=str(cache_dir), max_workers=1, **kwargs)
+    scraper._session = lambda: session
+    return scraper
+
+
+def test_parse_faculty_page_reads_cards_and_modals():
+    abhay, geeta, rohit = parse_faculty_page(fixture_html())
+
+    assert abhay == {
+        "name": "Dr. Abhay Sharma",
+        "position": "Associate Professor",
+        "email": "abhay.sharma@jaipur.manipal.edu",
+        "phone": "+919876543210",
+        "department": "Department of IoT and Intelligent Systems",
+        "img_url": "https://jaipur.manipal.edu/img/faculty/abhay-sharma.jpg",
+        "qualifications": ["PHD (IIT Delhi)", "M.TECH (NIT Jaipur)"],
+        "expertise": ["IoT Applications in Agriculture", "Computer Vision"],
+        "achievements": ["Teaching Excellence Award 2022"],
+    }
+    assert (geeta["email"], geeta["phone"], geeta["qualifications"]) == \
+        ("geeta.rani@jaipur.manipal.edu", None, ["B.SC (University of Rajasthan)"])
+    # A card without position, department, photo or profile modal still yields a record
+    assert rohit == {"name": "Mr. Rohit Verma", "position": None, "email": None, "phone": None,
+                     "department": None, "img_url": None, "qualifications": [], "expertise": [],
+                     "achievements": []}
+
+
+def test_parse_faculty_files_merges_pages():
+    faculty_list = parse_faculty_files([FIXTURE, FIXTURE])
+
+    assert [f["name"] for f in faculty_list] == ["Dr. Abhay Sharma", "Dr. Geeta Rani", "Mr. Rohit Verma"]
+
+
+def test_not_modified_is_served_from_disk_cache(tmp_path):
+    session = FakeSession(fixture_html())
+    first = scraper_with(session, tmp_path).fetch(URL)
+
+    # A new scraper (e.g. the next run) only has the on-disk cache
+    scraper = scraper_with(session, tmp_path)
+    second = scraper.fetch(URL)
+
+    assert (first.status, second.status) == ("fetched", "not_modified")
+    assert session.requests == [{}, {"If-None-Match": ETAG}]
+    assert second.content == fixture_html()
+    assert scraper.get_stats()["bytes_downloaded"] == 0
+    assert len(scraper.scrape()) == 3
+
+
+def test_offline_serves_only_the_cache(tmp_path):
+    scraper_with(FakeSession(fixture_html()), tmp_path).fetch(URL)
+    session = FakeSession(b"", fail=True)
+
+    scraper = scraper_with(session, tmp_path, offline=True)
+
+    assert [f["name"] for f in scraper.scrape()][0] == "Dr. Abhay Sharma"
+    assert scraper.fetch("https://jaipur.manipal.edu/other.php").status == "error"
+    assert session.requests == []
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_network_error_falls_back_to_stale_copy(tmp_path, cached):
+    if cached:
+        scraper_with(FakeSession(fixture_html()), tmp_path).fetch(URL)
+
+    result = scraper_with(FakeSession(b"", fail=True), tmp_path).fetch(URL)
+
+    assert result.status == "error"
+    assert result.content == (fixture_html() if cached else None)
@@ -0,0 +1,131 @@
+import mysql.connector
+import pandas as pd
+import pytest
+
+from timetable_ingest import (TIMETABLE_COLUMNS, DELETE_TIMETABLE_QUERY, UPDATE_TIMETABLE_QUERY,
+                              INSERT_TIMETABLE_QUERY, load_rows, sync_rows)
+
+
+class FakeMySQLCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.results = []
+
+    def execute(self, operation, params=()):
+        self.conn.statement(operation)
+        self.results = list(self.conn.table) if operation.lstrip().upper().startswith("SELECT") else []
+
+    def executemany(self, operation, seq_params):
+        for params in seq_params:
+            self.conn.statement(operation)
+            self.conn.pending.append((operation, params))
+
+    def fetchall(self):
+        return self.results
+
+    def close(self):
+        pass
+
+
+class FakeMySQLConnection:
+    """
+    Transaction bookkeeping of mysql.connector with autocommit off: any statement opens a
+    transaction implicitly, DDL commits it, and start_transaction() inside one raises.
+    """
+
+    def __init__(self, table=(), fail_on=None):
+        self.table = list(table)
+        self.fail_on = fail_on
+        self.in_transaction = False
+        self.pending = []
+        self.committed = []
+        self.rollbacks = 0
+
+    def statement(self, operation):
+        if self.fail_on and operation.startswith(self.fail_on):
+            raise mysql.connector.errors.DatabaseError("simulated failure")
+        self.in_transaction = not operation.lstrip().upper().startswith("CREATE")
+
+    def cursor(self, **kwargs):
+        return FakeMySQLCursor(self)
+
+    def start_transaction(self):
+        if self.in_transaction:
+            raise mysql.connector.errors.ProgrammingError("Transaction already in progress")
+        self.in_transaction = True
+
+    def commit(self):
+        self.committed.extend(self.pending)
+        self.pending = []
+        self.in_transaction = False
+
+    def rollback(self):
+        self.pending = []
+        self.rollbacks += 1
+        self.in_transaction = False
+
+
+def workbook_rows(*rows):
+    return pd.DataFrame(rows, columns=TIMETABLE_COLUMNS)
+
+
+TABLE = [
+    (1, "Abhay Sharma", "Monday", 1, "08:00-08:50", "IoT", "CSE-A", "AB1-101"),
+    (2, "Abhay Sharma", "Monday", 2, "08:50-09:40", "DBMS", "CSE-B", "AB1-102"),
+    (3, "Abhay Sharma", "Tuesday", 1, "08:00-08:50", "IoT", "CSE-A", "AB1-101"),
+    (4, "Geeta Rani", "Monday", 1, "08:00-08:50", "OS", "CSE-C", "AB2-201"),
+]
+
+
+def test_sync_rows_applies_diff_in_one_transaction():
+    conn = FakeMySQLConnection(TABLE)
+    rows = workbook_rows(
+        ("Abhay Sharma", "Monday", 1, "08:00-08:50", "IoT", "CSE-A", "AB1-101"),   # unchanged
+        ("Abhay Sharma", "Monday", 2, "08:50-09:40", "DBMS", "CSE-B", "AB1-305"),  # room changed
+        ("Abhay Sharma", "Wednesday", 3, "09:40-10:30", "ML", "CSE-D", "AB1-110"),  # new class
+    )
+
+    stats = sync_rows(conn, rows)
+
+    assert {k: stats[k] for k in ("inserted", "updated", "deleted", "unchanged")} == \
+        {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+    # Tuesday's class is gone from the workbook; Geeta is not in it and is left alone
+    assert conn.committed == [
+        (DELETE_TIMETABLE_QUERY, (3,)),
+        (UPDATE_TIMETABLE_QUERY, ("08:50-09:40", "DBMS", "CSE-B", "AB1-305", 2)),
+        (INSERT_TIMETABLE_QUERY, ("Abhay Sharma", "Wednesday", 3, "09:40-10:30", "ML", "CSE-D", "AB1-110")),
+    ]
+    assert not conn.in_transaction
+
+
+def test_sync_rows_prune_all_deletes_other_teachers():
+    conn = FakeMySQLConnection(TABLE)
+    rows = workbook_rows(*(row[1:] for row in TABLE[:3]))
+
+    stats = sync_rows(conn, rows, prune_all=True)
+
+    assert stats["deleted"] == 1
+    assert conn.committed == [(DELETE_TIMETABLE_QUERY, (4,))]
+
+
+def test_sync_rows_rolls_back_on_error():
+    conn = FakeMySQLConnection(TABLE, fail_on="INSERT")
+    rows = workbook_rows(("Abhay Sharma", "Friday", 1, "08:00-08:50", "IoT", "CSE-A", "AB1-101"))
+
+    with pytest.raises(mysql.connector.Error):
+        sync_rows(conn, rows)
+
+    assert conn.rollbacks == 1
+    assert conn.committed == []
+
+
+def test_load_rows_inside_open_transaction():
+    conn = FakeMySQLConnection()
+    conn.statement("SELECT 1")  # e.g. a preview query earlier on the same connection
+    rows = workbook_rows(("Geeta Rani", "Monday", 1, "08:00-08:50", "OS", "CSE-C", "AB2-201"))
+
+    stats = load_rows(conn, rows, create_table=False)
+
+    assert stats["rows"] == 1
+    assert conn.committed == [(INSERT_TIMETABLE_QUERY, ("Geeta Rani", "Monday", 1, "08:00-08:50", "OS", "CSE-C",
+                                                        "AB2-201"))]
@@ -0,0 +1,319 @@
+"""
+Vectorised loader for the teacher-wise timetable workbook (one sheet per teacher).
+
+Sheet layout (0-based rows): row 4 holds the teacher name, row 6 the period time slots, and from
+row 7 every day is a block of four rows - subject, class, batch (lab group) and location - with the
+day label in column 0 of the first row and periods 1-12 in columns 1-12.
+
+    rows = read_workbook("DB Files/B_Tech_CSE_IoT&IS_wef27Aug24Teacherwise.xlsx")
+    stats = load_rows(connect_db(), rows)   # one transaction, batched executemany
+
+Sheets are streamed with openpyxl's read-only reader (one sheet in memory at a time) and can be
+parsed in a process pool: read_workbooks(paths, workers=4).
+
+Re-imports of a revised workbook should use sync_rows(conn, rows), which applies only the
+inserts, updates and deletes that differ from the table (keyed on teacher, day and period).
+"""
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+import logging
+import os
+import re
+import mysql.connector
+import openpyxl
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+PERIOD_COUNT = 12
+TEACHER_ROW = 4
+TIME_SLOT_ROW = 6
+FIRST_DAY_ROW = 7
+# Row offset inside a day block -> field
+BLOCK_FIELDS = {0: "subject", 1: "class_name", 2: "batch", 3: "location"}
+UNKNOWN = "Unknown"
+
+TIMETABLE_COLUMNS = ["teacher_name", "day", "period_number", "time_slot", "subject", "class_name", "location"]
+CREATE_TIMETABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS timetable (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    teacher_name VARCHAR(255),
+    day VARCHAR(50),
+    period_number INT,
+    time_slot VARCHAR(50),
+    subject VARCHAR(255),
+    class_name VARCHAR(255),
+    location VARCHAR(255)
+);
+"""
+INSERT_TIMETABLE_QUERY = ("INSERT INTO timetable (teacher_name, day, period_number, time_slot, subject, class_name, "
+                          "location) VALUES (%s, %s, %s, %s, %s, %s, %s)")
+# Rows per executemany call (mysql.connector sends each batch as one multi-row INSERT)
+INSERT_BATCH_SIZE = 1000
+
+# A timetable row is identified by these columns; the rest are compared to find updates
+SYNC_KEY = ["teacher_name", "day", "period_number"]
+SYNC_VALUES = ["time_slot", "subject", "class_name", "location"]
+SELECT_TIMETABLE_QUERY = f"SELECT id, {', '.join(TIMETABLE_COLUMNS)} FROM timetable"
+UPDATE_TIMETABLE_QUERY = f"UPDATE timetable SET {', '.join(f'{c} = %s' for c in SYNC_VALUES)} WHERE id = %s"
+DELETE_TIMETABLE_QUERY = "DELETE FROM timetable WHERE id = %s"
+
+TIME_SLOT_PATTERN = re.compile(r'(\d{1,2})\s*[:.]\s*(\d{2})\D+(\d{1,2})\s*[:.]\s*(\d{2})')
+
+
+def connect_db():
+    # Connect to MySQL
+    return mysql.connector.connect(
+        host="localhost",
+        user="root",
+        password="",  # Set your MySQL password
+        database="ManipalUniversityJaipur"
+    )
+
+
+def normalize_time_slot(value):
+    """
+    "9:00-9:45", "12:00- 12:45" and "12:45: 13:30" all become "HH:MM-HH:MM" (what the
+    start_min/end_min columns parse); anything else is kept as written.
+    """
+    if pd.isna(value):
+        return UNKNOWN
+    match = TIME_SLOT_PATTERN.search(str(value))
+    if not match:
+        return str(value).strip()
+    start_h, start_m, end_h, end_m = match.groups()
+    return f"{int(start_h):02d}:{start_m}-{int(end_h):02d}:{end_m}"
+
+
+def clean_cell(series):
+    return series.astype("string").str.strip().replace("", pd.NA)
+
+
+def parse_sheet(df_full):
+    """
+    Returns one row per taught period (TIMETABLE_COLUMNS) for one teacher's sheet.
+    """
+    teacher_name = str(df_full.iat[TEACHER_ROW, 0]).strip()
+    time_slots = pd.Series([normalize_time_slot(v) for v in df_full.iloc[TIME_SLOT_ROW, 1:PERIOD_COUNT + 1]],
+                           index=range(1, PERIOD_COUNT + 1), name="time_slot")
+
+    body = df_full.iloc[FIRST_DAY_ROW:, :PERIOD_COUNT + 1].copy()
+    body.columns = ["day"] + list(range(1, PERIOD_COUNT + 1))
+    body["day"] = clean_cell(body["day"]).ffill()
+    body = body[body["day"].notna()]
+    body["field"] = body.groupby("day", sort=False).cumcount().map(BLOCK_FIELDS)
+    body = body[body["field"].notna()]
+
+    # One (day, period, field) value per cell, then one column per field
+    cells = body.melt(id_vars=["day", "field"], var_name="period_number", value_name="value")
+    cells["value"] = clean_cell(cells["value"])
+    cells = cells[cells["value"].notna()]
+    periods = cells.pivot(index=["day", "period_number"], columns="field", values="value")
+    periods = periods.reindex(columns=list(BLOCK_FIELDS.values())).astype("string")
+    periods = periods[periods["subject"].notna()].reset_index()
+    if periods.empty:
+        return pd.DataFrame(columns=TIMETABLE_COLUMNS)
+
+    # Lab batches are part of the class name ("IoT&IS- V-A A2")
+    class_name = periods["class_name"].fillna(UNKNOWN)
+    periods["class_name"] = class_name.where(periods["batch"].isna(), class_name + " " + periods["batch"])
+    periods["location"] = periods["location"].fillna(UNKNOWN)
+    periods["period_number"] = periods["period_number"].astype(int)
+    periods = periods.join(time_slots, on="period_number")
+    periods["teacher_name"] = teacher_name
+
+    day_order = {day: i for i, day in enumerate(body["day"].unique())}
+    periods = periods.sort_values(["day", "period_number"], key=lambda s: s.map(day_order) if s.name == "day" else s)
+    return periods[TIMETABLE_COLUMNS].astype({c: object for c in TIMETABLE_COLUMNS if c != "period_number"})
+
+
+def read_sheet(worksheet):
+    """
+    Streams one read-only worksheet into the DataFrame layout parse_sheet expects (columns 0-12).
+    """
+    worksheet.reset_dimensions()  # the stored dimensions are often wrong; read what is there
+    return pd.DataFrame(worksheet.iter_rows(max_col=PERIOD_COUNT + 1, values_only=True),
+                        columns=range(PERIOD_COUNT + 1))
+
+
+def parse_sheets(excel_file, sheet_names=None):
+    """
+    Opens the workbook read-only and parses the given sheets (all by default), one at a time.
+    Runs in the worker processes of read_workbooks.
+    """
+    workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        frames = [parse_sheet(read_sheet(workbook[name])) for name in (sheet_names or workbook.sheetnames)]
+    finally:
+        workbook.close()
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=TIMETABLE_COLUMNS)
+
+
+def sheet_chunks(excel_file, chunks):
+    # Contiguous runs of sheet names, so each worker opens the workbook once
+    workbook = openpyxl.load_workbook(excel_file, read_only=True)
+    names = workbook.sheetnames
+    workbook.close()
+    size = max(1, -(-len(names) // chunks))
+    return [names[i:i + size] for i in range(0, len(names), size)]
+
+
+def read_workbooks(excel_files, workers=None):
+    """
+    Parses every sheet of every workbook into one DataFrame of timetable rows, in workbook and
+    sheet order. workers=1 parses in this process; otherwise the sheets of each workbook are split
+    across a process pool (default: one process per core).
+    """
+    started = perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        frames = [parse_sheets(excel_file) for excel_file in excel_files]
+    else:
+        tasks = [(excel_file, names) for excel_file in excel_files for names in sheet_chunks(excel_file, workers)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks) or 1)) as pool:
+            frames = list(pool.map(parse_sheets, *zip(*tasks))) if tasks else []
+    rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=TIMETABLE_COLUMNS)
+    elapsed = perf_counter() - started
+    logging.info(f"Parsed {len(rows)} timetable rows from {len(excel_files)} workbook(s) with {workers} worker(s) "
+                 f"in {elapsed:.2f} s ({len(rows) / elapsed if elapsed else 0:.0f} rows/s).")
+    return rows
+
+
+def read_workbook(excel_file, workers=1):
+    """
+    Parses every sheet of one workbook into one DataFrame of timetable rows.
+    """
+    return read_workbooks([excel_file], workers=workers)
+
+
+def row_tuples(rows):
+    return list(rows[TIMETABLE_COLUMNS].itertuples(index=False, name=None))
+
+
+def begin_transaction(conn):
+    """
+    Starts a transaction unless one is already open. With autocommit off, mysql.connector opens one
+    implicitly on the first statement (a SELECT included), and start_transaction() would then raise
+    "Transaction already in progress".
+    """
+    if not conn.in_transaction:
+        conn.start_transaction()
+
+
+def load_rows(conn, rows, batch_size=INSERT_BATCH_SIZE, create_table=True):
+    """
+    Inserts the rows with batched executemany inside a single transaction (all or nothing).
+    Returns {"rows", "seconds", "rows_per_second"}.
+    """
+    started = perf_counter()
+    records = [(t, d, int(p), s, subj, c, loc) for t, d, p, s, subj, c, loc in row_tuples(rows)]
+    cursor = conn.cursor()
+    try:
+        if create_table:
+            cursor.execute(CREATE_TIMETABLE_QUERY)
+        begin_transaction(conn)
+        for i in range(0, len(records), batch_size):
+            cursor.executemany(INSERT_TIMETABLE_QUERY, records[i:i + batch_size])
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    elapsed = perf_counter() - started
+    stats = {"rows": len(records), "seconds": round(elapsed, 3),
+             "rows_per_second": round(len(records) / elapsed) if elapsed else None}
+    logging.info(f"Inserted {stats['rows']} timetable rows in {stats['seconds']} s ({stats['rows_per_second']} rows/s).")
+    return stats
+
+
+def fetch_timetable(conn, teachers=None):
+    """
+    Current timetable rows (with id) as a DataFrame, optionally only for the given teachers.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(SELECT_TIMETABLE_QUERY)
+        current = pd.DataFrame(cursor.fetchall(), columns=["id"] + TIMETABLE_COLUMNS, dtype=object)
+    finally:
+        cursor.close()
+    if teachers is not None:
+        current = current[current["teacher_name"].isin(set(teachers))]
+    current["period_number"] = current["period_number"].astype(int)
+    return current
+
+
+def diff_rows(current, rows):
+    """
+    Compares the table rows (fetch_timetable) with the workbook rows on SYNC_KEY in one merge.
+    Returns {"insert": rows to add, "update": rows (with id) whose values changed, "delete": ids}.
+    Keys stored more than once (earlier appending imports) keep their lowest id; the copies are deleted.
+    """
+    rows = rows.drop_duplicates(SYNC_KEY, keep="last")
+    current = current.sort_values("id")
+    duplicates = current.duplicated(SYNC_KEY, keep="first")
+    merged = current[~duplicates].merge(rows, on=SYNC_KEY, how="outer", suffixes=("_db", ""), indicator=True)
+
+    both = merged[merged["_merge"] == "both"]
+    # None in the table and a value in the workbook (or different values) count as a change
+    changed = pd.Series(False, index=both.index)
+    for column in SYNC_VALUES:
+        changed |= both[f"{column}_db"].fillna(UNKNOWN).astype(str) != both[column].astype(str)
+
+    return {
+        "insert": merged.loc[merged["_merge"] == "right_only", TIMETABLE_COLUMNS],
+        "update": both.loc[changed, ["id"] + TIMETABLE_COLUMNS],
+        "delete": list(merged.loc[merged["_merge"] == "left_only", "id"]) + list(current.loc[duplicates, "id"]),
+    }
+
+
+def sync_rows(conn, rows, batch_size=INSERT_BATCH_SIZE, prune_all=False):
+    """
+    Applies only the differences between the workbook rows and the table, as batched deletes,
+    updates and inserts in a single transaction, which also covers the read the diff is based on.
+    Rows of teachers not in the workbook are left alone unless prune_all=True (the workbook is then
+    the whole timetable).
+    Returns the counts and timing.
+    """
+    started = perf_counter()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(CREATE_TIMETABLE_QUERY)
+        begin_transaction(conn)
+        current = fetch_timetable(conn, teachers=None if prune_all else rows["teacher_name"].unique())
+        diff = diff_rows(current, rows)
+        inserts = [(t, d, int(p), s, subj, c, loc) for t, d, p, s, subj, c, loc in row_tuples(diff["insert"])]
+        updates = [tuple(row[c] for c in SYNC_VALUES) + (int(row["id"]),)
+                   for row in diff["update"].to_dict("records")]
+        deletes = [(int(row_id),) for row_id in diff["delete"]]
+        for query, records in ((DELETE_TIMETABLE_QUERY, deletes), (UPDATE_TIMETABLE_QUERY, updates),
+                               (INSERT_TIMETABLE_QUERY, inserts)):
+            for i in range(0, len(records), batch_size):
+                cursor.executemany(query, records[i:i + batch_size])
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    elapsed = perf_counter() - started
+    stats = {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes),
+             "unchanged": len(current) - len(updates) - len(deletes),
+             "seconds": round(elapsed, 3)}
+    logging.info(f"Synced timetable: {stats}")
+    return stats
+
+
+def sql_literal(value):
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def format_insert(row):
+    """
+    The INSERT statement for one row, for previewing or saving to a .sql/.txt file.
+    """
+    values = ", ".join(sql_literal(row[c] if c != "period_number" else int(row[c])) for c in TIMETABLE_COLUMNS)
+    return f"INSERT INTO timetable ({', '.join(TIMETABLE_COLUMNS)}) VALUES ({values});"
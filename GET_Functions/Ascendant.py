@@ -44,7 +44,7 @@ if Online:
     model = GoogleGenerativeAI(model="models/gemini-1.5-flash", google_api_key=api_key)
 else:
     st.toast("Using Mistral")
-    model = Ollama(model='mistral:instruct')
+    model = Ollama(model='mistral:instruct', base_url=os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434"))
 
 chat_history = []  # Store the chat history
 
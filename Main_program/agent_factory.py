@@ -0,0 +1,236 @@
+from langchain_community.llms import Ollama
+from langchain.agents import initialize_agent, AgentType
+from langchain.agents.mrkl.prompt import FORMAT_INSTRUCTIONS
+import logging
+import os
+import threading
+from time import perf_counter
+from timetable_db_fetch import (teacher_catalogue, check_if_free_now, get_weekly_timetable, get_daily_timetable,
+                                get_free_teachers, get_busy_teachers, get_teachers_free_during_periods,
+                                get_next_free_slot, get_faculty_availability)
+from faculty_detail_db import (get_faculty_by_research_area, search_faculty_info_by_name, find_best_match_tool)
+from timetable_index import get_timetable_index
+from faculty_directory import get_faculty_directory
+from model_cascade import CascadeLLM
+from tool_selector import ToolSelector, count_prompt_tokens
+from async_tools import build_async_tools
+from planner_agent import planner_agent_kwargs
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+MODEL_NAME = "qwen2.5:3b-instruct"
+# Ollama server; point it at Benchmarks/fake_ollama.py for model-free agent tests
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+# Small-to-large models tried per ReAct step (see model_cascade.py); MUJ_MODEL_CASCADE=0 uses MODEL_NAME only
+CASCADE_MODELS = ["qwen2.5:1.5b-instruct", MODEL_NAME]
+USE_MODEL_CASCADE = os.environ.get("MUJ_MODEL_CASCADE", "1") != "0"
+# Offer the agent only the tools relevant to each question (see tool_selector.py); MUJ_TOOL_SELECTION=0 offers all
+USE_TOOL_SELECTION = os.environ.get("MUJ_TOOL_SELECTION", "1") != "0"
+# How long Ollama keeps the model loaded after each request (-1 keeps it until the server stops, "30m" for 30 minutes)
+OLLAMA_KEEP_ALIVE = os.environ.get("MUJ_OLLAMA_KEEP_ALIVE", "-1")
+# Ollama reads a JSON number as seconds but parses a string as a Go duration, which needs a unit
+# ("-1" is rejected with a 400), so plain numbers are sent as integers
+if OLLAMA_KEEP_ALIVE.strip().lstrip("-").isdigit():
+    OLLAMA_KEEP_ALIVE = int(OLLAMA_KEEP_ALIVE)
+# Planner mode: the model may request several independent tool calls in one step, run concurrently
+# by ainvoke (see planner_agent.py); MUJ_AGENT_PLANNER=0 keeps the one-call-per-step ReAct format
+USE_PLANNER = os.environ.get("MUJ_AGENT_PLANNER", "1") != "0"
+
+# The whole system prompt; it no longer lists the tools (the ReAct prompt does, see agent_prompt_kwargs)
+SYSTEM_INSTRUCTIONS = """
+You are a helpful assistant who provides detailed, with accurate information .
+Ensure that you choose the correct tool based on the user's query and respond in a friendly, professional manner.
+If the query is unclear, ask for clarification , if none is listed say no data found , insure names passed are accurate.
+Refuse potentially bad requests. Functions Auto fetch current time.
+"""
+
+# ReAct prompt pieces. Everything that does not depend on the offered tools comes first, so every
+# tool subset (see ToolSubsetAgents) shares one prefix that warm_model() puts in Ollama's KV cache:
+#   system prompt | REACT_PREFIX | format instructions | TOOL_SECTION_HEADER  <- shared
+#   tool descriptions | TOOL_NAMES_LINE | Begin! Question: ...                  <- per subset / question
+REACT_PREFIX = "Answer the following questions as best you can."
+REACT_FORMAT_INSTRUCTIONS = FORMAT_INSTRUCTIONS.replace("should be one of [{tool_names}]",
+                                                        "should be one of the tools listed below")
+TOOL_SECTION_HEADER = "You have access to the following tools:"
+TOOL_NAMES_LINE = "Action must be one of [{tool_names}]."
+
+# Result of warm_model() per model name, shown in the sidebar
+warmup_status = {}
+_warmup_lock = threading.Lock()
+
+
+# Function to render a text description of available tools (mock implementation for illustration)
+def render_text_description(tools):
+    tool_descriptions = [f"{tool.name}: {tool.description}" for tool in tools]
+    return "\n".join(tool_descriptions)
+
+
+def build_tools():
+    # Define tools available (first faculty detail and second is timetable); each also has an
+    # async variant (ainvoke) that runs it on the bounded tool executor
+    return build_async_tools([get_faculty_by_research_area, search_faculty_info_by_name, find_best_match_tool,
+            check_if_free_now, get_weekly_timetable, get_daily_timetable, get_free_teachers, get_busy_teachers,
+            get_teachers_free_during_periods, get_next_free_slot, get_faculty_availability])
+
+
+def build_system_prompt():
+    # Identical for every question and tool subset; the tools are described in the ReAct prompt
+    return SYSTEM_INSTRUCTIONS
+
+
+def agent_prompt_kwargs(planner=USE_PLANNER):
+    """
+    agent_kwargs for the ZERO_SHOT_REACT agent: the format instructions (ReAct, or the planner's
+    multi-action variant) move into the prefix ahead of the tool list, and only the tool names
+    line is left after it.
+    """
+    kwargs = planner_agent_kwargs() if planner else {"format_instructions": REACT_FORMAT_INSTRUCTIONS}
+    kwargs["prefix"] = f"{REACT_PREFIX}\n\n{kwargs['format_instructions']}\n\n{TOOL_SECTION_HEADER}"
+    kwargs["format_instructions"] = TOOL_NAMES_LINE
+    return kwargs
+
+
+def build_model(system_prompt, model_name=MODEL_NAME, base_url=OLLAMA_BASE_URL, keep_alive=OLLAMA_KEEP_ALIVE):
+    # Initialize the Qwen2.5:3b-instruct model with the system prompt; keep_alive keeps it resident between questions
+    return Ollama(model=model_name, system=system_prompt, base_url=base_url, keep_alive=keep_alive)
+
+
+def build_cascade_model(system_prompt, tools, models=CASCADE_MODELS, base_url=OLLAMA_BASE_URL):
+    # One Ollama client per tier, all sharing the system prompt; escalation is decided per step
+    tiers = [build_model(system_prompt, model_name=name, base_url=base_url) for name in models]
+    return CascadeLLM(tiers=tiers, tool_names=[tool.name for tool in tools])
+
+
+def build_agent(model, tools, system_prompt, callbacks, planner=USE_PLANNER):
+    # Initialize the agent with tools
+    return initialize_agent(
+        tools=tools,
+        llm=model,
+        agent_type=AgentType.ZERO_SHOT_REACT_DESCRIPTION,  # Dynamically choose the right tool based on user input
+        system_prompt=system_prompt,  # Pass the system prompt
+        verbose=True,  # Enable verbose mode to print more detailed logs
+        callbacks=callbacks,  # Pass callbacks as a list
+        handle_parsing_errors=True,
+        agent_kwargs=agent_prompt_kwargs(planner)  # Shared prefix first; several tool calls per step in planner mode
+    )
+
+
+def agent_prompt_tokens(agent, system_prompt):
+    # Fixed prompt size of every ReAct step: the Ollama system prompt plus the agent's prompt template
+    return count_prompt_tokens(system_prompt + agent.agent.llm_chain.prompt.template)
+
+
+class ToolSubsetAgents:
+    """
+    Picks the relevant tools for each question and returns an agent that only describes those,
+    built once per distinct subset. All agents share the model client and the system prompt, and
+    their ReAct prompts differ only after the shared prefix. Prompt sizes are compared with the
+    all-tools agent.
+    """
+
+    def __init__(self, model, tools, selector=None, planner=USE_PLANNER):
+        self.model = model
+        self.tools = list(tools)
+        self.planner = planner
+        self.selector = selector or ToolSelector(self.tools)
+        self._agents = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "agents_built": 0, "prompt_tokens": 0, "prompt_tokens_saved": 0}
+        self.full_prompt_tokens = self._build(tuple(self.tools))[1]
+
+    def _build(self, tools):
+        key = tuple(tool.name for tool in tools)
+        with self._lock:
+            if key in self._agents:
+                return self._agents[key]
+        system_prompt = build_system_prompt()
+        agent = build_agent(self.model, list(tools), system_prompt, [], planner=self.planner)
+        entry = (agent, agent_prompt_tokens(agent, system_prompt))
+        with self._lock:
+            if key not in self._agents:
+                self._agents[key] = entry
+                self.stats["agents_built"] += 1
+            return self._agents[key]
+
+    def for_question(self, question):
+        """
+        Returns (agent, selection, prompt_tokens) where prompt_tokens is the fixed prompt size per step.
+        """
+        selection = self.selector.select(question)
+        agent, prompt_tokens = self._build(tuple(selection.tools))
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["prompt_tokens_saved"] += self.full_prompt_tokens - prompt_tokens
+        logging.info(f"Prompt for '{question}': {prompt_tokens} of {self.full_prompt_tokens} tokens "
+                     f"({len(selection.tools)}/{len(self.tools)} tools)")
+        return agent, selection, prompt_tokens
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        requests = stats["requests"]
+        stats["full_prompt_tokens"] = self.full_prompt_tokens
+        stats["avg_prompt_tokens"] = round(stats["prompt_tokens"] / requests) if requests else self.full_prompt_tokens
+        stats["avg_saving"] = (round(stats["prompt_tokens_saved"] / (requests * self.full_prompt_tokens), 3)
+                               if requests else 0.0)
+        stats["selector"] = self.selector.get_stats()
+        return stats
+
+
+def static_prompt_prefix(agent):
+    # Everything in the agent's ReAct prompt up to the tool list; identical for every tool subset and step
+    template = agent.agent.llm_chain.prompt.template
+    return template[:template.index(TOOL_SECTION_HEADER) + len(TOOL_SECTION_HEADER)]
+
+
+def warm_model(model, agent):
+    """
+    Loads every model tier and evaluates the shared prompt prefix once (one generated token), so
+    the first question finds the model resident and the prefix in Ollama's KV cache, whichever
+    tool subset it is offered.
+    Failures are logged and recorded in warmup_status; the app still starts.
+    """
+    prefix = static_prompt_prefix(agent)
+    for tier in getattr(model, "tiers", [model]):
+        started = perf_counter()
+        try:
+            info = tier._stream_with_aggregation(prefix, num_predict=1).generation_info or {}
+            status = {
+                "status": "warm",
+                "total_ms": round((perf_counter() - started) * 1000),
+                "load_ms": round((info.get("load_duration") or 0) / 1e6),
+                "prompt_tokens": info.get("prompt_eval_count"),
+            }
+            logging.info(f"Warmed model {tier.model}: {status}")
+        except Exception as err:
+            status = {"status": "failed", "total_ms": round((perf_counter() - started) * 1000), "error": str(err)[:200]}
+            logging.warning(f"Warm-up of model {tier.model} failed: {err}")
+        with _warmup_lock:
+            warmup_status[tier.model] = status
+
+
+def get_warmup_status():
+    with _warmup_lock:
+        return dict(warmup_status)
+
+
+def warm_caches():
+    """
+    Loads the timetable index, teacher catalogue and faculty directory up front,
+    so the first question does not pay for it.
+    """
+    get_timetable_index()
+    teacher_catalogue.ensure_fresh()
+    get_faculty_directory()
+    logging.info("Warmed timetable and faculty caches.")
+
+
+def reload_caches():
+    """
+    Forces a reload of every in-memory cache (after tables are edited).
+    """
+    get_timetable_index().refresh()
+    teacher_catalogue.ensure_fresh()
+    get_faculty_directory().refresh()
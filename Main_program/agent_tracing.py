@@ -0,0 +1,187 @@
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.schema import AgentAction, AgentFinish
+from datetime import datetime
+from time import perf_counter
+import json
+import logging
+import threading
+import uuid
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# One JSON object per span, appended after every agent run
+TRACE_FILE = "agent_traces.jsonl"
+
+# An LLM call whose model load (Ollama load_duration) took at least this long was a cold start
+COLD_LOAD_THRESHOLD_MS = 250
+
+# Name of the pseudo-tool the agent runs when the model's output could not be parsed
+PARSING_ERROR_TOOL = "_Exception"
+
+# Custom callback event a tool dispatches with its per-stage timings ({stage: ms}, in order);
+# the handler attaches them to the tool span and adds one "stage" span per entry
+STAGE_TIMINGS_EVENT = "stage_timings"
+
+_trace_file_lock = threading.Lock()
+
+
+class AgentTraceHandler(BaseCallbackHandler):
+    """
+    Records one span per LLM call and per tool call of an agent run: start/end offsets (ms from
+    the start of the message), token counts and the number of parsing-error retries.
+    Create one handler per message and pass it in the invoke config callbacks.
+    """
+    # Under ainvoke, handle events on the event loop rather than on executor threads
+    run_inline = True
+
+    def __init__(self, question, started_at=None):
+        self.trace_id = uuid.uuid4().hex
+        self.question = question
+        self.started_at = started_at if started_at is not None else perf_counter()
+        self.created = datetime.now().isoformat(timespec="seconds")
+        self.spans = []
+        self._open = {}
+        self.parse_retries = 0
+        self.finished_ms = None
+
+    def _offset_ms(self):
+        return round((perf_counter() - self.started_at) * 1000, 1)
+
+    def _open_span(self, run_id, kind, name, **fields):
+        span = {"kind": kind, "name": name, "start_ms": self._offset_ms(), "end_ms": None, "duration_ms": None}
+        span.update(fields)
+        self._open[run_id] = span
+        self.spans.append(span)
+        return span
+
+    def _close_span(self, run_id, **fields):
+        span = self._open.pop(run_id, None)
+        if span is None:
+            return None
+        span["end_ms"] = self._offset_ms()
+        span["duration_ms"] = round(span["end_ms"] - span["start_ms"], 1)
+        span.update(fields)
+        return span
+
+    # -------------------- LLM calls --------------------
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        llm_calls = sum(1 for s in self.spans if s["kind"] == "llm")
+        self._open_span(run_id, "llm", f"llm #{llm_calls + 1}", prompt_chars=sum(len(p) for p in prompts),
+                        prompt_tokens=None, completion_tokens=None, load_ms=None, streamed_chunks=0,
+                        first_token_ms=None)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        span = self._open.get(run_id)
+        if span is None:
+            return
+        span["streamed_chunks"] += 1
+        if span["first_token_ms"] is None:
+            span["first_token_ms"] = self._offset_ms()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        # Ollama reports prompt_eval_count / eval_count / load_duration (ns) on the final ("done") chunk
+        info = {}
+        if response.generations and response.generations[0]:
+            info = response.generations[0][0].generation_info or {}
+        load_duration = info.get("load_duration")
+        span = self._close_span(run_id, prompt_tokens=info.get("prompt_eval_count"),
+                                completion_tokens=info.get("eval_count"),
+                                load_ms=round(load_duration / 1e6, 1) if load_duration is not None else None)
+        if span is not None and span["completion_tokens"] is None:
+            span["completion_tokens"] = span["streamed_chunks"] or None
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._close_span(run_id, error=str(error))
+
+    # -------------------- Tool calls --------------------
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        if name == PARSING_ERROR_TOOL:
+            self.parse_retries += 1
+        self._open_span(run_id, "tool", name, tool_input=str(input_str)[:200])
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._close_span(run_id, output_chars=len(str(output)))
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._close_span(run_id, error=str(error))
+
+    def on_custom_event(self, name, data, *, run_id, **kwargs):
+        span = self._open.get(run_id)
+        if name != STAGE_TIMINGS_EVENT or span is None:
+            return
+        span["stage_ms"] = {stage: round(ms, 1) for stage, ms in data.items()}
+        # The stages ran back to back and the event is sent right after the last one
+        start = self._offset_ms() - sum(data.values())
+        for stage, ms in data.items():
+            self.spans.append({"kind": "stage", "name": f"{span['name']}: {stage}", "start_ms": round(start, 1),
+                               "end_ms": round(start + ms, 1), "duration_ms": round(ms, 1)})
+            start += ms
+
+    def on_agent_action(self, action: AgentAction, **kwargs):
+        logging.info(f"Agent action: {str(action.log).splitlines()[0] if action.log else action.tool}")
+
+    def on_agent_finish(self, finish: AgentFinish, **kwargs):
+        self.finish()
+
+    def finish(self):
+        """
+        Marks the end of the message (called by on_agent_finish, or by the caller for direct tool calls).
+        """
+        if self.finished_ms is None:
+            self.finished_ms = self._offset_ms()
+
+    # -------------------- Summary and export --------------------
+
+    def summary(self):
+        llm_spans = [s for s in self.spans if s["kind"] == "llm"]
+        tool_spans = [s for s in self.spans if s["kind"] == "tool"]
+        return {
+            "trace_id": self.trace_id,
+            "created": self.created,
+            "question": self.question,
+            "total_ms": self.finished_ms if self.finished_ms is not None else self._offset_ms(),
+            "llm_calls": len(llm_spans),
+            "llm_ms": round(sum(s["duration_ms"] or 0 for s in llm_spans), 1),
+            "tool_calls": len(tool_spans),
+            "tool_ms": round(sum(s["duration_ms"] or 0 for s in tool_spans), 1),
+            "prompt_tokens": sum(s["prompt_tokens"] or 0 for s in llm_spans),
+            "load_ms": round(sum(s["load_ms"] or 0 for s in llm_spans), 1),
+            "cold": any((s["load_ms"] or 0) >= COLD_LOAD_THRESHOLD_MS for s in llm_spans),
+            "completion_tokens": sum(s["completion_tokens"] or 0 for s in llm_spans),
+            "parse_retries": self.parse_retries,
+        }
+
+    def to_records(self):
+        """
+        One record per span, each tagged with the trace id and question, plus a closing
+        "run" record carrying the totals.
+        """
+        summary = self.summary()
+        records = [dict(span, trace_id=self.trace_id, question=self.question, created=self.created)
+                   for span in self.spans]
+        records.append(dict(summary, kind="run", name="agent run", start_ms=0.0, end_ms=summary["total_ms"],
+                            duration_ms=summary["total_ms"]))
+        return records
+
+    def write_jsonl(self, path=TRACE_FILE):
+        try:
+            with _trace_file_lock, open(path, "a", encoding="utf-8") as f:
+                for record in self.to_records():
+                    f.write(json.dumps(record, default=str) + "\n")
+        except OSError as err:
+            logging.error(f"Could not write agent trace to {path}: {err}")
+
+
+def load_traces(path=TRACE_FILE):
+    """
+    Reads the span records back from a trace file (for offline analysis).
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
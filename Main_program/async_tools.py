@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import db_pool
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# One worker per pooled database connection, so offloaded tools never queue inside the pool
+TOOL_EXECUTOR_WORKERS = db_pool.DEFAULT_POOL_SIZE
+
+
+class ToolExecutor:
+    """
+    Bounded thread pool that runs the blocking (mysql.connector / sqlite3) tool functions for
+    async callers, so an event loop can overlap several tool calls instead of waiting on each.
+    """
+
+    def __init__(self, max_workers=TOOL_EXECUTOR_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._lock = threading.Lock()
+        self._active = 0
+        self.stats = {"calls": 0, "errors": 0, "peak_active": 0, "queue_wait_ms_total": 0.0, "run_ms_total": 0.0}
+
+    def _run(self, submitted_at, context, func, args, kwargs):
+        started = perf_counter()
+        with self._lock:
+            self._active += 1
+            self.stats["peak_active"] = max(self.stats["peak_active"], self._active)
+            self.stats["queue_wait_ms_total"] += (started - submitted_at) * 1000
+        try:
+            return context.run(func, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.stats["calls"] += 1
+                self.stats["run_ms_total"] += (perf_counter() - started) * 1000
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Awaits func(*args, **kwargs) on a worker thread (with the caller's context variables).
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._run, perf_counter(), contextvars.copy_context(), func, args, kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats, active=self._active, max_workers=self.max_workers)
+        calls = stats["calls"]
+        stats["avg_queue_wait_ms"] = round(stats.pop("queue_wait_ms_total") / calls, 2) if calls else 0.0
+        stats["avg_run_ms"] = round(stats.pop("run_ms_total") / calls, 2) if calls else 0.0
+        return stats
+
+
+def with_coroutine(tool, executor=None):
+    """
+    Returns a copy of a sync LangChain tool whose coroutine= runs the same function on the tool
+    executor, so the tool works with both invoke() and ainvoke().
+    """
+    func = tool.func
+
+    async def coroutine(*args, **kwargs):
+        return await (executor or get_tool_executor()).run(func, *args, **kwargs)
+
+    coroutine.__name__ = f"a{func.__name__}"
+    coroutine.__doc__ = func.__doc__
+    return tool.model_copy(update={"coroutine": coroutine})
+
+
+def build_async_tools(tools, executor=None):
+    return [tool if tool.coroutine is not None else with_coroutine(tool, executor) for tool in tools]
+
+
+# ===================== Process-wide Executor =====================
+_tool_executor = None
+_tool_executor_lock = threading.Lock()
+
+
+def configure_tool_executor(max_workers=TOOL_EXECUTOR_WORKERS):
+    """
+    Replaces the shared executor (e.g. after configure_pool() with a different pool size).
+    """
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is not None:
+            _tool_executor.shutdown()
+        _tool_executor = ToolExecutor(max_workers)
+    return _tool_executor
+
+
+def get_tool_executor():
+    global _tool_executor
+    if _tool_executor is None:
+        with _tool_executor_lock:
+            if _tool_executor is None:
+                _tool_executor = ToolExecutor()
+    return _tool_executor
@@ -0,0 +1,234 @@
+import mysql.connector
+import logging
+import os
+import queue
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# MySQL connection settings shared by every tool module
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "",  # Set your MySQL password
+    "database": "ManipalUniversityJaipur"
+}
+
+# Storage backend: "mysql" (XAMPP server, DB_CONFIG) or "sqlite" (embedded copy of
+# DB Files/ManipalUniversityJaipur.sql, see sqlite_backend.py). MUJ_DB_BACKEND overrides it.
+DB_BACKEND = os.environ.get("MUJ_DB_BACKEND", "mysql")
+# ":memory:" or a SQLite file path for the embedded backend
+SQLITE_DATABASE = os.environ.get("MUJ_SQLITE_DATABASE", ":memory:")
+
+# Default pool settings (override with configure_pool before the first checkout)
+DEFAULT_POOL_SIZE = 5
+DEFAULT_CHECKOUT_TIMEOUT = 10  # Seconds to wait for a free connection when the pool is exhausted
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a connection handed out by the pool.
+    close() returns the connection to the pool instead of closing the socket,
+    so the existing `cursor ... conn.close()` pattern in the tools keeps working.
+    """
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._raw_conn = raw_conn
+        self._released = False
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._raw_conn)
+
+    def __getattr__(self, name):
+        return getattr(self._raw_conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of database connections (MySQL or the embedded SQLite backend).
+    Connections are opened lazily up to pool_size, health-checked on checkout
+    and reused across tool calls.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT,
+                 backend=None, **db_config):
+        self.backend = backend or DB_BACKEND
+        if self.backend not in ("mysql", "sqlite"):
+            raise ValueError(f"Unknown database backend {self.backend!r} (expected 'mysql' or 'sqlite').")
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.db_config = db_config or dict(DB_CONFIG)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self.metrics = {
+            "checkouts": 0,
+            "hits": 0,  # Checkouts served by an idle pooled connection
+            "misses": 0,  # Checkouts that had to open a new connection
+            "waits": 0,  # Checkouts that blocked because the pool was exhausted
+            "wait_time_total": 0.0,
+            "health_check_failures": 0,
+            "timeouts": 0,
+        }
+
+    def _open_connection(self):
+        if self.backend == "sqlite":
+            # Imported here so the MySQL deployment never touches the dump
+            import sqlite_backend
+            return sqlite_backend.connect(self.db_config.get("sqlite_database", SQLITE_DATABASE))
+        return mysql.connector.connect(**self.db_config)
+
+    def _is_healthy(self, raw_conn):
+        try:
+            raw_conn.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def _discard(self, raw_conn):
+        try:
+            raw_conn.close()
+        except mysql.connector.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    def get_connection(self):
+        """
+        Checks out a healthy connection, opening a new one if the pool is not full
+        and waiting up to checkout_timeout seconds otherwise.
+        """
+        with self._lock:
+            self.metrics["checkouts"] += 1
+
+        while True:
+            raw_conn = None
+            try:
+                raw_conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._opened < self.pool_size
+                    if can_open:
+                        self._opened += 1
+                if can_open:
+                    try:
+                        raw_conn = self._open_connection()
+                    except BaseException:
+                        # Any failure (not only mysql.connector.Error, e.g. a bad SQLite path) frees the slot
+                        with self._lock:
+                            self._opened -= 1
+                        raise
+                    with self._lock:
+                        self.metrics["misses"] += 1
+                    return PooledConnection(self, raw_conn)
+
+                # Pool exhausted, wait for another caller to release a connection
+                wait_start = time.perf_counter()
+                try:
+                    raw_conn = self._idle.get(timeout=self.checkout_timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self.metrics["timeouts"] += 1
+                    raise mysql.connector.errors.PoolError(
+                        f"No connection available after waiting {self.checkout_timeout}s "
+                        f"(pool size {self.pool_size})."
+                    )
+                finally:
+                    waited = time.perf_counter() - wait_start
+                    with self._lock:
+                        self.metrics["waits"] += 1
+                        self.metrics["wait_time_total"] += waited
+
+            # Health check on checkout; broken connections are dropped and replaced
+            if self._is_healthy(raw_conn):
+                with self._lock:
+                    self.metrics["hits"] += 1
+                return PooledConnection(self, raw_conn)
+
+            logging.warning("Discarding unhealthy pooled database connection.")
+            with self._lock:
+                self.metrics["health_check_failures"] += 1
+            self._discard(raw_conn)
+
+    def release(self, raw_conn):
+        # Roll back anything left open so the next borrower starts clean
+        try:
+            if raw_conn.in_transaction:
+                raw_conn.rollback()
+        except mysql.connector.Error:
+            self._discard(raw_conn)
+            return
+        self._idle.put(raw_conn)
+
+    def close_all(self):
+        while True:
+            try:
+                raw_conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(raw_conn)
+
+    def get_metrics(self):
+        with self._lock:
+            metrics = dict(self.metrics)
+            metrics["backend"] = self.backend
+            metrics["pool_size"] = self.pool_size
+            metrics["open_connections"] = self._opened
+        metrics["idle_connections"] = self._idle.qsize()
+        checkouts = metrics["checkouts"]
+        metrics["hit_rate"] = metrics["hits"] / checkouts if checkouts else 0.0
+        metrics["avg_wait_ms"] = (metrics["wait_time_total"] / metrics["waits"] * 1000) if metrics["waits"] else 0.0
+        return metrics
+
+
+# ===================== Process-wide Pool =====================
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(pool_size=DEFAULT_POOL_SIZE, checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT, backend=None,
+                   **db_config):
+    """
+    Replaces the shared pool with one using the given size, timeout, backend and connection settings.
+    For the SQLite backend pass sqlite_database=":memory:" or a file path.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        config = dict(DB_CONFIG)
+        config.update(db_config)
+        _pool = ConnectionPool(pool_size=pool_size, checkout_timeout=checkout_timeout, backend=backend, **config)
+        logging.info(f"Configured {_pool.backend} connection pool (size {pool_size}).")
+    return _pool
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(**DB_CONFIG)
+    return _pool
+
+
+def get_connection():
+    """
+    Checks out a pooled connection. Call close() on it to return it to the pool.
+    """
+    return get_pool().get_connection()
+
+
+def get_pool_metrics():
+    return get_pool().get_metrics()
@@ -1,39 +1,32 @@
 import mysql.connector
-from fuzzywuzzy import fuzz, process
 from langchain.tools import tool
 import logging
-import re
+import db_pool
+from faculty_directory import get_faculty_directory
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Matches listed from the global Faculty table (FacultyInfo matches are never capped)
+GLOBAL_RESEARCH_MATCHES = 5
+
+# Returned by the tools while the faculty directory has never loaded (database down or pool exhausted)
+DB_UNAVAILABLE_MESSAGE = "The faculty database is unavailable right now. Please try again in a moment."
+
 
 def connect_db():
     """
-    Establishes a connection to the MySQL database.
+    Checks out a connection from the shared MySQL pool (see db_pool.py).
     Returns the connection object if successful, else None.
     """
     try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="ManipalUniversityJaipur"  # Ensure this database contains both FacultyInfo and Faculty tables
-        )
-        logging.info("Database connection established.")
+        conn = db_pool.get_connection()  # Database must contain both FacultyInfo and Faculty tables
         return conn
     except mysql.connector.Error as err:
         logging.error("Error connecting to the database: %s", err)
         return None
 
 
-def normalize_name(name):
-    """
-    Removes titles like Dr., Mr., Ms., etc., and converts to lowercase for normalization.
-    """
-    return re.sub(r'\b(Dr\.|Mr\.|Ms\.|Prof\.)\b', '', name).strip().lower()
-
-
 # -------------------- FacultyInfo Table Functions --------------------
 
 # Helper function to retrieve all faculty names from FacultyInfo
@@ -115,36 +108,59 @@ def get_faculty_info_details(name):
         connection.close()
 
 
+# Helper function returning the cached directory, or None while it has never loaded
+def get_loaded_faculty_directory():
+    directory = get_faculty_directory()
+    return directory if directory.loaded else None
+
+
+# Helper function to turn a cached FacultyInfo record into the details dict used by the tools
+def faculty_info_details(record):
+    return {key: record[key] for key in ('name', 'email', 'ext_number', 'phone_number', 'block_location',
+                                         'floor_location', 'room_number', 'workstation', 'research_area',
+                                         'google_scholar_link')}
+
+
 @tool
 def get_faculty_by_research_area(search_research_area: str) -> str:
     """
-    Returns a list of FacultyInfo members matching the given research area based on fuzzy matching input is like "IOT" , "AI/ML" etc.
+    Returns faculty whose research area or expertise matches the given topic, input is like "IOT" , "AI/ML" etc.
+    Lists IoT department (FacultyInfo) matches first, then matches from the global Faculty table.
     """
-    results = get_all_faculty_info_records()
-    if not results:
+    directory = get_loaded_faculty_directory()
+    if directory is None:
+        return DB_UNAVAILABLE_MESSAGE
+    if not directory.faculty_info.records and not directory.faculty.records:
         return "No faculty records found in FacultyInfo."
 
-    # Use fuzzy matching to find close matches to the search query
-    matches = []
-    for name, research_area, google_scholar_link in results:
-        if fuzz.partial_ratio(search_research_area.lower(), research_area.lower()) > 70:  # Adjusted threshold
-            matches.append({
-                'name': name,
-                'research_area': research_area,
-                'google_scholar_link': google_scholar_link
-            })
-
-    if matches:
-        return (
-                f"Faculty in FacultyInfo matching research area '{search_research_area}':\n" +
-                "\n".join([
-                    f"- {m['name']} (Research Area: {m['research_area']}, Google Scholar: {m['google_scholar_link']})"
-                    for m in matches
-                ])
-        )
-    else:
+    # Ranked lookup in the inverted index (synonyms such as IoT / Internet of Things are expanded);
+    # every FacultyInfo match is listed, the global table only its best few
+    info_matches = directory.search_research_area(search_research_area, limit=None, source="FacultyInfo")
+    faculty_matches = directory.search_research_area(search_research_area, limit=GLOBAL_RESEARCH_MATCHES,
+                                                     source="Faculty")
+
+    if not info_matches and not faculty_matches:
         return f"No FacultyInfo members found with a research area matching '{search_research_area}'."
 
+    sections = []
+    if info_matches:
+        sections.append(
+            f"Faculty in FacultyInfo matching research area '{search_research_area}':\n" +
+            "\n".join([
+                f"- {m['name']} (Research Area: {m['research_area']}, Google Scholar: {m['google_scholar_link']})"
+                for m, _ in info_matches
+            ])
+        )
+    if faculty_matches:
+        sections.append(
+            f"Top {GLOBAL_RESEARCH_MATCHES} faculty in the global Faculty table with matching expertise:\n" +
+            "\n".join([
+                f"- {m['name']} ({m['department']}, Expertise: {(m['expertise'] or m['achievements'])[:150]})"
+                for m, _ in faculty_matches
+            ])
+        )
+    return "\n\n".join(sections)
+
 
 @tool
 def search_faculty_info_by_name(search_name: str) -> str:
@@ -155,54 +171,42 @@ def search_faculty_info_by_name(search_name: str) -> str:
     """
 
     detailed = True
-    results = get_all_faculty_info_records()
-    if not results:
+    directory = get_loaded_faculty_directory()
+    if directory is None:
+        return DB_UNAVAILABLE_MESSAGE
+    if not directory.faculty_info.records:
         return "No faculty records found in FacultyInfo."
 
-    # Normalize search name
-    normalized_search = normalize_name(search_name)
-
-    # Use fuzzy matching to find the closest match on normalized names
-    faculty_names = [normalize_name(name) for name, _, _ in results]
-    matches = process.extract(normalized_search, faculty_names, limit=1, scorer=fuzz.token_sort_ratio)
-    best_match = matches[0] if matches else None
-
-    if best_match and best_match[1] >= 70:
-        # Find the original name from results
-        index = faculty_names.index(best_match[0])
-        original_name = results[index][0]
-        # Retrieve full details
-        details = get_faculty_info_details(original_name)
-        if details:
-            if detailed:
-                return (
-                        f"Details for '{original_name}' in FacultyInfo:\n" +
-                        "\n".join([f"{key.capitalize()}: {value}" for key, value in details.items()])
-                )
-            else:
-                # Return basic details
-                basic_info = {
-                    'name': details['name'],
-                    'email': details['email'],
-                    'phone_number': details['phone_number'],
-                    'research_area': details['research_area']
-                }
-                return (
-                        f"Details for '{original_name}' in FacultyInfo:\n" +
-                        "\n".join([f"{key.capitalize()}: {value}" for key, value in basic_info.items()])
-                )
+    # One fuzzy pass over the precomputed normalised names
+    record, score = directory.match_faculty_info(search_name)
+
+    if record and score >= 70:
+        original_name = record['name']
+        details = faculty_info_details(record)
+        if detailed:
+            return (
+                    f"Details for '{original_name}' in FacultyInfo:\n" +
+                    "\n".join([f"{key.capitalize()}: {value}" for key, value in details.items()])
+            )
         else:
-            return f"No details found for '{original_name}' in FacultyInfo."
+            # Return basic details
+            basic_info = {
+                'name': details['name'],
+                'email': details['email'],
+                'phone_number': details['phone_number'],
+                'research_area': details['research_area']
+            }
+            return (
+                    f"Details for '{original_name}' in FacultyInfo:\n" +
+                    "\n".join([f"{key.capitalize()}: {value}" for key, value in basic_info.items()])
+            )
+    elif record:
+        # Report the closest match even with lower confidence
+        return (f"No suitable match found for '{search_name}' in FacultyInfo. "
+                f"Closest match: '{record['name']}' (Score: {score}). "
+                f"Please verify the information.")
     else:
-        # Attempt to find the closest match even with lower confidence
-        closest_match = process.extractOne(normalized_search, faculty_names, scorer=fuzz.token_sort_ratio)
-        if closest_match:
-            original_name = results[faculty_names.index(closest_match[0])][0]
-            return (f"No suitable match found for '{search_name}' in FacultyInfo. "
-                    f"Closest match: '{original_name}' (Score: {closest_match[1]}). "
-                    f"Please verify the information.")
-        else:
-            return f"No suitable match found for '{search_name}' in FacultyInfo."
+        return f"No suitable match found for '{search_name}' in FacultyInfo."
 
 
 @tool
@@ -210,8 +214,12 @@ def get_faculty_info_details_by_name(name: str) -> str:
     """
     Returns comprehensive details of a FacultyInfo member by name.
     """
-    details = get_faculty_info_details(name)
-    if details:
+    directory = get_loaded_faculty_directory()
+    if directory is None:
+        return DB_UNAVAILABLE_MESSAGE
+    record = directory.faculty_info_by_name(name)
+    if record:
+        details = faculty_info_details(record)
         return (
                 "FacultyInfo Details:\n" +
                 "\n".join([f"{key.capitalize()}: {value}" for key, value in details.items()])
@@ -282,30 +290,35 @@ def get_faculty_details_by_name(name):
         connection.close()
 
 
-# Function to find the best matching faculty using fuzzy matching from Faculty
-def find_best_match(input_name):
-    faculty_names = get_all_faculty_names()
-    if not faculty_names:
+# Function to find the best matching faculty record using fuzzy matching over the cached Faculty table
+def find_best_match_record(input_name):
+    record, score = get_faculty_directory().match_faculty(input_name)
+    if record is None:
         return None
-
-    # Use fuzzy matching to find the closest match
-    best_match, score = process.extractOne(input_name, faculty_names)
-    logging.info("Best match: %s (Score: %d)", best_match, score)
+    logging.info("Best match: %s (Score: %d)", record['name'], score)
 
     if score > 70:  # Only accept matches with a confidence score greater than 70
-        return best_match
+        return record
     else:
         return None
 
 
+# Function to find the best matching faculty name from Faculty
+def find_best_match(input_name):
+    record = find_best_match_record(input_name)
+    return record['name'] if record else None
+
+
+# Helper function to turn a cached Faculty record into the details dict used by the tools
+def faculty_details(record):
+    return {key: record[key] for key in ('name', 'position', 'email', 'phone', 'department', 'img_url',
+                                         'qualifications', 'expertise', 'achievements')}
+
+
 def get_best_match_details(input_name):
-    best_match = find_best_match(input_name)
-    if best_match:
-        faculty_details = get_faculty_details_by_name(best_match)
-        if faculty_details:
-            return str(faculty_details)
-        else:
-            return "No details found for the best match."
+    record = find_best_match_record(input_name)
+    if record:
+        return str(faculty_details(record))
     else:
         return "No suitable match found."
 
@@ -319,17 +332,16 @@ def find_best_match_tool(input_name: str) -> str:
 
     returns link to photo of the faculty too
     """
-    best_match = find_best_match(input_name)
-    if best_match:
-        faculty_details = get_faculty_details_by_name(best_match)
-        if faculty_details:
-            return (
-                    f"Best match: {best_match}\n"
-                    f"Details:\n" +
-                    "\n".join([f"{key.capitalize()}: {value}" for key, value in faculty_details.items()])
-            )
-        else:
-            return f"Best match: {best_match}\nNo additional details found."
+    if get_loaded_faculty_directory() is None:
+        return DB_UNAVAILABLE_MESSAGE
+    record = find_best_match_record(input_name)
+    if record:
+        details = faculty_details(record)
+        return (
+                f"Best match: {record['name']}\n"
+                f"Details:\n" +
+                "\n".join([f"{key.capitalize()}: {value}" for key, value in details.items()])
+        )
     else:
         return "No suitable match found."
 
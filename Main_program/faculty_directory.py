@@ -0,0 +1,176 @@
+import mysql.connector
+from rapidfuzz import fuzz, process, utils
+import logging
+import re
+import threading
+import time
+import zlib
+import db_pool
+from research_index import ResearchIndex
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Reload both tables after this many seconds
+DIRECTORY_TTL = 600
+
+FACULTY_INFO_COLUMNS = ['id', 'name', 'email', 'ext_number', 'phone_number', 'block_location',
+                        'floor_location', 'room_number', 'workstation', 'research_area', 'google_scholar_link']
+FACULTY_COLUMNS = ['id', 'name', 'position', 'email', 'phone', 'department', 'img_url',
+                   'qualifications', 'expertise', 'achievements']
+
+
+def normalize_name(name):
+    """
+    Removes titles like Dr., Mr., Ms., etc., and converts to lowercase for normalization.
+    """
+    return re.sub(r'\b(Dr\.|Mr\.|Ms\.|Prof\.)\b', '', name).strip().lower()
+
+
+class DirectoryTable:
+    """
+    One cached table: records keyed by id and by normalised name, plus the
+    precomputed fuzzy-matching choices in the same order as `records`.
+    """
+
+    def __init__(self, records, normalizer):
+        self.records = records
+        self.by_id = {r['id']: r for r in records}
+        self.by_name = {}
+        self.by_normalized_name = {}
+        for r in records:
+            self.by_name.setdefault(r['name'], r)
+        self.choices = [normalizer(r['name'] or "") for r in records]
+        for r, choice in zip(records, self.choices):
+            self.by_normalized_name.setdefault(choice, r)
+
+    def best_match(self, query, scorer):
+        """
+        Returns (record, score) for the closest name, or (None, 0).
+        """
+        if not self.choices:
+            return None, 0
+        result = process.extractOne(query, self.choices, scorer=scorer, processor=None)
+        if not result:
+            return None, 0
+        _, score, index = result
+        return self.records[index], round(score)
+
+
+class FacultyDirectory:
+    """
+    In-memory copy of the FacultyInfo (IoT department) and Faculty (global) tables.
+    Lookups are one fuzzy pass over precomputed names plus a dict hit.
+    """
+
+    def __init__(self, ttl=DIRECTORY_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.loaded_at = None
+        # False until the first successful refresh(); last_error is the error of the latest failed load
+        self.loaded = False
+        self.last_error = None
+        # Checksum of both tables as last loaded; changes whenever any row does
+        self.version = None
+        # FacultyInfo names are compared after normalize_name; Faculty names after rapidfuzz's default processing
+        self.faculty_info = DirectoryTable([], normalize_name)
+        self.faculty = DirectoryTable([], utils.default_process)
+        # BM25 index over FacultyInfo.research_area and Faculty.expertise/achievements
+        self.research_index = ResearchIndex()
+
+    def _fetch(self, conn, table, columns):
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def refresh(self):
+        """
+        Reloads both tables from the database. On a database error (including pool exhaustion)
+        the current tables are kept, the error is kept in last_error and False is returned.
+        """
+        try:
+            conn = db_pool.get_connection()
+        except mysql.connector.Error as err:
+            logging.error("Error loading faculty directory: %s", err)
+            self.last_error = str(err)
+            return False
+        try:
+            info_records = self._fetch(conn, "FacultyInfo", FACULTY_INFO_COLUMNS)
+            faculty_records = self._fetch(conn, "Faculty", FACULTY_COLUMNS)
+        except mysql.connector.Error as err:
+            logging.error("Error loading faculty directory: %s", err)
+            self.last_error = str(err)
+            return False
+        finally:
+            conn.close()
+
+        info_table = DirectoryTable(info_records, normalize_name)
+        faculty_table = DirectoryTable(faculty_records, utils.default_process)
+        with self._lock:
+            self.faculty_info = info_table
+            self.faculty = faculty_table
+            self.loaded_at = time.monotonic()
+            self.loaded = True
+            self.last_error = None
+            self.version = zlib.crc32(repr((info_records, faculty_records)).encode("utf-8"))
+
+        # Incrementally re-index only the rows whose text changed
+        self.research_index.sync_source("FacultyInfo", {
+            r['id']: (r['research_area'] or "", r) for r in info_records
+        })
+        self.research_index.sync_source("Faculty", {
+            r['id']: (" ".join(filter(None, [r['expertise'], r['achievements']])), r) for r in faculty_records
+        })
+        logging.info("Loaded faculty directory (%d FacultyInfo, %d Faculty records).",
+                     len(info_records), len(faculty_records))
+        return True
+
+    def refresh_if_stale(self):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl:
+            return self.refresh()
+        return False
+
+    # -------------------- Lookups --------------------
+
+    def match_faculty_info(self, search_name):
+        """
+        Closest FacultyInfo record by normalised name (token_sort_ratio), as (record, score).
+        """
+        return self.faculty_info.best_match(normalize_name(search_name), fuzz.token_sort_ratio)
+
+    def match_faculty(self, input_name):
+        """
+        Closest Faculty record (WRatio), as (record, score).
+        """
+        return self.faculty.best_match(utils.default_process(input_name), fuzz.WRatio)
+
+    def search_research_area(self, query, limit=10, source=None):
+        """
+        Ranked (record, score) pairs whose research/expertise text matches the query (limit=None: all).
+        """
+        return [(meta, score) for _, score, meta in self.research_index.search(query, limit=limit, source=source)]
+
+    def faculty_info_by_name(self, name):
+        return self.faculty_info.by_name.get(name) or self.faculty_info.by_normalized_name.get(normalize_name(name))
+
+    def faculty_by_name(self, name):
+        return self.faculty.by_name.get(name) or self.faculty.by_normalized_name.get(utils.default_process(name))
+
+
+# ===================== Process-wide Directory =====================
+faculty_directory = FacultyDirectory()
+
+
+def get_faculty_directory():
+    """
+    Returns the shared directory, loading it on first use and again once the TTL expires.
+    """
+    faculty_directory.refresh_if_stale()
+    return faculty_directory
+
+
+def refresh_faculty_directory():
+    return faculty_directory.refresh()
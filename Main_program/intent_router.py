@@ -0,0 +1,316 @@
+from collections import Counter, namedtuple
+from rapidfuzz import fuzz, process, utils
+import logging
+import re
+import threading
+from timetable_db_fetch import (teacher_catalogue, check_if_free_now, get_weekly_timetable, get_daily_timetable,
+                                get_free_teachers, get_busy_teachers, get_teachers_free_during_periods,
+                                get_next_free_slot, get_faculty_availability)
+from faculty_detail_db import (get_faculty_directory, get_faculty_by_research_area, search_faculty_info_by_name,
+                               find_best_match_tool)
+from name_catalogue import normalize_person_name
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Decisions at or above this confidence call the tool directly; the rest go to the agent
+ROUTER_CONFIDENCE_THRESHOLD = 0.8
+# Minimum fuzzy score (0-100) for a name span to count as a known person
+NAME_MATCH_THRESHOLD = 85
+# The best name must beat the runner-up by this many points, otherwise the span is ambiguous ("sharma")
+NAME_AMBIGUITY_MARGIN = 5
+
+RouteDecision = namedtuple('RouteDecision', ['intent', 'tool', 'tool_input', 'confidence', 'entities'])
+
+# Words that describe the question rather than the person; whatever is left is a name candidate
+QUESTION_WORDS = {
+    "a", "about", "all", "also", "am", "an", "any", "anyone", "are", "at", "availability", "available", "be",
+    "both", "busy", "cabin", "can", "class", "classes", "contact", "could", "currently", "daily", "day",
+    "details", "do", "does", "dr", "e-mail", "either", "email", "ext", "extension", "faculties", "faculty",
+    "find", "for", "free", "from", "get", "give", "has", "have", "he", "her", "his", "how", "i", "id", "in",
+    "info", "information", "is", "it", "know", "lecture", "lectures", "list", "location", "maam", "mail", "mam",
+    "me", "mobile", "mr", "mrs", "ms", "my", "next", "now", "number", "of", "office", "on", "phone", "please",
+    "prof", "professor", "right", "room", "schedule", "seat", "she", "show", "sir", "sit", "sits", "slot",
+    "teacher", "teachers", "teaching", "tell", "the", "their", "them", "there", "they", "this", "time",
+    "timetable", "to", "today", "todays", "u", "want", "was", "week", "weekly", "what", "whats", "when",
+    "where", "which", "who", "whole", "will", "with", "workstation", "would", "you", "your",
+    # Period-range vocabulary ("free during periods 3 to 5")
+    "between", "during", "period", "periods", "through",
+}
+NAME_SEPARATORS = {"and", "or", "&", ","}
+TOKEN_PATTERN = re.compile(r"[A-Za-z][A-Za-z.\-']*|&|,")
+PERIOD_RANGE_PATTERN = re.compile(r'periods?\s*(\d{1,2})\s*(?:-|–|to|and|through)\s*(?:period\s*)?(\d{1,2})', re.I)
+DAY_PATTERN = re.compile(r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b', re.I)
+# A day or clock time other than "now"/"today". The tools behind these rules only answer for the
+# current moment (or today), so such questions go to the agent; only the period-range rule takes a day
+TIME_REFERENCE_PATTERN = re.compile(
+    r'\b(mon|tues?|wed|thu|thurs?|fri|sat|sun)(day|nesday|rsday|urday)?\b|\b(tomorrow|yesterday|tonight|weekend|'
+    r'morning|afternoon|evening|noon|midnight|later|next week|o\'?clock)\b|\b\d{1,2}[:.]\d{2}\b|'
+    r'\b\d{1,2}\s*(am|pm|a\.m\.?|p\.m\.?)(?!\w)|\b(at|after|before|by|until|till|from|around)\s+\d{1,2}\b|'
+    r'\bin\s+\d+\s*(min(ute)?s?|hours?|hrs?)\b|\b\d{1,2}(st|nd|rd|th)\b', re.I)
+# Rules whose tool answers only for the current time (weekly timetables, contacts and research
+# areas do not depend on when the question is asked about)
+TIME_DEPENDENT_INTENTS = {"free_now", "next_free_slot", "availability", "daily_timetable", "free_teachers",
+                          "busy_teachers"}
+
+# (intent, pattern, base confidence, name source); first matching rule wins, so specific rules come first
+INTENT_RULES = [
+    ("free_during_periods", re.compile(r'\bfree\b.*\bperiods?\s*\d', re.I), 0.95, None),
+    ("research_area", re.compile(r'\b(research|works? on|working on|expert(ise)? in|specialis[ez]s? in|'
+                                 r'specializ(e|es|ing) in|area of)\b', re.I), 0.85, None),
+    ("contact", re.compile(r'\b(e-?mail|mail id|phone|mobile|contact|number|extension|cabin|workstation|'
+                           r'room|seat|sits?|where (is|can i find|does))\b', re.I), 0.9, "faculty"),
+    ("next_free_slot", re.compile(r'\b(next free|next slot|free next|when (is|will)\b.*\bfree|free after)\b', re.I),
+     0.9, "teacher"),
+    ("availability", re.compile(r'\bavailability\b', re.I), 0.9, "teacher"),
+    ("weekly_timetable", re.compile(r'\b(weekly|this week|whole week|week\'?s?)\b.*\b(timetable|schedule|classes)\b|'
+                                    r'\b(timetable|schedule|classes)\b.*\b(week|weekly)\b', re.I), 0.9, "teacher"),
+    ("daily_timetable", re.compile(r'\b(timetable|schedule|classes|lectures)\b', re.I), 0.85, "teacher"),
+    ("free_teachers", re.compile(r'\b(who|which|list|all|any)\b.*\b(free|available)\b|\bfree (teachers|faculty)\b',
+                                 re.I), 0.9, None),
+    ("busy_teachers", re.compile(r'\b(who|which|list|all|any)\b.*\bbusy\b|\bbusy (teachers|faculty)\b', re.I),
+     0.9, None),
+    ("free_now", re.compile(r'\b(free|available|busy)\b', re.I), 0.9, "teacher"),
+]
+
+TOOLS_BY_INTENT = {
+    "free_now": check_if_free_now,
+    "next_free_slot": get_next_free_slot,
+    "availability": get_faculty_availability,
+    "weekly_timetable": get_weekly_timetable,
+    "daily_timetable": get_daily_timetable,
+    "free_teachers": get_free_teachers,
+    "busy_teachers": get_busy_teachers,
+    "free_during_periods": get_teachers_free_during_periods,
+    "research_area": get_faculty_by_research_area,
+}
+INPUT_KEY_BY_INTENT = {
+    "free_now": "input_name",
+    "next_free_slot": "input_name",
+    "availability": "faculty_name",
+    "weekly_timetable": "input_name",
+    "daily_timetable": "input_name",
+}
+
+
+def extract_name_spans(text):
+    """
+    Returns the runs of words that are not question vocabulary, split on and/or/commas.
+    "are Abhay and Geeta free now?" -> ["abhay", "geeta"]
+    """
+    spans, current = [], []
+    for token in TOKEN_PATTERN.findall(text):
+        word = token.lower().strip(".'-")
+        if word.endswith("'s"):
+            word = word[:-2]
+        if token in NAME_SEPARATORS or word in NAME_SEPARATORS or word in QUESTION_WORDS or not word:
+            if current:
+                spans.append(" ".join(current))
+                current = []
+            continue
+        current.append(word)
+    if current:
+        spans.append(" ".join(current))
+    return spans
+
+
+def extract_research_topic(text):
+    """
+    Strips the question framing and lead-in ("tell me about ...", "... by") from a research-area
+    question, keeping the topic words.
+    """
+    topic = re.sub(r'\b(who|whos|which|what|whats|faculty|faculties|teachers?|professors?|is|are|does|do|works?|'
+                   r'working|on|in|research|area|areas|of|expert|experts|expertise|specialis[ez]s?|'
+                   r'specializ(e|es|ing)|the|department|members?|any|anyone|someone|with|interest|interested|'
+                   r'tell|me|about|show|give|list|find|get|please|can|could|would|you|i|want|to|know|for|by|from|'
+                   r'fields?|domains?|topics?|people|person|there|has|have|a|an)\b', ' ', text, flags=re.I)
+    return " ".join(re.sub(r"[?!.,]|'s\b", ' ', topic).split())
+
+
+def remove_time_references(text):
+    return TIME_REFERENCE_PATTERN.sub(' ', text)
+
+
+class IntentRouter:
+    """
+    Rule- and pattern-based intent classifier with faculty-name span extraction.
+    route() returns a RouteDecision (or None) and keeps per-intent hit/fallback counters.
+    """
+
+    def __init__(self, threshold=ROUTER_CONFIDENCE_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.stats = Counter()
+        self.intent_hits = Counter()
+        self.intent_fallbacks = Counter()
+        # Words of every known person's name, rebuilt when the timetable or faculty data changes
+        self._name_words = set()
+        self._name_words_version = object()
+
+    # -------------------- Name resolution --------------------
+
+    def _is_confident(self, scores):
+        """
+        scores: best-first candidate scores for one span.
+        """
+        if not scores or scores[0] < NAME_MATCH_THRESHOLD:
+            return False
+        return len(scores) == 1 or scores[0] - scores[1] >= NAME_AMBIGUITY_MARGIN
+
+    def _resolve_teacher(self, span):
+        """
+        Returns (resolved_name, confident) from the timetable teacher catalogue.
+        """
+        candidates = teacher_catalogue.top(span, limit=2)
+        if not candidates:
+            return None, False
+        return candidates[0][0], self._is_confident([score for _, score in candidates])
+
+    def _resolve_faculty(self, span):
+        """
+        Prefers the IoT FacultyInfo table, then the global Faculty table.
+        Returns (tool, resolved_name, confident).
+        """
+        directory = get_faculty_directory()
+        query = utils.default_process(span)
+        for table, tool in ((directory.faculty_info, search_faculty_info_by_name),
+                            (directory.faculty, find_best_match_tool)):
+            if not table.choices:
+                continue
+            results = process.extract(query, table.choices, scorer=fuzz.WRatio, processor=None, limit=2)
+            if results and results[0][1] >= NAME_MATCH_THRESHOLD:
+                confident = self._is_confident([score for _, score, _ in results])
+                return tool, table.records[results[0][2]]['name'], confident
+        return None, None, False
+
+    def _known_name_words(self):
+        """
+        Lowercase words (3+ letters, titles dropped) of the timetable and faculty names, used to
+        notice a person inside a research topic ("machine learning by abhay").
+        """
+        directory = get_faculty_directory()
+        teacher_catalogue.ensure_fresh()
+        version = (teacher_catalogue.version, directory.version)
+        if version != self._name_words_version:
+            names = (list(teacher_catalogue.choices) + list(directory.faculty_info.choices)
+                     + list(directory.faculty.choices))
+            words = {w for name in names for w in normalize_person_name(name).split() if len(w) >= 3}
+            with self._lock:
+                self._name_words, self._name_words_version = words, version
+        return self._name_words
+
+    # -------------------- Classification --------------------
+
+    def classify(self, text):
+        """
+        Returns a RouteDecision for the first matching rule, or None when no rule applies.
+        """
+        for intent, pattern, base_confidence, name_source in INTENT_RULES:
+            if not pattern.search(text):
+                continue
+
+            if intent == "free_during_periods":
+                match = PERIOD_RANGE_PATTERN.search(text) or re.search(r'periods?\s*(\d{1,2})()', text, re.I)
+                if not match:
+                    return RouteDecision(intent, None, None, 0.0, {})
+                first = int(match.group(1))
+                last = int(match.group(2)) if match.group(2) else first
+                periods = f"{min(first, last)}-{max(first, last)}"
+                day = DAY_PATTERN.search(text)
+                if day:
+                    periods += f" {day.group(0)}"
+                # The weekday is the tool's day argument; any other time ("tomorrow", "at 2:30") is not
+                rest = PERIOD_RANGE_PATTERN.sub(' ', DAY_PATTERN.sub(' ', text))
+                other_time = TIME_REFERENCE_PATTERN.search(rest)
+                # The tool lists the whole department; a named person ("is abhay free during period 3")
+                # needs their own timetable, so leave those to the agent like the other department-wide rules
+                spans = extract_name_spans(remove_time_references(rest))
+                confidence = base_confidence if not spans and not other_time else base_confidence * 0.5
+                return RouteDecision(intent, TOOLS_BY_INTENT[intent], {"periods": periods},
+                                     confidence, {"periods": (first, last), "names": spans})
+
+            if intent == "research_area":
+                topic = extract_research_topic(text)
+                # "what is abhay's research area" / "machine learning by abhay" are about one person,
+                # which the department-wide search cannot answer
+                people = [w for w in topic.lower().split() if w in self._known_name_words()]
+                confidence = base_confidence if topic and not people else 0.0
+                return RouteDecision(intent, TOOLS_BY_INTENT[intent], {"search_research_area": topic},
+                                     confidence, {"topic": topic, **({"names": people} if people else {})})
+
+            time_reference = TIME_REFERENCE_PATTERN.search(text) if intent in TIME_DEPENDENT_INTENTS else None
+            spans = extract_name_spans(remove_time_references(text))
+            if time_reference:
+                # "who is free on monday", "abhay classes wednesday", "free at 2:30": the tools answer
+                # for now/today only, so the agent has to work from the timetable instead
+                return RouteDecision(intent, None, None, 0.0, {"names": spans, "time": time_reference.group(0)})
+
+            if name_source is None:
+                # Department-wide question; a leftover name means it is probably about one person
+                confidence = base_confidence if not spans else base_confidence * 0.5
+                return RouteDecision(intent, TOOLS_BY_INTENT[intent], {}, confidence, {})
+
+            if len(spans) != 1:
+                # No name, or several people in one question: leave it to the agent
+                return RouteDecision(intent, None, None, 0.0, {"names": spans})
+
+            if name_source == "teacher":
+                resolved, confident = self._resolve_teacher(spans[0])
+                tool = TOOLS_BY_INTENT[intent]
+                tool_input = {INPUT_KEY_BY_INTENT[intent]: resolved}
+            else:
+                tool, resolved, confident = self._resolve_faculty(spans[0])
+                tool_input = {"search_name" if tool is search_faculty_info_by_name else "input_name": resolved}
+            if not resolved or not confident:
+                return RouteDecision(intent, None, None, 0.0, {"names": spans})
+            return RouteDecision(intent, tool, tool_input, base_confidence, {"names": [resolved]})
+        return None
+
+    def route(self, text, decision=None):
+        """
+        Classifies the question (unless a classify() result is passed in) and records whether it
+        can bypass the agent. Returns the decision when it is confident enough to call the tool
+        directly, else None.
+        """
+        if decision is None:
+            decision = self.classify(text)
+        with self._lock:
+            self.stats["questions"] += 1
+            if decision is None:
+                self.stats["unmatched"] += 1
+            elif decision.tool is not None and decision.confidence >= self.threshold:
+                self.stats["direct"] += 1
+                self.intent_hits[decision.intent] += 1
+            else:
+                self.stats["fallback"] += 1
+                self.intent_fallbacks[decision.intent] += 1
+        if decision is None or decision.tool is None or decision.confidence < self.threshold:
+            logging.info(f"Router fallback to agent: {decision}")
+            return None
+        logging.info(f"Router direct call: {decision.intent} -> {decision.tool.name}({decision.tool_input}) "
+                     f"confidence {decision.confidence:.2f}")
+        return decision
+
+    def get_stats(self):
+        with self._lock:
+            questions = self.stats["questions"]
+            intents = sorted(set(self.intent_hits) | set(self.intent_fallbacks))
+            return {
+                "questions": questions,
+                "direct": self.stats["direct"],
+                "fallback": self.stats["fallback"],
+                "unmatched": self.stats["unmatched"],
+                "direct_rate": self.stats["direct"] / questions if questions else 0.0,
+                "per_intent": {
+                    intent: {
+                        "hits": self.intent_hits[intent],
+                        "fallbacks": self.intent_fallbacks[intent],
+                        "hit_rate": self.intent_hits[intent] / (self.intent_hits[intent] + self.intent_fallbacks[intent]),
+                    }
+                    for intent in intents
+                },
+            }
+
+
+# ===================== Process-wide Router =====================
+intent_router = IntentRouter()
@@ -1,14 +1,27 @@
 import streamlit as st
 from langchain_community.chat_message_histories import StreamlitChatMessageHistory
-from langchain_community.llms import Ollama
-from langchain.agents import initialize_agent, Tool, AgentType
 
 from langchain.callbacks.base import BaseCallbackHandler
 from langchain.schema import AgentAction, AgentFinish
-from timetable_db_fetch import *
-from faculty_detail_db import *
+import altair as alt
+import asyncio
+import logging
+import pandas as pd
+import threading
+from time import perf_counter
+from agent_factory import (build_tools, build_system_prompt, build_model, build_cascade_model, build_agent,
+                           warm_caches, reload_caches, warm_model, get_warmup_status, ToolSubsetAgents,
+                           USE_MODEL_CASCADE, USE_TOOL_SELECTION, USE_PLANNER)
+from async_tools import get_tool_executor
+from db_pool import get_pool_metrics
+from intent_router import intent_router
+from agent_tracing import AgentTraceHandler
+from response_cache import response_cache, build_cache_key, current_data_version
 
 class PrintCallbackHandler(BaseCallbackHandler):
+    # Streamlit calls must stay on the script thread, also under ainvoke
+    run_inline = True
+
     def on_agent_action(self, action: AgentAction, **kwargs):
         # Capture the agent's thought and the action it's taking
         #print(f"Thought: {action.log}")
@@ -19,44 +32,172 @@ class PrintCallbackHandler(BaseCallbackHandler):
         placeholder.status(a[0])
 
 
-# Function to render a text description of available tools (mock implementation for illustration)
-def render_text_description(tools):
-    tool_descriptions = [f"{tool.name}: {tool.description}" for tool in tools]
-    return "\n".join(tool_descriptions)
+class StreamingAnswerHandler(BaseCallbackHandler):
+    """
+    Per-message handler: pushes the final-answer tokens into the chat as Ollama generates them
+    and lists the intermediate tool steps in one live status container.
+    """
+    ANSWER_PREFIX = "Final Answer:"
+    # Streamlit calls must stay on the script thread, also under ainvoke
+    run_inline = True
+
+    def __init__(self, status, answer_placeholder, started_at):
+        self.status = status
+        self.answer_placeholder = answer_placeholder
+        self.started_at = started_at
+        self.first_token_at = None
+        self.steps = 0
+        self.buffer = ""
+        self.answer = None
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        # Each ReAct step is a new completion; only the one containing "Final Answer:" is shown
+        self.buffer = ""
+        self.answer = None
+
+    def on_llm_new_token(self, token, **kwargs):
+        if self.answer is None:
+            self.buffer += token
+            index = self.buffer.find(self.ANSWER_PREFIX)
+            if index == -1:
+                return
+            self.answer = self.buffer[index + len(self.ANSWER_PREFIX):].lstrip()
+        else:
+            self.answer += token
+        if self.answer:
+            if self.first_token_at is None:
+                self.first_token_at = perf_counter()
+            self.answer_placeholder.markdown(self.answer + "▌")
+
+    def on_agent_action(self, action: AgentAction, **kwargs):
+        self.steps += 1
+        if action.tool == "_Exception":
+            self.status.write("Reformatting the previous step...")
+            return
+        self.status.update(label=f"Running {action.tool}...")
+        self.status.write(f"**{action.tool}** ← `{action.tool_input}`")
+
+    def on_tool_end(self, output, **kwargs):
+        self.status.caption(str(output)[:300])
+
+
+def run_agent(question_agent, question, callbacks):
+    """
+    Runs the agent; in planner mode through ainvoke, so the tool calls of one step run concurrently.
+    """
+    config = {"callbacks": callbacks}
+    if USE_PLANNER:
+        return asyncio.run(question_agent.ainvoke(question, config=config))
+    return question_agent.invoke(question, config=config)
+
+
+def record_latency(question, route, started_at, first_token_at, trace_summary=None):
+    """
+    Stores time-to-first-token and total latency (ms) for one message in the session, and for
+    agent answers the model load time and whether it was a cold start.
+    """
+    finished_at = perf_counter()
+    entry = {
+        "question": question,
+        "route": route,
+        "ttft_ms": round(((first_token_at or finished_at) - started_at) * 1000),
+        "total_ms": round((finished_at - started_at) * 1000),
+    }
+    if trace_summary is not None:
+        entry["load_ms"] = trace_summary["load_ms"]
+        entry["cold"] = trace_summary["cold"]
+    st.session_state.setdefault("latency_log", []).append(entry)
+    logging.info(f"Latency: {entry}")
+    return entry
 
-# Define tools available (first faculty detail and second is timetable)
-tools = [get_faculty_by_research_area , search_faculty_info_by_name , find_best_match_tool ,
-         check_if_free_now,get_weekly_timetable,get_daily_timetable,get_free_teachers,get_busy_teachers,get_next_free_slot,get_faculty_availability,]
 
-# Configure the system prompts by rendering text descriptions for tools
-rendered_tools = render_text_description(tools)
-system_prompt = f"""
-You are a helpful assistant who provides detailed, with accurate information .
-Ensure that you choose the correct tool based on the user's query and respond in a friendly, professional manner.
-{rendered_tools}
-If the query is unclear, ask for clarification , if none is listed say no data found , insure names passed are accurate.
-Refuse potentially bad requests. Functions Auto fetch current time.
-"""
+def summarize_latency(log):
+    """
+    Average first-token and total latency of agent answers, split into cold-start and warm.
+    """
+    summary = {}
+    for label, cold in (("cold", True), ("warm", False)):
+        entries = [e for e in log if e.get("cold") is cold]
+        if entries:
+            summary[label] = {
+                "answers": len(entries),
+                "avg_ttft_ms": round(sum(e["ttft_ms"] for e in entries) / len(entries)),
+                "avg_total_ms": round(sum(e["total_ms"] for e in entries) / len(entries)),
+                "avg_load_ms": round(sum(e["load_ms"] for e in entries) / len(entries)),
+            }
+    return summary
 
 
-# Initialize the callback handler
-callback_handler = PrintCallbackHandler()
+def render_trace(trace):
+    """
+    Collapsible waterfall of the LLM and tool spans recorded for one message.
+    """
+    summary = trace["summary"]
+    spans = [dict(span, label=f"{i + 1}. {span['name']}") for i, span in enumerate(trace["spans"])
+             if span["end_ms"] is not None]
+    with st.expander(f"Trace: {summary['total_ms']:.0f} ms, {summary['llm_calls']} LLM / "
+                     f"{summary['tool_calls']} tool calls, {summary['parse_retries']} retries"):
+        if not spans:
+            st.caption("No spans recorded.")
+            return
+        frame = pd.DataFrame(spans)
+        chart = alt.Chart(frame).mark_bar().encode(
+            x=alt.X("start_ms", title="ms since message"),
+            x2="end_ms",
+            y=alt.Y("label", sort=None, title=None),
+            color="kind",
+            tooltip=[c for c in ["name", "duration_ms", "first_token_ms", "load_ms", "prompt_tokens",
+                                 "completion_tokens", "tool_input", "stage_ms"] if c in frame.columns],
+        )
+        st.altair_chart(chart)
+        st.json(summary)
 
-# Initialize the Qwen2.5:3b-instruct model with the system prompt
 
-model = Ollama(model="qwen2.5:3b-instruct", system=system_prompt)
+# Build the tools, prompt, model client and agent once per process; Streamlit reruns reuse them
+@st.cache_resource(show_spinner="Loading assistant...")
+def load_agent_runtime():
+    tools = build_tools()
+    system_prompt = build_system_prompt()
 
-# Initialize the agent with tools
+    # Initialize the callback handler
+    callback_handler = PrintCallbackHandler()
 
-agent = initialize_agent(
-    tools=tools,
-    llm=model,
-    agent_type=AgentType.ZERO_SHOT_REACT_DESCRIPTION,  # Dynamically choose the right tool based on user input
-    system_prompt=system_prompt,  # Pass the system prompt
-    verbose=True,  # Enable verbose mode to print more detailed logs
-    callbacks = [callback_handler] ,# Pass callbacks as a list
-    handle_parsing_errors=True
-)
+    # Small model first, escalating to the 3B model per step when its output is unusable
+    model = build_cascade_model(system_prompt, tools) if USE_MODEL_CASCADE else build_model(system_prompt)
+    # Per-message handlers are passed at invoke time (PrintCallbackHandler, or the streaming handler)
+    agent = build_agent(model, tools, system_prompt, [])
+    # Per-question agents that describe only the relevant tools (smaller prompt per ReAct step)
+    subset_agents = ToolSubsetAgents(model, tools) if USE_TOOL_SELECTION else None
+
+    # Warm the timetable and faculty caches before the first question
+    warm_caches()
+    # Load the model(s) and prefill the static prompt prefix in the background, so the UI is not blocked
+    threading.Thread(target=warm_model, args=(model, agent), daemon=True).start()
+    return {
+        "tools": tools,
+        "system_prompt": system_prompt,
+        "model": model,
+        "callback_handler": callback_handler,
+        "agent": agent,
+        "subset_agents": subset_agents,
+    }
+
+
+def agent_for_question(question):
+    """
+    Returns the agent to run for a question and a caption describing its prompt size.
+    """
+    subset_agents = runtime["subset_agents"]
+    if subset_agents is None:
+        return runtime["agent"], None
+    question_agent, selection, prompt_tokens = subset_agents.for_question(question)
+    full_tokens = subset_agents.full_prompt_tokens
+    return question_agent, (f"prompt {prompt_tokens}/{full_tokens} tokens "
+                            f"(-{1 - prompt_tokens / full_tokens:.0%}, {len(selection.tools)} tools)")
+
+
+runtime = load_agent_runtime()
+agent = runtime["agent"]
 # Function to save chat history
 
 # Set up message history
@@ -68,9 +209,16 @@ if len(msgs.messages) == 0:
 # Set the page title
 st.title("QueryWise")
 
-# Render the chat history
-for msg in msgs.messages:
-    st.chat_message(msg.type).write(msg.content)
+# Streaming shows the final answer token by token and the tool steps in a live status box
+stream_answers = st.sidebar.toggle("Stream answers", value=True)
+
+# Render the chat history (with the trace recorded for each answer)
+traces = st.session_state.setdefault("traces", {})
+for index, msg in enumerate(msgs.messages):
+    with st.chat_message(msg.type):
+        st.write(msg.content)
+        if index in traces:
+            render_trace(traces[index])
 
 # React to user input
 if input_text := st.chat_input("How can I assist you today?"):
@@ -80,20 +228,100 @@ if input_text := st.chat_input("How can I assist you today?"):
         st.chat_message("assistant").write("Chat history cleared.")
 
         st.toast("Data Cleared")
+    elif input_text.strip().lower() == "/reload":
+        # Rebuild the agent (tools / prompt changes) and reload every data cache
+        load_agent_runtime.clear()
+        reload_caches()
+        response_cache.clear()
+        runtime = load_agent_runtime()
+        agent = runtime["agent"]
+
+        st.chat_message("assistant").write("Assistant and data caches reloaded.")
+
+        st.toast("Reloaded")
     else:
 
 
         st.chat_message("user").write(input_text)
         msgs.add_user_message(input_text)
 
-        response = agent.invoke(input_text)
+        started_at = perf_counter()
+        tracer = AgentTraceHandler(input_text, started_at)
+        with st.chat_message("assistant"):
+            # Common, unambiguous questions call the matching tool directly; everything else goes to the agent
+            classified = intent_router.classify(input_text)
+            decision = intent_router.route(input_text, classified)
+            cached = None
+            prompt_note = None
+            if not decision:
+                # Repeated questions (same template, people and timetable period) reuse the earlier answer
+                cache_key, expires_at = build_cache_key(input_text, classified)
+                data_version = current_data_version()
+                cached = response_cache.get(cache_key, data_version=data_version)
+            if decision:
+                output = str(decision.tool.invoke(decision.tool_input, config={"callbacks": [tracer]}))
+                st.write(output)
+                latency = record_latency(input_text, f"direct:{decision.tool.name}", started_at, None)
+            elif cached is not None:
+                output = cached
+                st.write(output)
+                latency = record_latency(input_text, "cache", started_at, None)
+            elif stream_answers:
+                status = st.status("Thinking...", expanded=False)
+                answer_placeholder = st.empty()
+                handler = StreamingAnswerHandler(status, answer_placeholder, started_at)
+                question_agent, prompt_note = agent_for_question(input_text)
+                response = run_agent(question_agent, input_text, [handler, tracer])
+                output = str(response['output'])
+                # The streamed text is replaced by the parsed output (covers parsing-error and iteration-limit exits)
+                answer_placeholder.markdown(output)
+                status.update(label=f"Done ({handler.steps} steps)", state="complete")
+                latency = record_latency(input_text, "agent", started_at, handler.first_token_at, tracer.summary())
+            else:
+                question_agent, prompt_note = agent_for_question(input_text)
+                response = run_agent(question_agent, input_text, [runtime["callback_handler"], tracer])
+                output = str(response['output'])
+                st.write(output)
+                latency = record_latency(input_text, "agent", started_at, None, tracer.summary())
+            tracer.finish()
+            # Answers given while the timetable or faculty data never loaded (database down) are not kept
+            if (not decision and cached is None and not output.startswith("Agent stopped")
+                    and None not in data_version):
+                response_cache.put(cache_key, output, expires_at, data_version)
+            st.caption(f"First token {latency['ttft_ms']} ms · total {latency['total_ms']} ms"
+                       + (f" · {prompt_note}" if prompt_note else ""))
 
+            # Keep the spans for the waterfall under this answer and append them to the trace file
+            trace = {"summary": tracer.summary(), "spans": tracer.spans}
+            render_trace(trace)
+            tracer.write_jsonl()
 
-
-        # Display and save the response
-        st.chat_message("assistant").write(str(response['output']))
-        msgs.add_ai_message(response['output'])
+        # Save the response
+        traces[len(msgs.messages)] = trace
+        msgs.add_ai_message(output)
 
 
         st.toast("Finished processing user input")
 
+# Show shared connection pool and fast-path router statistics
+with st.sidebar.expander("Database pool"):
+    st.json(get_pool_metrics())
+with st.sidebar.expander("Fast-path router"):
+    st.json(intent_router.get_stats())
+if hasattr(runtime["model"], "get_stats"):
+    with st.sidebar.expander("Model cascade"):
+        st.json(runtime["model"].get_stats())
+if runtime["subset_agents"] is not None:
+    with st.sidebar.expander("Tool selection"):
+        st.json(runtime["subset_agents"].get_stats())
+with st.sidebar.expander("Response cache"):
+    st.json(response_cache.get_stats())
+if USE_PLANNER:
+    with st.sidebar.expander("Tool executor"):
+        st.json(get_tool_executor().get_stats())
+with st.sidebar.expander("Model warm-up"):
+    st.json(get_warmup_status())
+with st.sidebar.expander("Response latency"):
+    latency_log = st.session_state.get("latency_log", [])
+    st.json({"agent": summarize_latency(latency_log), "recent": latency_log[-10:]})
+
@@ -0,0 +1,201 @@
+from collections import Counter, deque
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import Generation, LLMResult
+from pydantic import PrivateAttr
+from time import perf_counter
+from typing import Any, List, Optional
+import logging
+import re
+import threading
+from timetable_db_fetch import teacher_catalogue
+from faculty_directory import get_faculty_directory
+from planner_agent import parse_step
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# A tier's output is accepted at or above this confidence; below it the next (larger) model is asked
+CASCADE_CONFIDENCE_THRESHOLD = 0.7
+# Minimum fuzzy score for a person named in the Action Input to count as resolved
+CASCADE_NAME_THRESHOLD = 70
+
+# Tools whose single input is a person's name, and where that name is looked up
+TEACHER_INPUT_TOOLS = {"check_if_free_now", "get_weekly_timetable", "get_daily_timetable", "get_next_free_slot",
+                       "get_faculty_availability"}
+FACULTY_INPUT_TOOLS = {"search_faculty_info_by_name", "find_best_match_tool"}
+HEDGE_PATTERN = re.compile(r"\b(i('m| am) not sure|i don'?t know|i cannot|i can'?t|as an ai|unable to)\b", re.I)
+OBSERVATION_MARKER = "\nObservation:"
+
+
+def name_resolution_score(tool_name, tool_input):
+    """
+    Fuzzy score (0-100) of the person named in a tool input, or None if the tool takes no name.
+    """
+    name = str(tool_input).strip().strip('"\'')
+    if tool_name in TEACHER_INPUT_TOOLS:
+        return teacher_catalogue.match(name)[1]
+    if tool_name in FACULTY_INPUT_TOOLS:
+        directory = get_faculty_directory()
+        return max(directory.match_faculty_info(name)[1], directory.match_faculty(name)[1])
+    return None
+
+
+def score_action(action, tool_names):
+    if action.tool not in tool_names:
+        return 0.0, f"unknown tool {action.tool!r}"
+    if not str(action.tool_input).strip():
+        return 0.2, "empty tool input"
+    score = name_resolution_score(action.tool, action.tool_input)
+    if score is not None and score < CASCADE_NAME_THRESHOLD:
+        return 0.5, f"unresolved name {action.tool_input!r} ({score})"
+    return 1.0, f"tool {action.tool}"
+
+
+def score_step(text, prompt, tool_names):
+    """
+    Returns (confidence 0-1, reason) for one ReAct completion: does it parse, name real tools,
+    pass resolvable names, and avoid answering from memory before any tool was used. A planner
+    step with several tool calls scores as its weakest call.
+    """
+    try:
+        step = parse_step(text)
+    except OutputParserException:
+        return 0.0, "unparseable"
+
+    if hasattr(step, "return_values"):
+        answer = step.return_values.get("output", "")
+        if not answer.strip():
+            return 0.0, "empty final answer"
+        if HEDGE_PATTERN.search(answer):
+            return 0.4, "hedged final answer"
+        if OBSERVATION_MARKER not in prompt:
+            return 0.5, "final answer without a tool call"
+        return 1.0, "final answer"
+
+    return min((score_action(action, tool_names) for action in step), key=lambda scored: scored[0])
+
+
+class CascadeLLM(LLM):
+    """
+    Asks a list of models in order (small to large) for each ReAct step and returns the first
+    completion that scores at or above the threshold; the last tier's answer is always used.
+    Only the answering tier streams tokens to the callbacks, and its Ollama timings (token counts,
+    load_duration) are returned as the generation info. Per-tier calls, escalations and latencies
+    are logged and kept for get_stats().
+    """
+
+    tiers: List[Any]
+    tool_names: List[str]
+    threshold: float = CASCADE_CONFIDENCE_THRESHOLD
+
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _calls: Counter = PrivateAttr(default_factory=Counter)
+    _accepted: Counter = PrivateAttr(default_factory=Counter)
+    _escalated: Counter = PrivateAttr(default_factory=Counter)
+    _errors: Counter = PrivateAttr(default_factory=Counter)
+    _latency_ms: Counter = PrivateAttr(default_factory=Counter)
+    _decisions: Any = PrivateAttr(default_factory=lambda: deque(maxlen=50))
+
+    @property
+    def _llm_type(self) -> str:
+        return "ollama-cascade"
+
+    def _record(self, model, elapsed_ms, outcome, confidence, reason):
+        with self._lock:
+            self._calls[model] += 1
+            self._latency_ms[model] += elapsed_ms
+            {"accepted": self._accepted, "escalated": self._escalated, "error": self._errors}[outcome][model] += 1
+            self._decisions.append({"model": model, "outcome": outcome, "confidence": confidence,
+                                    "reason": reason, "ms": round(elapsed_ms, 1)})
+        logging.info(f"Cascade {model}: {outcome} ({reason}, confidence {confidence:.2f}) in {elapsed_ms:.0f} ms")
+
+    def _cascade(self, prompt, stop, run_manager, **kwargs):
+        """
+        Returns (text, generation_info) of the first accepted tier.
+        """
+        for position, tier in enumerate(self.tiers):
+            last = position == len(self.tiers) - 1
+            started = perf_counter()
+            try:
+                # Same streaming call Ollama._generate makes; only the last tier forwards tokens to this run
+                chunk = tier._stream_with_aggregation(prompt, stop=stop, run_manager=run_manager if last else None,
+                                                      **kwargs)
+                text = chunk.text
+            except Exception as err:
+                elapsed_ms = (perf_counter() - started) * 1000
+                self._record(tier.model, elapsed_ms, "error", 0.0, str(err)[:120])
+                if last:
+                    raise
+                continue
+
+            elapsed_ms = (perf_counter() - started) * 1000
+            confidence, reason = score_step(text, prompt, self.tool_names)
+            if last or confidence >= self.threshold:
+                self._record(tier.model, elapsed_ms, "accepted", confidence, reason)
+                if not last and run_manager:
+                    run_manager.on_llm_new_token(text)
+                return text, dict(chunk.generation_info or {}, model=tier.model)
+            self._record(tier.model, elapsed_ms, "escalated", confidence, reason)
+        return "", {}
+
+    async def _acascade(self, prompt, stop, run_manager, **kwargs):
+        """
+        Async twin of _cascade (aiohttp streaming, tokens forwarded on the caller's event loop).
+        """
+        for position, tier in enumerate(self.tiers):
+            last = position == len(self.tiers) - 1
+            started = perf_counter()
+            try:
+                chunk = await tier._astream_with_aggregation(prompt, stop=stop,
+                                                             run_manager=run_manager if last else None, **kwargs)
+                text = chunk.text
+            except Exception as err:
+                elapsed_ms = (perf_counter() - started) * 1000
+                self._record(tier.model, elapsed_ms, "error", 0.0, str(err)[:120])
+                if last:
+                    raise
+                continue
+
+            elapsed_ms = (perf_counter() - started) * 1000
+            confidence, reason = score_step(text, prompt, self.tool_names)
+            if last or confidence >= self.threshold:
+                self._record(tier.model, elapsed_ms, "accepted", confidence, reason)
+                if not last and run_manager:
+                    await run_manager.on_llm_new_token(text)
+                return text, dict(chunk.generation_info or {}, model=tier.model)
+            self._record(tier.model, elapsed_ms, "escalated", confidence, reason)
+        return "", {}
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        return self._cascade(prompt, stop, run_manager, **kwargs)[0]
+
+    def _generate(self, prompts: List[str], stop: Optional[List[str]] = None, run_manager=None,
+                  **kwargs: Any) -> LLMResult:
+        generations = []
+        for prompt in prompts:
+            text, info = self._cascade(prompt, stop, run_manager, **kwargs)
+            generations.append([Generation(text=text, generation_info=info)])
+        return LLMResult(generations=generations)
+
+    async def _agenerate(self, prompts: List[str], stop: Optional[List[str]] = None, run_manager=None,
+                         **kwargs: Any) -> LLMResult:
+        generations = []
+        for prompt in prompts:
+            text, info = await self._acascade(prompt, stop, run_manager, **kwargs)
+            generations.append([Generation(text=text, generation_info=info)])
+        return LLMResult(generations=generations)
+
+    def get_stats(self):
+        with self._lock:
+            tiers = {}
+            for tier in self.tiers:
+                calls = self._calls[tier.model]
+                tiers[tier.model] = {
+                    "calls": calls,
+                    "accepted": self._accepted[tier.model],
+                    "escalated": self._escalated[tier.model],
+                    "errors": self._errors[tier.model],
+                    "avg_ms": round(self._latency_ms[tier.model] / calls, 1) if calls else 0.0,
+                }
+            return {"threshold": self.threshold, "tiers": tiers, "recent": list(self._decisions)[-10:]}
@@ -0,0 +1,83 @@
+from rapidfuzz import fuzz, process, utils
+import logging
+import re
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Honorifics ignored when comparing names ("Dr sandeep" should find "Sandeep Singh, Dr.")
+TITLE_PATTERN = re.compile(r'\b(dr|mr|mrs|ms|prof)\b')
+
+
+def normalize_person_name(name):
+    """
+    Lowercases, strips punctuation and removes titles like Dr./Mr./Prof.
+    """
+    return " ".join(TITLE_PATTERN.sub(" ", utils.default_process(name)).split())
+
+
+class NameCatalogue:
+    """
+    Cached list of names with precomputed normalised forms, scored with rapidfuzz.
+    The cache is rebuilt only when version_fn() returns a different value than
+    the one seen at the last build.
+    """
+
+    def __init__(self, names_fn, version_fn, normalizer=normalize_person_name, scorer=fuzz.WRatio):
+        self._names_fn = names_fn
+        self._version_fn = version_fn
+        self.normalizer = normalizer
+        self.scorer = scorer
+        self._lock = threading.Lock()
+        self.version = object()  # Never equal to a real version, forces the first build
+        self.names = []
+        self.choices = []
+
+    def ensure_fresh(self):
+        version = self._version_fn()
+        if version == self.version:
+            return
+        with self._lock:
+            if version == self.version:
+                return
+            names = sorted(set(n for n in self._names_fn() if n))
+            self.names = names
+            self.choices = [self.normalizer(n) for n in names]
+            self.version = version
+            logging.info(f"Rebuilt name catalogue with {len(names)} names.")
+
+    def match(self, query, score_cutoff=0):
+        """
+        Returns (best_name, score) for a single query, or (None, 0).
+        """
+        self.ensure_fresh()
+        if not self.choices:
+            return None, 0
+        result = process.extractOne(self.normalizer(query), self.choices, scorer=self.scorer,
+                                    processor=None, score_cutoff=score_cutoff)
+        if not result:
+            return None, 0
+        _, score, index = result
+        return self.names[index], round(score)
+
+    def top(self, query, limit=5, score_cutoff=0):
+        """
+        Returns up to `limit` (name, score) candidates for a query.
+        """
+        self.ensure_fresh()
+        results = process.extract(self.normalizer(query), self.choices, scorer=self.scorer,
+                                  processor=None, limit=limit, score_cutoff=score_cutoff)
+        return [(self.names[index], round(score)) for _, score, index in results]
+
+    def match_many(self, queries):
+        """
+        Scores a batch of queries in one cdist call; returns [(best_name, score), ...].
+        """
+        self.ensure_fresh()
+        if not self.choices or not queries:
+            return [(None, 0) for _ in queries]
+        scores = process.cdist([self.normalizer(q) for q in queries], self.choices,
+                               scorer=self.scorer, processor=None, workers=-1)
+        best = scores.argmax(axis=1)
+        return [(self.names[j], round(float(scores[i, j]))) for i, j in enumerate(best)]
@@ -0,0 +1,82 @@
+import numpy as np
+from collections import Counter
+
+# Canonical day order used for the day axis
+DAYS = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+
+
+class OccupancyMatrix:
+    """
+    Boolean teachers x days x periods occupancy matrix.
+    occupied[t, d, p] is True when teacher t has a class overlapping period p on day d,
+    so department-wide period-range questions become vectorised mask operations.
+    Point-in-time free/busy checks stay on the exact intervals of TimetableIndex: a class that
+    only covers part of a period marks the whole period here.
+    """
+
+    def __init__(self, teachers, period_numbers, period_starts, period_ends, occupied):
+        self.teachers = np.array(teachers, dtype=object)
+        self.period_numbers = np.array(period_numbers, dtype=np.int16)
+        self.period_starts = np.array(period_starts, dtype=np.int16)
+        self.period_ends = np.array(period_ends, dtype=np.int16)
+        self.occupied = occupied
+
+    @classmethod
+    def from_slots(cls, slots, teacher_names=()):
+        """
+        Builds the matrix from TimetableSlot records (see timetable_index.py).
+        Period boundaries are the most common time slot seen for each period_number.
+        """
+        slots = [s for s in slots if s.day in DAY_INDEX]
+        teachers = sorted(set(teacher_names) | {s.teacher_name for s in slots})
+        teacher_index = {name: i for i, name in enumerate(teachers)}
+
+        bounds_by_period = {}
+        for s in slots:
+            if s.period_number is not None:
+                bounds_by_period.setdefault(s.period_number, Counter())[(s.start, s.end)] += 1
+        period_numbers = sorted(bounds_by_period)
+        period_bounds = [bounds_by_period[p].most_common(1)[0][0] for p in period_numbers]
+        period_starts = [b[0] for b in period_bounds]
+        period_ends = [b[1] for b in period_bounds]
+
+        occupied = np.zeros((len(teachers), len(DAYS), len(period_numbers)), dtype=bool)
+        if slots and period_numbers:
+            teacher_idx = np.fromiter((teacher_index[s.teacher_name] for s in slots), dtype=np.intp, count=len(slots))
+            day_idx = np.fromiter((DAY_INDEX[s.day] for s in slots), dtype=np.intp, count=len(slots))
+            slot_starts = np.fromiter((s.start for s in slots), dtype=np.int16, count=len(slots))
+            slot_ends = np.fromiter((s.end for s in slots), dtype=np.int16, count=len(slots))
+            # A class occupies every period its time range overlaps (handles off-grid slots)
+            overlap = ((np.array(period_starts)[None, :] < slot_ends[:, None]) &
+                       (np.array(period_ends)[None, :] > slot_starts[:, None]))
+            np.logical_or.at(occupied, (teacher_idx, day_idx), overlap)
+
+        return cls(teachers, period_numbers, period_starts, period_ends, occupied)
+
+    # -------------------- Masks --------------------
+
+    def _day(self, day):
+        return DAY_INDEX.get(day)
+
+    def busy_mask_during(self, day, first_period, last_period):
+        """
+        Teachers with a class in any period from first_period to last_period (inclusive).
+        """
+        d = self._day(day)
+        if d is None:
+            return np.zeros(len(self.teachers), dtype=bool)
+        selected = (self.period_numbers >= first_period) & (self.period_numbers <= last_period)
+        return self.occupied[:, d, selected].any(axis=1)
+
+    # -------------------- Name lookups --------------------
+
+    def free_during_periods(self, day, first_period, last_period):
+        return set(self.teachers[~self.busy_mask_during(day, first_period, last_period)])
+
+    def period_time_range(self, period_number):
+        matches = np.nonzero(self.period_numbers == period_number)[0]
+        if not len(matches):
+            return None
+        i = matches[0]
+        return int(self.period_starts[i]), int(self.period_ends[i])
@@ -0,0 +1,82 @@
+from langchain.agents.mrkl.output_parser import MRKLOutputParser, FINAL_ANSWER_ACTION
+from langchain.schema import AgentAction
+import logging
+import re
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# ReAct format instructions with one extra rule: independent tool calls may share a step
+PLANNER_FORMAT_INSTRUCTIONS = """Use the following format:
+
+Question: the input question you must answer
+Thought: you should always think about what to do
+Action: the action to take, should be one of the tools listed below
+Action Input: the input to the action
+Observation: the result of the action
+... (this Thought/Action/Action Input/Observation can repeat N times)
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question
+
+When several tool calls do not depend on each other (for example the same check for two different people), \
+write all of their Action/Action Input pairs one after another in the same step, before any Observation. \
+They run at the same time and all of their Observations are shown before your next Thought."""
+
+# One Action/Action Input pair; the input runs until the next Action line (or the end of the step)
+ACTION_PAIR_PATTERN = re.compile(
+    r"Action\s*\d*\s*:[ \t]*(?P<tool>[^\n]*?)[ \t]*\n\s*Action\s*\d*\s*Input\s*\d*\s*:[ \t]*(?P<input>.*?)"
+    r"(?=\n\s*Action\s*\d*\s*:|\n\s*Observation\s*:|\Z)",
+    re.DOTALL,
+)
+
+
+def clean_tool_input(action_input):
+    # Same clean-up as MRKLOutputParser
+    tool_input = action_input.strip()
+    return tool_input if tool_input.startswith("SELECT ") else tool_input.strip('"')
+
+
+class MultiActionOutputParser(MRKLOutputParser):
+    """
+    MRKL parser that also accepts several Action/Action Input pairs in one completion and returns
+    them as a list of AgentActions (run concurrently by AgentExecutor.ainvoke). Anything with a
+    single action, or a final answer, parses exactly as before.
+    """
+
+    def parse(self, text):
+        if FINAL_ANSWER_ACTION not in text:
+            pairs = list(ACTION_PAIR_PATTERN.finditer(text))
+            if len(pairs) > 1:
+                return self.parse_actions(text, pairs)
+        return super().parse(text)
+
+    @staticmethod
+    def parse_actions(text, pairs):
+        actions, seen = [], set()
+        for position, pair in enumerate(pairs):
+            tool, tool_input = pair.group("tool").strip(), clean_tool_input(pair.group("input"))
+            if (tool, tool_input) in seen:
+                continue
+            seen.add((tool, tool_input))
+            # The first action carries the thought; each observation follows its own action in the scratchpad
+            log = text[:pair.end()] if position == 0 else pair.group(0).strip()
+            actions.append(AgentAction(tool, tool_input, log))
+        logging.info(f"Planner step with {len(actions)} tool calls: {[a.tool for a in actions]}")
+        return actions
+
+    @property
+    def _type(self) -> str:
+        return "mrkl-multi-action"
+
+
+def planner_agent_kwargs():
+    # Passed to initialize_agent(agent_kwargs=...) for the ZERO_SHOT_REACT agent (via agent_factory.agent_prompt_kwargs)
+    return {"output_parser": MultiActionOutputParser(), "format_instructions": PLANNER_FORMAT_INSTRUCTIONS}
+
+
+def parse_step(text):
+    """
+    Parses one completion into a list of AgentActions or an AgentFinish (raises OutputParserException).
+    """
+    step = MultiActionOutputParser().parse(text)
+    return step if isinstance(step, list) or hasattr(step, "return_values") else [step]
@@ -0,0 +1,166 @@
+from collections import defaultdict
+import math
+import re
+import threading
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Weight of a term added by synonym expansion relative to the term the user typed
+EXPANSION_WEIGHT = 0.5
+
+# Multi-word phrases folded into one canonical token, in documents and queries alike
+PHRASE_SYNONYMS = {
+    "internet of things": "iot",
+    "artificial intelligence": "ai",
+    "machine learning": "ml",
+    "deep learning": "dl",
+    "natural language processing": "nlp",
+    "computer vision": "cv",
+    "cyber security": "security",
+    "cybersecurity": "security",
+    "wireless sensor networks": "wsn",
+    "wireless sensor network": "wsn",
+}
+
+# Related canonical tokens searched alongside the query term (at EXPANSION_WEIGHT)
+RELATED_TERMS = {
+    "ai": ["ml", "dl"],
+    "ml": ["ai", "dl"],
+    "dl": ["ml", "ai"],
+    "iot": ["wsn", "embedded"],
+    "wsn": ["iot"],
+    "cv": ["image"],
+    "image": ["cv"],
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "into", "is", "of", "on", "or",
+    "the", "to", "with", "using", "based", "area", "areas", "research", "field",
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+PHRASE_PATTERN = re.compile(r'\b(' + '|'.join(sorted(map(re.escape, PHRASE_SYNONYMS), key=len, reverse=True)) + r')\b')
+
+
+def stem(token):
+    """
+    Very light stemming so 'networks'/'network' and 'systems'/'system' share a term.
+    """
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """
+    Lowercases, folds known phrases into canonical tokens, drops stopwords and stems.
+    """
+    text = PHRASE_PATTERN.sub(lambda m: f" {PHRASE_SYNONYMS[m.group(1)]} ", (text or "").lower())
+    return [stem(t) for t in TOKEN_PATTERN.findall(text) if t not in STOPWORDS]
+
+
+def expand_query(query):
+    """
+    Returns {term: weight} for a query, including related synonym terms.
+    """
+    weights = {}
+    for term in tokenize(query):
+        weights[term] = 1.0
+    for term in list(weights):
+        for related in RELATED_TERMS.get(term, []):
+            weights.setdefault(related, EXPANSION_WEIGHT)
+    return weights
+
+
+class ResearchIndex:
+    """
+    Tokenised inverted index with BM25 ranking over research/expertise text.
+    Documents are keyed by (source_table, id) and can be added, replaced or
+    removed one at a time, so refreshes only touch rows that changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings = defaultdict(dict)  # term -> {doc_id: term frequency}
+        self.doc_lengths = {}
+        self.doc_texts = {}
+        self.doc_meta = {}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add_document(self, doc_id, text, meta=None):
+        """
+        Adds or replaces a document. Unchanged text is a no-op.
+        """
+        with self._lock:
+            if self.doc_texts.get(doc_id) == text:
+                self.doc_meta[doc_id] = meta
+                return
+            self._remove(doc_id)
+            tokens = tokenize(text)
+            if not tokens:
+                return
+            for term in tokens:
+                self.postings[term][doc_id] = self.postings[term].get(doc_id, 0) + 1
+            self.doc_lengths[doc_id] = len(tokens)
+            self.doc_texts[doc_id] = text
+            self.doc_meta[doc_id] = meta
+            self.total_length += len(tokens)
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        if doc_id not in self.doc_lengths:
+            return
+        for term in set(tokenize(self.doc_texts[doc_id])):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        del self.doc_texts[doc_id]
+        self.doc_meta.pop(doc_id, None)
+
+    def sync_source(self, source, documents):
+        """
+        Brings one source table in line with {id: (text, meta)}: new and edited rows
+        are re-indexed, rows that disappeared are removed, the rest are left alone.
+        """
+        current = {doc_id for doc_id in self.doc_lengths if doc_id[0] == source}
+        for row_id, (text, meta) in documents.items():
+            self.add_document((source, row_id), text, meta)
+        for doc_id in current - {(source, row_id) for row_id in documents}:
+            self.remove_document(doc_id)
+
+    def search(self, query, limit=10, source=None):
+        """
+        Returns [(doc_id, score, meta), ...] ranked by BM25 (at most `limit`, all if None).
+        Only the postings of the query terms are visited.
+        """
+        with self._lock:
+            n_docs = len(self.doc_lengths)
+            if not n_docs:
+                return []
+            avg_length = self.total_length / n_docs
+            scores = defaultdict(float)
+            for term, weight in expand_query(query).items():
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    if source is not None and doc_id[0] != source:
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] += weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [(doc_id, score, self.doc_meta.get(doc_id)) for doc_id, score in ranked]
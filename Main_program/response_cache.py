@@ -0,0 +1,147 @@
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+from rapidfuzz import utils
+import logging
+import re
+import threading
+from timetable_index import get_timetable_index, to_minutes
+from faculty_directory import get_faculty_directory
+from intent_router import extract_name_spans
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+RESPONSE_CACHE_SIZE = 256
+# Answers that do not depend on the clock are kept this long (or until the tables change)
+RESPONSE_CACHE_TTL = 3600
+
+# Intents whose answers change with the current period
+TIME_SENSITIVE_INTENTS = {"free_now", "free_teachers", "busy_teachers", "next_free_slot", "availability",
+                          "daily_timetable", "free_during_periods"}
+TIME_WORDS_PATTERN = re.compile(r'\b(now|today|todays|currently|right now|at the moment|free|busy|available|'
+                                r'next|tomorrow|tonight)\b')
+# Words that do not change the meaning of a question ("can you please tell me ...")
+FILLER_WORDS = {"a", "an", "the", "please", "pls", "can", "could", "would", "you", "u", "tell", "me", "show",
+                "give", "i", "want", "to", "know", "and", "or", "what", "whats", "is", "are", "of", "for", "about", "do", "does",
+                "dr", "mr", "mrs", "ms", "prof", "sir", "maam", "mam", "s"}
+
+CacheKey = namedtuple('CacheKey', ['question', 'entities', 'bucket'])
+CacheEntry = namedtuple('CacheEntry', ['response', 'expires_at', 'data_version'])
+
+
+def normalize_question(question, name_spans=()):
+    """
+    Lowercases, strips punctuation and filler words and replaces person names with <name>, so
+    "What is Dr. Geeta's email?" and "geeta email please" share a template. Word order is kept:
+    "is <name> free before <name>" and "is <name> free after <name>" are different questions.
+    """
+    text = utils.default_process(question)
+    for span in sorted(name_spans, key=len, reverse=True):
+        text = re.sub(r'\b' + re.escape(span) + r'\b', ' <name> ', text)
+    return " ".join(w for w in text.split() if w not in FILLER_WORDS)
+
+
+def period_bucket(now):
+    """
+    Returns (label, expires_at) for the stretch of the day containing `now` in which nobody's
+    free/busy state changes; the label changes and the entry expires at the next class start or
+    end, off-grid classes included (midnight after the last class).
+    """
+    minute = to_minutes(now)
+    boundaries = get_timetable_index().change_minutes(now.strftime('%a').upper())
+    previous = max((b for b in boundaries if b <= minute), default=0)
+    upcoming = min((b for b in boundaries if b > minute), default=None)
+    if upcoming is None:
+        expires_at = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    else:
+        expires_at = datetime.combine(now.date(), datetime.min.time()) + timedelta(minutes=upcoming)
+    return f"{now.strftime('%a').upper()}@{previous}", expires_at
+
+
+def current_data_version():
+    return get_timetable_index().version, get_faculty_directory().version
+
+
+def build_cache_key(question, decision, now=None):
+    """
+    Returns (CacheKey, expires_at) from the question and its intent_router.classify() result
+    (the same decision route() used, so the question is classified once). Time-sensitive
+    questions are bucketed by the current period.
+    """
+    now = now or datetime.now()
+    entities, spans = (), ()
+    intent = None
+    if decision is not None:
+        intent = decision.intent
+        # Values stay in question order, so swapping which person is which gives a different key
+        entities = tuple((key, str(v)) for key, values in sorted(decision.entities.items())
+                         for v in (values if isinstance(values, (list, tuple)) else [values]))
+        if "names" in decision.entities:
+            # Only questions about people have their name spans templated out
+            spans = extract_name_spans(question)
+
+    normalized = normalize_question(question, spans)
+    if intent in TIME_SENSITIVE_INTENTS or TIME_WORDS_PATTERN.search(normalized):
+        bucket, expires_at = period_bucket(now)
+    else:
+        bucket, expires_at = None, now + timedelta(seconds=RESPONSE_CACHE_TTL)
+    return CacheKey(normalized, entities, bucket), expires_at
+
+
+class ResponseCache:
+    """
+    LRU cache of agent answers. Entries expire at their period boundary / TTL and are
+    dropped when the timetable or faculty tables change (any INSERT, UPDATE or DELETE on the
+    timetable bumps its version, see timetable_index.fetch_timetable_version).
+    """
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "invalidated": 0, "evictions": 0}
+
+    def get(self, key, now=None, data_version=None):
+        now = now or datetime.now()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            if entry.expires_at <= now:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            if data_version is not None and entry.data_version != data_version:
+                del self._entries[key]
+                self.stats["invalidated"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry.response
+
+    def put(self, key, response, expires_at, data_version=None):
+        with self._lock:
+            self._entries[key] = CacheEntry(response, expires_at, data_version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# ===================== Process-wide Cache =====================
+response_cache = ResponseCache()
@@ -0,0 +1,260 @@
+import mysql.connector
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# phpMyAdmin dump the embedded database is bootstrapped from
+SQL_DUMP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DB Files", "ManipalUniversityJaipur.sql")
+
+# ":memory:" keeps one shared in-process database; any other value is a database file,
+# built from the dump the first time (and again whenever the dump is newer than the file)
+DEFAULT_DATABASE = ":memory:"
+SHARED_MEMORY_URI = "file:ManipalUniversityJaipur?mode=memory&cache=shared"
+
+CREATE_TABLE_PATTERN = re.compile(r"CREATE TABLE `(\w+)` \((.*?)\n\)[^;]*;", re.S)
+COLUMN_PATTERN = re.compile(r"^\s*`(\w+)`\s+(\w+)", re.M)
+PRIMARY_KEY_PATTERN = re.compile(r"ALTER TABLE `(\w+)`\s+ADD PRIMARY KEY \(`(\w+)`\)")
+INSERT_PATTERN = re.compile(r"INSERT INTO `\w+` .*?\);\n", re.S)
+STRING_LITERAL_PATTERN = re.compile(r"'((?:[^'\\]|\\.|'')*)'", re.S)
+MYSQL_ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+
+INTEGER_TYPES = {"int", "tinyint", "smallint", "mediumint", "bigint"}
+
+
+# Helper function to build the SQLite versions of the timetable generated columns
+# (same values as DB Files/migrations/001_timetable_time_columns.sql)
+def _minutes_expr(part):
+    return (f"CAST(substr({part}, 1, instr({part}, ':') - 1) AS INTEGER) * 60"
+            f" + CAST(substr({part}, instr({part}, ':') + 1) AS INTEGER)")
+
+
+_SLOT_START = "trim(substr(trim(time_slot), 1, instr(trim(time_slot), '-') - 1))"
+_SLOT_END = "trim(substr(trim(time_slot), instr(trim(time_slot), '-') + 1))"
+_SLOT_GUARD = "trim(time_slot) GLOB '[0-9]*:[0-9][0-9]*-*[0-9]*:[0-9][0-9]*'"
+_DAY_CODES = " ".join(f"WHEN '{day}' THEN {code}"
+                      for code, day in enumerate(["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"], start=1))
+
+TIMETABLE_GENERATED_COLUMNS = [
+    f"start_min INTEGER GENERATED ALWAYS AS (CASE WHEN {_SLOT_GUARD} THEN {_minutes_expr(_SLOT_START)} END) STORED",
+    f"end_min INTEGER GENERATED ALWAYS AS (CASE WHEN {_SLOT_GUARD} THEN {_minutes_expr(_SLOT_END)} END) STORED",
+    f"day_code INTEGER GENERATED ALWAYS AS (CASE upper(substr(trim(day), 1, 3)) {_DAY_CODES} ELSE 0 END) STORED",
+]
+TIMETABLE_INDEXES = [
+    "CREATE INDEX idx_timetable_teacher_day_start ON timetable (teacher_name, day, start_min)",
+    "CREATE INDEX idx_timetable_day_start_end ON timetable (day, start_min, end_min, teacher_name)",
+]
+# Change counter of DB Files/migrations/002_timetable_version.sql
+TIMETABLE_VERSION_STATEMENTS = [
+    "CREATE TABLE timetable_version (id INTEGER PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)",
+    "INSERT INTO timetable_version (id, version) VALUES (1, 0)",
+] + [
+    f"CREATE TRIGGER timetable_version_{event.lower()} AFTER {event} ON timetable "
+    f"BEGIN UPDATE timetable_version SET version = version + 1 WHERE id = 1; END"
+    for event in ("INSERT", "UPDATE", "DELETE")
+]
+
+
+def _convert_literal(match):
+    """
+    Rewrites one MySQL string literal (backslash escapes) as a SQLite one (doubled quotes).
+    """
+    value = re.sub(r"\\(.)", lambda m: MYSQL_ESCAPES.get(m.group(1), m.group(1)), match.group(1), flags=re.S)
+    value = value.replace("''", "'")
+    return "'" + value.replace("'", "''") + "'"
+
+
+def load_dump(conn, dump_path=SQL_DUMP_PATH):
+    """
+    Creates the tables of the phpMyAdmin dump in a SQLite connection and loads its rows.
+    MySQL-only clauses (ENGINE, COLLATE, AUTO_INCREMENT, SET ...) are dropped; the timetable
+    gets the start_min / end_min / day_code columns and indexes of migration 001 and the change
+    counter of migration 002.
+    """
+    with open(dump_path, encoding="utf-8") as f:
+        text = f.read()
+
+    primary_keys = dict(PRIMARY_KEY_PATTERN.findall(text))
+    for table, body in CREATE_TABLE_PATTERN.findall(text):
+        columns = []
+        for name, column_type in COLUMN_PATTERN.findall(body):
+            if primary_keys.get(table) == name:
+                columns.append(f"{name} INTEGER PRIMARY KEY")
+            else:
+                columns.append(f"{name} {'INTEGER' if column_type.lower() in INTEGER_TYPES else 'TEXT'}")
+        if table == "timetable":
+            columns.extend(TIMETABLE_GENERATED_COLUMNS)
+        conn.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+
+    for statement in INSERT_PATTERN.findall(text):
+        conn.execute(STRING_LITERAL_PATTERN.sub(_convert_literal, statement).rstrip().rstrip(";"))
+
+    for statement in TIMETABLE_INDEXES + TIMETABLE_VERSION_STATEMENTS:
+        conn.execute(statement)
+    conn.commit()
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table, _ in CREATE_TABLE_PATTERN.findall(text)}
+    logging.info(f"Loaded SQL dump into SQLite: {counts}")
+
+
+def _translate_error(err):
+    """
+    Re-raises sqlite3 errors as the matching mysql.connector error class, so the tools'
+    existing `except mysql.connector.Error` handlers cover both backends.
+    """
+    if isinstance(err, sqlite3.IntegrityError):
+        error_class = mysql.connector.errors.IntegrityError
+    elif isinstance(err, sqlite3.OperationalError):
+        error_class = mysql.connector.errors.OperationalError
+    elif isinstance(err, sqlite3.ProgrammingError):
+        error_class = mysql.connector.errors.ProgrammingError
+    else:
+        error_class = mysql.connector.errors.DatabaseError
+    return error_class(msg=f"SQLite: {err}")
+
+
+def _to_qmark(operation):
+    # mysql.connector uses %s placeholders; SQLite uses ?
+    return operation.replace("%s", "?")
+
+
+class SQLiteCursor:
+    """
+    DB-API cursor with the parts of the mysql.connector interface the tools use:
+    %s placeholders and cursor(dictionary=True) rows.
+    """
+
+    def __init__(self, raw_cursor, dictionary=False):
+        self._cursor = raw_cursor
+        self._dictionary = dictionary
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    @property
+    def column_names(self):
+        return tuple(d[0] for d in self._cursor.description or ())
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, operation, params=()):
+        try:
+            self._cursor.execute(_to_qmark(operation), tuple(params or ()))
+        except sqlite3.Error as err:
+            raise _translate_error(err) from err
+
+    def executemany(self, operation, seq_params):
+        try:
+            self._cursor.executemany(_to_qmark(operation), [tuple(p) for p in seq_params])
+        except sqlite3.Error as err:
+            raise _translate_error(err) from err
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(r) for r in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """
+    Wraps a sqlite3 connection in the mysql.connector connection interface
+    (cursor(dictionary=...), ping, in_transaction, start_transaction).
+    """
+
+    def __init__(self, raw_conn):
+        self._conn = raw_conn
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self._conn.cursor(), dictionary=dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def start_transaction(self):
+        self._conn.execute("BEGIN")
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self, reconnect=False):
+        try:
+            self._conn.execute("SELECT 1")
+        except sqlite3.Error as err:
+            raise _translate_error(err) from err
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def close(self):
+        self._conn.close()
+
+
+# ===================== Bootstrapping =====================
+_bootstrap_lock = threading.Lock()
+_memory_keeper = None  # Holds the shared in-memory database open for the life of the process
+
+
+def _bootstrap_file(database, dump_path):
+    if os.path.exists(database) and os.path.getmtime(database) >= os.path.getmtime(dump_path):
+        return
+    temp_path = database + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    conn = sqlite3.connect(temp_path)
+    try:
+        load_dump(conn, dump_path)
+    finally:
+        conn.close()
+    os.replace(temp_path, database)
+
+
+def connect(database=DEFAULT_DATABASE, dump_path=SQL_DUMP_PATH):
+    """
+    Opens a connection to the embedded database, loading the SQL dump on first use.
+    """
+    global _memory_keeper
+    with _bootstrap_lock:
+        if database == ":memory:":
+            if _memory_keeper is None:
+                keeper = sqlite3.connect(SHARED_MEMORY_URI, uri=True, check_same_thread=False)
+                load_dump(keeper, dump_path)
+                _memory_keeper = keeper
+            raw_conn = sqlite3.connect(SHARED_MEMORY_URI, uri=True, check_same_thread=False)
+        else:
+            _bootstrap_file(database, dump_path)
+            raw_conn = sqlite3.connect(database, check_same_thread=False)
+    return SQLiteConnection(raw_conn)
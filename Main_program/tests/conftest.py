@@ -0,0 +1,50 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# The modules import each other as top-level modules (run from Main_program); the tests use the
+# embedded SQLite copy of the SQL dump, so no MySQL server is needed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("MUJ_DB_BACKEND", "sqlite")
+
+import db_pool  # noqa: E402  (needs the path and backend above)
+import faculty_directory  # noqa: E402
+import timetable_index  # noqa: E402
+
+
+@pytest.fixture
+def database_down(monkeypatch):
+    """
+    A MySQL pool pointing at a closed port (every checkout fails like an unreachable server), and
+    a fresh, never-loaded timetable index and faculty directory.
+    """
+    monkeypatch.setattr(db_pool, "_pool", db_pool.ConnectionPool(
+        pool_size=2, checkout_timeout=0.1, backend="mysql", host="127.0.0.1", port=9, user="root",
+        password="", database="ManipalUniversityJaipur", connection_timeout=1))
+    monkeypatch.setattr(timetable_index, "timetable_index", timetable_index.TimetableIndex())
+    monkeypatch.setattr(faculty_directory, "faculty_directory", faculty_directory.FacultyDirectory())
+
+
+@pytest.fixture
+def unmigrated_database(monkeypatch, tmp_path):
+    """
+    A SQLite database with only the dump's timetable columns (no migration 001 or 002), rows
+    stored out of order, and a fresh timetable index reading from it.
+    """
+    path = str(tmp_path / "unmigrated.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE timetable (id INTEGER PRIMARY KEY, teacher_name TEXT, day TEXT, "
+                 "period_number INTEGER, time_slot TEXT, subject TEXT, class_name TEXT, location TEXT)")
+    conn.executemany("INSERT INTO timetable (teacher_name, day, period_number, time_slot, subject, class_name, "
+                     "location) VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                         ("Abhay Sharma", "WED", 3, "10:40-11:30", "IoT", "CSE-A", "AB1-101"),
+                         ("Abhay Sharma", "MON", 2, "9:50-10:40", "DBMS", "CSE-B", "AB1-102"),
+                         ("Abhay Sharma", "MON", 1, "8:00-8:50", "ML", "CSE-C", "AB1-103"),
+                     ])
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(db_pool, "_pool", db_pool.ConnectionPool(pool_size=2, backend="sqlite",
+                                                                 sqlite_database=path))
+    monkeypatch.setattr(timetable_index, "timetable_index", timetable_index.TimetableIndex())
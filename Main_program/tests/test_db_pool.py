@@ -0,0 +1,28 @@
+import sqlite3
+
+import pytest
+
+from db_pool import ConnectionPool
+
+
+def test_failed_opens_free_their_slot():
+    pool = ConnectionPool(pool_size=2, checkout_timeout=0.1, backend="sqlite",
+                          sqlite_database="/nonexistent/dir/timetable.sqlite3")
+
+    # More failures than the pool size: each must raise the open error, never a checkout timeout
+    for _ in range(pool.pool_size + 1):
+        with pytest.raises(sqlite3.Error):
+            pool.get_connection()
+
+    assert pool.get_metrics()["open_connections"] == 0
+    assert pool.get_metrics()["timeouts"] == 0
+
+
+def test_connections_are_reused():
+    pool = ConnectionPool(pool_size=1, checkout_timeout=0.1, backend="sqlite", sqlite_database=":memory:")
+
+    pool.get_connection().close()
+    pool.get_connection().close()
+
+    metrics = pool.get_metrics()
+    assert (metrics["misses"], metrics["hits"], metrics["open_connections"]) == (1, 1, 1)
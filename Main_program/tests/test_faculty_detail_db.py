@@ -0,0 +1,30 @@
+import pytest
+
+from agent_factory import warm_caches
+from faculty_detail_db import (DB_UNAVAILABLE_MESSAGE, find_best_match_tool, get_faculty_by_research_area,
+                               get_faculty_info_details_by_name, search_faculty_info_by_name)
+from faculty_directory import get_faculty_directory
+from response_cache import current_data_version
+
+
+@pytest.mark.parametrize("tool, tool_input", [
+    (search_faculty_info_by_name, "sandeep"),
+    (get_faculty_by_research_area, "IoT"),
+    (get_faculty_info_details_by_name, "Sandeep Singh"),
+    (find_best_match_tool, "somya goyel"),
+])
+def test_tools_report_unavailable_database(database_down, tool, tool_input):
+    assert tool.invoke(tool_input) == DB_UNAVAILABLE_MESSAGE
+    directory = get_faculty_directory()
+    assert not directory.loaded and directory.last_error
+
+
+def test_startup_survives_unavailable_database(database_down):
+    warm_caches()
+
+    assert current_data_version() == (None, None)
+
+
+def test_tools_answer_once_loaded():
+    assert get_faculty_directory().loaded
+    assert search_faculty_info_by_name.invoke("sandeep singh").startswith("Details for")
@@ -0,0 +1,51 @@
+import pytest
+
+from intent_router import intent_router
+
+
+@pytest.mark.parametrize("question", [
+    # The tools answer for now/today only; a day or clock time needs the agent
+    "who is free on monday",
+    "which teachers are busy on friday",
+    "is abhay free on monday",
+    "abhay timetable on monday",
+    "abhay classes wednesday",
+    "who is free at 2:30",
+    "who is free at 3pm",
+    "is abhay free tomorrow",
+    "is abhay free during period 3 tomorrow",
+    # Research questions about one person, not a topic
+    "tell me about research in machine learning by abhay",
+    "what is abhay's research area",
+    "research area of sandeep singh",
+])
+def test_day_time_and_person_questions_go_to_the_agent(question):
+    assert intent_router.route(question) is None
+
+
+def test_period_range_keeps_the_weekday():
+    decision = intent_router.route("who is free during periods 3 to 5 on monday")
+    assert decision.tool.name == "get_teachers_free_during_periods"
+    assert decision.tool_input == {"periods": "3-5 monday"}
+
+
+@pytest.mark.parametrize("question", [
+    "who works on machine learning?",
+    "tell me about faculty working on machine learning",
+    "who has expertise in machine learning",
+])
+def test_research_topic_is_stripped_of_lead_in(question):
+    decision = intent_router.route(question)
+    assert decision.tool.name == "get_faculty_by_research_area"
+    assert decision.tool_input == {"search_research_area": "machine learning"}
+
+
+@pytest.mark.parametrize("question, tool", [
+    ("is abhay free now?", "check_if_free_now"),
+    ("who is free now", "get_free_teachers"),
+    ("which teachers are busy", "get_busy_teachers"),
+    ("show geeta's weekly timetable", "get_weekly_timetable"),
+    ("what is the email of sandeep singh?", "search_faculty_info_by_name"),
+])
+def test_current_time_questions_still_route(question, tool):
+    assert intent_router.route(question).tool.name == tool
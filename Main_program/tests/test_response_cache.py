@@ -0,0 +1,20 @@
+from intent_router import intent_router
+from response_cache import build_cache_key, normalize_question
+
+
+def cache_key(question):
+    return build_cache_key(question, intent_router.classify(question))[0]
+
+
+def test_normalize_question_keeps_word_order():
+    assert normalize_question("Is Abhay free before Geeta?", ["abhay", "geeta"]) == "<name> free before <name>"
+    assert normalize_question("is the lab before the lecture") != normalize_question("is the lecture before the lab")
+    assert normalize_question("room room 101") == "room room 101"
+
+
+def test_equivalent_phrasings_share_a_key():
+    assert cache_key("What is Dr. Geeta's email?") == cache_key("geeta email please")
+
+
+def test_swapped_people_get_different_keys():
+    assert cache_key("are abhay and geeta both free?") != cache_key("are geeta and abhay both free?")
@@ -0,0 +1,60 @@
+import pytest
+
+from agent_tracing import AgentTraceHandler
+from timetable_db_fetch import (DB_UNAVAILABLE_MESSAGE, check_if_free_now, get_busy_teachers,
+                                get_daily_timetable, get_faculty_availability, get_free_teachers,
+                                get_next_free_slot, get_teachers_free_during_periods, get_weekly_timetable)
+from timetable_index import get_timetable_index
+
+
+@pytest.mark.parametrize("tool, tool_input", [
+    (check_if_free_now, {"input_name": "abhay"}),
+    (get_weekly_timetable, {"input_name": "abhay"}),
+    (get_daily_timetable, {"input_name": "abhay"}),
+    (get_next_free_slot, {"input_name": "abhay"}),
+    (get_faculty_availability, {"faculty_name": "abhay"}),
+    (get_free_teachers, {}),
+    (get_busy_teachers, {}),
+    (get_teachers_free_during_periods, {"periods": "3-5"}),
+])
+def test_tools_report_unavailable_database(database_down, tool, tool_input):
+    assert tool.invoke(tool_input) == DB_UNAVAILABLE_MESSAGE
+    index = get_timetable_index()
+    assert not index.loaded and index.last_error
+
+
+def test_tools_answer_once_loaded():
+    assert get_timetable_index().loaded
+    assert check_if_free_now.invoke({"input_name": "abhay"}).startswith("Abhay")
+    assert get_weekly_timetable.invoke({"input_name": "abhay"}).startswith("Weekly Timetable for Abhay")
+
+
+def test_faculty_availability_reports_stage_timings():
+    tracer = AgentTraceHandler("availability of abhay")
+
+    text = get_faculty_availability.invoke({"faculty_name": "abhay"}, config={"callbacks": [tracer]})
+    message = get_faculty_availability.invoke({"name": "get_faculty_availability", "args": {"faculty_name": "abhay"},
+                                               "id": "call-1", "type": "tool_call"})
+
+    assert "Weekly Timetable" in text and "resolve=" not in text
+    assert list(message.artifact) == ["resolve", "fetch", "free_now", "weekly", "daily", "next_slot"]
+    tool_span = next(s for s in tracer.spans if s["kind"] == "tool")
+    stage_spans = [s for s in tracer.spans if s["kind"] == "stage"]
+    assert list(tool_span["stage_ms"]) == list(message.artifact)
+    assert [s["name"] for s in stage_spans][0] == "get_faculty_availability: resolve"
+    # Rounded to 0.1 ms
+    assert tool_span["start_ms"] - 0.1 <= stage_spans[0]["start_ms"]
+    assert stage_spans[-1]["end_ms"] <= tool_span["end_ms"] + 0.1
+
+
+def test_timetable_without_migration_001(unmigrated_database):
+    weekly = get_weekly_timetable.invoke({"input_name": "abhay"})
+    availability = get_faculty_availability.invoke({"faculty_name": "abhay"})
+
+    assert get_timetable_index().loaded
+    # Sorted by day and start time although the table has no day_code / start_min to order by
+    assert [line.split(" - ")[1] for line in weekly.splitlines() if " - " in line] == [
+        "ML in CSE-C at AB1-103", "DBMS in CSE-B at AB1-102", "IoT in CSE-A at AB1-101"]
+    assert weekly in availability
+    assert get_timetable_index().busy_slot("Abhay Sharma", "MON", 8 * 60 + 30).subject == "ML"
+    assert get_daily_timetable.invoke({"input_name": "abhay"}).startswith(("Timetable for", "No classes for"))
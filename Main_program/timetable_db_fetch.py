@@ -1,10 +1,17 @@
 import mysql.connector
 from datetime import datetime, time, timedelta
-from fuzzywuzzy import process  # Consider using rapidfuzz for better performance
+from rapidfuzz import process
 import sys
+from time import perf_counter
 import re
 import logging
 from langchain.tools import tool  # Import the tool decorator
+from langchain_core.callbacks.manager import dispatch_custom_event
+import db_pool
+from agent_tracing import STAGE_TIMINGS_EVENT
+from timetable_index import (TimetableIndex, get_timetable_index, get_loaded_timetable_index, to_minutes,
+                             minutes_to_hhmm, execute_with_time_columns, slot_order)
+from name_catalogue import NameCatalogue
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,19 +26,23 @@ def get_day_abbreviation(full_day_name):
     return full_day_name[:3].upper()
 
 
-# MySQL connection setup
+# Returned by the tools when no connection can be checked out (database down or pool exhausted),
+# and by the index-backed tools while the timetable index has never loaded
+DB_UNAVAILABLE_MESSAGE = "The timetable database is unavailable right now. Please try again in a moment."
+
+
+# MySQL connection setup (connections come from the shared pool in db_pool.py)
 def get_connection():
+    """
+    Returns a pooled connection, or None if the database is unreachable or the pool is exhausted
+    (PoolError on checkout timeout).
+    """
     try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",  # Set your MySQL password
-            database="ManipalUniversityJaipur"
-        )
+        conn = db_pool.get_connection()
         return conn
     except mysql.connector.Error as err:
         logging.error(f"Database connection error: {err}")
-        sys.exit(1)
+        return None
 
 
 # Function to get the current time (for debugging)
@@ -42,6 +53,8 @@ def get_current_time():
 # Helper function to get distinct teacher names from the database
 def get_teacher_names():
     conn = get_connection()
+    if conn is None:
+        return []
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT DISTINCT teacher_name FROM timetable")
@@ -60,7 +73,8 @@ def get_teacher_names():
 def fuzzy_match_name(input_name, name_list):
     matched = process.extractOne(input_name, name_list)
     if matched:
-        matched_name, confidence = matched
+        matched_name, confidence, _ = matched
+        confidence = round(confidence)
         logging.info(f"Fuzzy matched '{input_name}' to '{matched_name}' with confidence {confidence}%.")
         return matched_name, confidence
     else:
@@ -81,13 +95,20 @@ def parse_time(time_str):
 TIME_SLOT_PATTERN = re.compile(r'^(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})')
 
 
+# Cached teacher names, rebuilt only when the timetable index version changes
+teacher_catalogue = NameCatalogue(
+    names_fn=lambda: get_timetable_index().teacher_names,
+    version_fn=lambda: get_timetable_index().version,
+)
+
+
 # Function to map input name to matched name
 def get_matched_teacher_name(input_name):
-    teacher_names = get_teacher_names()
-    if not teacher_names:
+    matched_name, confidence = teacher_catalogue.match(input_name)
+    if not matched_name:
         logging.error("No teacher names available for matching.")
         return None, 0
-    matched_name, confidence = fuzzy_match_name(input_name, teacher_names)
+    logging.info(f"Fuzzy matched '{input_name}' to '{matched_name}' with confidence {confidence}%.")
     return matched_name, confidence
 
 
@@ -108,6 +129,29 @@ def is_time_in_range(time_range: str, check_time: str) -> bool:
         return False
 
 
+# Helper function to describe the next free gap using the merged busy blocks of an index
+def describe_next_free_slot(index, matched_name, day_of_week, day_of_week_full, current_datetime):
+    busy_now, gap_start, gap_end = index.next_gap(matched_name, day_of_week, to_minutes(current_datetime))
+
+    if busy_now:
+        if gap_end is not None:
+            return (
+                f"{matched_name} is currently busy and will be free after {minutes_to_hhmm(gap_start)} on {day_of_week_full}, until their next class at {minutes_to_hhmm(gap_end)}."
+            )
+        # No more classes after this one
+        return (
+            f"{matched_name} is currently busy and will be free after {minutes_to_hhmm(gap_start)} on {day_of_week_full} for the rest of the day."
+        )
+    if gap_end is not None:
+        # There's a free slot between now and the next class
+        return (
+            f"{matched_name} is free from {current_datetime.strftime('%H:%M')} to {minutes_to_hhmm(gap_end)} on {day_of_week_full}."
+        )
+
+    # If current time is after all classes
+    return f"{matched_name} is free for the rest of the day ({day_of_week_full})."
+
+
 # ===================== Decorated Tool Functions =====================
 current_time: str = None
 @tool
@@ -115,6 +159,9 @@ def check_if_free_now(input_name: str) -> str:
     """
     Checks if the specified teacher is free at the current time.
     """
+    index = get_loaded_timetable_index()
+    if index is None:
+        return DB_UNAVAILABLE_MESSAGE
     matched_name, confidence = get_matched_teacher_name(input_name)
     if not matched_name:
         return f"No matching teacher found for '{input_name}'."
@@ -128,53 +175,84 @@ def check_if_free_now(input_name: str) -> str:
             return "Invalid time format. Please use HH:MM."
         current_time_str = current_time
 
+    # Get today's full day name and convert to abbreviation
+    day_of_week_full = datetime.now().strftime("%A")  # e.g., 'Friday'
+    day_of_week = get_day_abbreviation(day_of_week_full)  # 'FRI'
+
+    # Binary search the in-memory timetable index instead of scanning rows
+    slot = index.busy_slot(matched_name, day_of_week, to_minutes(current_time_obj))
+    if slot:
+        # Person is busy right now
+        return (f"{matched_name} is currently busy teaching {slot.subject} in {slot.class_name} at {slot.location}. "
+                f"They will be free after {minutes_to_hhmm(slot.end)}.")
+
+    # If no match, they are free
+    return f"{matched_name} is free now."
+
+
+# Helper function to fetch a teacher's whole week in one query, ordered by day and start time
+# (None when the database is unavailable)
+def fetch_teacher_week(matched_name):
     conn = get_connection()
-    cursor = conn.cursor()
+    if conn is None:
+        return None
+    cursor = conn.cursor(dictionary=True)  # Use dictionary cursor for easier access
     try:
-        # Get today's full day name and convert to abbreviation
-        day_of_week_full = datetime.now().strftime("%A")  # e.g., 'Friday'
-        day_of_week = get_day_abbreviation(day_of_week_full)  # 'FRI'
-
         query = """
-            SELECT time_slot, subject, class_name, location
+            SELECT day, period_number, time_slot, subject, class_name, location, start_min, end_min
             FROM timetable
-            WHERE teacher_name = %s AND day = %s
+            WHERE teacher_name = %s
+            ORDER BY day_code, start_min
         """
-        cursor.execute(query, (matched_name, day_of_week))
+        legacy_query = """
+            SELECT day, period_number, time_slot, subject, class_name, location,
+                   NULL AS start_min, NULL AS end_min
+            FROM timetable
+            WHERE teacher_name = %s
+        """
+        migrated = execute_with_time_columns(cursor, query, legacy_query, (matched_name,))
         records = cursor.fetchall()
-        logging.info(f"Fetched {len(records)} records for {matched_name} on {day_of_week_full}.")
+        if not migrated:
+            records.sort(key=lambda r: slot_order(r['day'], r['time_slot']))
+        logging.info(f"Fetched weekly timetable for {matched_name}.")
     except mysql.connector.Error as err:
-        logging.error(f"Error fetching timetable: {err}")
+        logging.error(f"Error fetching weekly timetable: {err}")
         records = []
     finally:
         cursor.close()
         conn.close()
+    return records
+
+
+# Helper function to render one timetable line, replacing missing values with N/A
+def format_timetable_entry(record):
+    subject = record['subject'] if record['subject'] else "N/A"
+    class_name = record['class_name'] if record['class_name'] else "N/A"
+    location = record['location'] if record['location'] else "N/A"
+    return f"  {record['time_slot']} - {subject} in {class_name} at {location}\n"
+
 
-    # Check each time slot for a match
+def format_weekly_timetable(matched_name, records):
+    if not records:
+        return f"No timetable found for {matched_name}."
+    timetable = f"Weekly Timetable for {matched_name}:\n"
+    current_day = None
     for record in records:
-        time_slot, subject, class_name, location = record
-        match = TIME_SLOT_PATTERN.match(time_slot)
-        if match:
-            start_str, end_str = match.groups()
-            start_time = parse_time(start_str)
-            end_time = parse_time(end_str)
-            if not start_time or not end_time:
-                logging.warning(f"Invalid time format in time_slot: {time_slot}")
-                continue  # Skip invalid time formats
-
-            # Debug: Log time comparison
-            logging.info(f"Checking if {current_time_obj} is between {start_time} and {end_time} for {matched_name}.")
-
-            if start_time <= current_time_obj <= end_time:
-                # Person is busy right now
-                return (f"{matched_name} is currently busy teaching {subject} in {class_name} at {location}. "
-                        f"They will be free after {end_time.strftime('%H:%M')}.")
-        else:
-            logging.warning(f"Time slot '{time_slot}' does not match the expected format.")
-            continue  # Skip entries that don't match the pattern
+        # Start a new day section if the day has changed
+        if record['day'] != current_day:
+            current_day = record['day']
+            timetable += f"\n{current_day}:\n"
+        timetable += format_timetable_entry(record)
+    return timetable
 
-    # If no match, they are free
-    return f"{matched_name} is free now."
+
+def format_daily_timetable(matched_name, day, records):
+    if not records:
+        return f"No classes for {matched_name} today."
+    timetable = f"Timetable for {matched_name} on {day}\n"
+    for record in records:
+        timetable += format_timetable_entry(record)
+    return timetable
 
 
 @tool
@@ -183,52 +261,16 @@ def get_weekly_timetable(input_name: str) -> str:
     Retrieves the weekly timetable for the specified teacher.
     Can be used to deduce the timetable for an particular day of the week
     """
+    if get_loaded_timetable_index() is None:
+        return DB_UNAVAILABLE_MESSAGE
     matched_name, confidence = get_matched_teacher_name(input_name)
     if not matched_name:
         return f"No matching teacher found for '{input_name}'."
 
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)  # Use dictionary cursor for easier access
-    try:
-        # Define the order of days
-        days_order = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
-        # Fetch timetable for the entire week
-        query = """
-            SELECT day, time_slot, subject, class_name, location
-            FROM timetable
-            WHERE teacher_name = %s
-            ORDER BY FIELD(day, 'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN'), 
-                     STR_TO_DATE(SUBSTRING_INDEX(time_slot, '-', 1), '%H:%i')
-        """
-        cursor.execute(query, (matched_name,))
-        records = cursor.fetchall()
-        logging.info(f"Fetched weekly timetable for {matched_name}.")
-    except mysql.connector.Error as err:
-        logging.error(f"Error fetching weekly timetable: {err}")
-        records = []
-    finally:
-        cursor.close()
-        conn.close()
-
-    if records:
-        timetable = f"Weekly Timetable for {matched_name}:\n"
-        current_day = None
-        for record in records:
-            day = record['day']
-            time_slot = record['time_slot']
-            subject = record['subject'] if record['subject'] else "N/A"
-            class_name = record['class_name'] if record['class_name'] else "N/A"
-            location = record['location'] if record['location'] else "N/A"
-
-            # Start a new day section if the day has changed
-            if day != current_day:
-                current_day = day
-                timetable += f"\n{current_day}:\n"
-
-            timetable += f"  {time_slot} - {subject} in {class_name} at {location}\n"
-        return timetable
-    else:
-        return f"No timetable found for {matched_name}."
+    records = fetch_teacher_week(matched_name)
+    if records is None:
+        return DB_UNAVAILABLE_MESSAGE
+    return format_weekly_timetable(matched_name, records)
 
 
 @tool
@@ -236,44 +278,37 @@ def get_daily_timetable(input_name: str) -> str:
     """
     Retrieves today's timetable for the specified teacher.
     """
+    if get_loaded_timetable_index() is None:
+        return DB_UNAVAILABLE_MESSAGE
     matched_name, confidence = get_matched_teacher_name(input_name)
     if not matched_name:
         return f"No matching teacher found for '{input_name}'."
 
     day_of_week_full = datetime.now().strftime("%A")  # e.g., 'Friday'
+    day_of_week = get_day_abbreviation(day_of_week_full)  # 'FRI'
 
     conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Fetch distinct day values from the database for fuzzy matching
-        cursor.execute("SELECT DISTINCT day FROM timetable")
-        available_days = [row[0] for row in cursor.fetchall()]
-        logging.info("Fetched available days for fuzzy matching.")
-    except mysql.connector.Error as err:
-        logging.error(f"Error fetching available days: {err}")
-        available_days = []
-    finally:
-        cursor.close()
-        conn.close()
-
-    # Use fuzzy matching to find the closest match for today's day
-    matched_day, confidence_day = fuzzy_match_name(day_of_week_full, available_days)
-    if not matched_day:
-        return "Could not match the current day with available days in the timetable."
-
-    conn = get_connection()
-    cursor = conn.cursor()
+    if conn is None:
+        return DB_UNAVAILABLE_MESSAGE
+    cursor = conn.cursor(dictionary=True)
     try:
-        # Fetch timetable for the matched day
+        # Fetch timetable for today
         query = """
             SELECT time_slot, subject, class_name, location
             FROM timetable
             WHERE teacher_name = %s AND day = %s
-            ORDER BY STR_TO_DATE(SUBSTRING_INDEX(time_slot, '-', 1), '%H:%i')
+            ORDER BY start_min
+        """
+        legacy_query = """
+            SELECT time_slot, subject, class_name, location
+            FROM timetable
+            WHERE teacher_name = %s AND day = %s
         """
-        cursor.execute(query, (matched_name, matched_day))
+        migrated = execute_with_time_columns(cursor, query, legacy_query, (matched_name, day_of_week))
         records = cursor.fetchall()
-        logging.info(f"Fetched daily timetable for {matched_name} on {matched_day}.")
+        if not migrated:
+            records.sort(key=lambda r: slot_order(day_of_week, r['time_slot']))
+        logging.info(f"Fetched daily timetable for {matched_name} on {day_of_week}.")
     except mysql.connector.Error as err:
         logging.error(f"Error fetching daily timetable: {err}")
         records = []
@@ -281,18 +316,7 @@ def get_daily_timetable(input_name: str) -> str:
         cursor.close()
         conn.close()
 
-    if records:
-        timetable = (f"Timetable for {matched_name} on {matched_day} "
-                     f"(Confidence: {confidence_day}%)\n")
-        for record in records:
-            time_slot, subject, class_name, location = record
-            subject = subject if subject else "N/A"
-            class_name = class_name if class_name else "N/A"
-            location = location if location else "N/A"
-            timetable += f"  {time_slot} - {subject} in {class_name} at {location}\n"
-        return timetable
-    else:
-        return f"No classes for {matched_name} today."
+    return format_daily_timetable(matched_name, day_of_week, records)
 
 
 @tool
@@ -300,6 +324,9 @@ def get_free_teachers(current_time: str = None) -> str:
     """
     Retrieves a list of teachers who are free at the current time.
     """
+    index = get_loaded_timetable_index()
+    if index is None:
+        return DB_UNAVAILABLE_MESSAGE
 
     current_time_str = datetime.now().strftime("%H:%M")
 
@@ -307,31 +334,9 @@ def get_free_teachers(current_time: str = None) -> str:
     day_of_week_full = datetime.now().strftime("%A")
     day_of_week = get_day_abbreviation(day_of_week_full)  # e.g., 'FRI'
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Fetch all teachers
-        cursor.execute("SELECT DISTINCT teacher_name FROM timetable")
-        all_teachers = set(row[0] for row in cursor.fetchall())
-        logging.info("Fetched all teachers.")
-
-        # Fetch busy teachers at current_time using Python time comparison
-        cursor.execute("SELECT teacher_name, time_slot FROM timetable WHERE day = %s", (day_of_week,))
-        busy_teachers = set()
-        for row in cursor.fetchall():
-            teacher_name, time_slot = row
-            if is_time_in_range(time_slot, current_time_str):
-                busy_teachers.add(teacher_name)
-
-        logging.info(f"Fetched busy teachers at {current_time_str} on {day_of_week_full}.")
-
-        free_teachers = all_teachers - busy_teachers
-    except mysql.connector.Error as err:
-        logging.error(f"Error fetching free teachers: {err}")
-        free_teachers = set()
-    finally:
-        cursor.close()
-        conn.close()
+    # Exact interval check on the in-memory index (no database round trip)
+    free_teachers = index.free_teachers(day_of_week, to_minutes(datetime.now()))
+    logging.info(f"Fetched free teachers at {current_time_str} on {day_of_week_full}.")
 
     if free_teachers:
         return f"Teachers free right now ({current_time_str} on {day_of_week_full}): {', '.join(sorted(free_teachers))}"
@@ -344,6 +349,9 @@ def get_busy_teachers(current_time: str = None) -> str:
     """
     Retrieves a list of teachers who are busy at the current time.
     """
+    index = get_loaded_timetable_index()
+    if index is None:
+        return DB_UNAVAILABLE_MESSAGE
 
     current_time_str = datetime.now().strftime("%H:%M")
 
@@ -351,23 +359,9 @@ def get_busy_teachers(current_time: str = None) -> str:
     day_of_week_full = datetime.now().strftime("%A")
     day_of_week = get_day_abbreviation(day_of_week_full)  # e.g., 'FRI'
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT teacher_name, time_slot FROM timetable WHERE day = %s", (day_of_week,))
-        busy_teachers = []
-        for row in cursor.fetchall():
-            teacher_name, time_slot = row
-            if is_time_in_range(time_slot, current_time_str):
-                busy_teachers.append(teacher_name)
-
-        logging.info(f"Fetched busy teachers at {current_time_str} on {day_of_week_full}.")
-    except mysql.connector.Error as err:
-        logging.error(f"Error fetching busy teachers: {err}")
-        busy_teachers = []
-    finally:
-        cursor.close()
-        conn.close()
+    # Exact interval check on the in-memory index (no database round trip)
+    busy_teachers = index.busy_teachers(day_of_week, to_minutes(datetime.now()))
+    logging.info(f"Fetched busy teachers at {current_time_str} on {day_of_week_full}.")
 
     if busy_teachers:
         return f"Teachers busy right now ({current_time_str} on {day_of_week_full}): {', '.join(sorted(busy_teachers))}"
@@ -375,11 +369,48 @@ def get_busy_teachers(current_time: str = None) -> str:
         return "No teachers are busy right now."
 
 
+@tool
+def get_teachers_free_during_periods(periods: str) -> str:
+    """
+    Retrieves teachers who are free for every period in a range, given as "start-end" with an
+    optional day (e.g. "3-5" or "3-5 Monday"); the day defaults to today.
+    """
+    index = get_loaded_timetable_index()
+    if index is None:
+        return DB_UNAVAILABLE_MESSAGE
+    numbers = [int(n) for n in re.findall(r'\d{1,2}', periods)]
+    if not numbers:
+        return "Please give the periods as a range, e.g. 3-5."
+    start_period, end_period = min(numbers[:2]), max(numbers[:2])
+    day_match = re.search(r'\b(mon|tue|wed|thu|fri|sat|sun)[a-z]*', periods, re.I)
+    day_of_week_full = day_match.group(0).capitalize() if day_match else datetime.now().strftime("%A")
+    day_of_week = get_day_abbreviation(day_of_week_full)
+
+    occupancy = index.occupancy
+    free_teachers = occupancy.free_during_periods(day_of_week, start_period, end_period)
+    logging.info(f"Fetched teachers free during periods {start_period}-{end_period} on {day_of_week_full}.")
+
+    first_range = occupancy.period_time_range(start_period)
+    last_range = occupancy.period_time_range(end_period)
+    span = ""
+    if first_range and last_range:
+        span = f", {minutes_to_hhmm(first_range[0])}-{minutes_to_hhmm(last_range[1])}"
+
+    if free_teachers:
+        return (f"Teachers free during periods {start_period}-{end_period} ({day_of_week_full}{span}): "
+                f"{', '.join(sorted(free_teachers))}")
+    else:
+        return f"No teachers are free during periods {start_period}-{end_period} on {day_of_week_full}."
+
+
 @tool
 def get_next_free_slot(input_name: str ) -> str:
     """
     Finds the next free slot for the specified teacher after the current time.
     """
+    index = get_loaded_timetable_index()
+    if index is None:
+        return DB_UNAVAILABLE_MESSAGE
     matched_name, confidence = get_matched_teacher_name(input_name)
     if not matched_name:
         return f"No matching teacher found for '{input_name}'."
@@ -396,93 +427,94 @@ def get_next_free_slot(input_name: str ) -> str:
     day_of_week_full = current_datetime.strftime("%A")
     day_of_week = get_day_abbreviation(day_of_week_full)
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        query = """
-            SELECT time_slot
-            FROM timetable
-            WHERE teacher_name = %s AND day = %s
-        """
-        cursor.execute(query, (matched_name, day_of_week))
-        records = cursor.fetchall()
-        logging.info(f"Fetched {len(records)} time slots for {matched_name} on {day_of_week_full}.")
-    except mysql.connector.Error as err:
-        logging.error(f"Error fetching timetable for next free slot: {err}")
-        records = []
-    finally:
-        cursor.close()
-        conn.close()
-
-    # Parse and sort the time slots
-    time_slots = []
-    for record in records:
-        time_slot = record[0]
-        try:
-            start_str, end_str = re.split(r'\s*-\s*', time_slot)
-            start_time = datetime.strptime(f"{current_datetime.strftime('%Y-%m-%d')} {start_str}", "%Y-%m-%d %H:%M")
-            end_time = datetime.strptime(f"{current_datetime.strftime('%Y-%m-%d')} {end_str}", "%Y-%m-%d %H:%M")
-            time_slots.append((start_time, end_time))
-        except ValueError:
-            logging.warning(f"Invalid time slot format: {time_slot}")
-            continue
+    # Binary search the merged busy blocks in the timetable index
+    return describe_next_free_slot(index, matched_name, day_of_week, day_of_week_full, current_datetime)
 
-    # Sort the time slots by start_time
-    time_slots.sort(key=lambda x: x[0])
 
-    for i, (start, end) in enumerate(time_slots):
-        if current_datetime < start:
-            # There's a free slot between now and the next class
-            return (
-                f"{matched_name} is free from {current_datetime.strftime('%H:%M')} to {start.strftime('%H:%M')} on {day_of_week_full}."
-            )
-        elif start <= current_datetime <= end:
-            # Currently busy, check if there's another class later in the day
-            if i + 1 < len(time_slots):
-                next_start, next_end = time_slots[i + 1]
-                return (
-                    f"{matched_name} is currently busy and will be free after {end.strftime('%H:%M')} on {day_of_week_full}, until their next class at {next_start.strftime('%H:%M')}."
-                )
-            else:
-                # No more classes after this one
-                return (
-                    f"{matched_name} is currently busy and will be free after {end.strftime('%H:%M')} on {day_of_week_full} for the rest of the day."
-                )
+# Helper function to hand a tool's stage timings to the trace (see agent_tracing.STAGE_TIMINGS_EVENT)
+def report_stage_timings(timings):
+    logging.info(f"Stage timings (ms): {', '.join(f'{stage}={ms:.1f}' for stage, ms in timings.items())}")
+    try:
+        dispatch_custom_event(STAGE_TIMINGS_EVENT, dict(timings))
+    except RuntimeError:
+        pass  # Called outside a tool run (no callbacks to report to)
+    return dict(timings)
 
-    # If current time is after all classes
-    return f"{matched_name} is free for the rest of the day ({day_of_week_full})."
 
-@tool
-def get_faculty_availability(faculty_name: str) -> str:
+@tool(response_format="content_and_artifact")
+def get_faculty_availability(faculty_name: str) -> tuple[str, dict]:
     """
     Returns a comprehensive availability status of a faculty member.
     It checks if the faculty is free now, retrieves their weekly and daily timetables,
     and provides information about their next free slot.
     """
+    timings = {}
+    stage_start = perf_counter()
+
+    def end_stage(stage):
+        nonlocal stage_start
+        now = perf_counter()
+        timings[stage] = (now - stage_start) * 1000
+        stage_start = now
+
+    # Resolve the name once for every view
+    if get_loaded_timetable_index() is None:
+        return DB_UNAVAILABLE_MESSAGE, report_stage_timings(timings)
+    matched_name, confidence = get_matched_teacher_name(faculty_name)
+    end_stage("resolve")
+    if not matched_name:
+        return f"No matching teacher found for '{faculty_name}'.", report_stage_timings(timings)
+
+    # Fetch the whole week once and index it for the time-based views
+    records = fetch_teacher_week(matched_name)
+    if records is None:
+        return DB_UNAVAILABLE_MESSAGE, report_stage_timings(timings)
+    week_index = TimetableIndex()
+    week_index.build([
+        (matched_name, r['day'], r['period_number'], r['time_slot'], r['subject'], r['class_name'], r['location'],
+         r['start_min'], r['end_min'])
+        for r in records
+    ])
+    end_stage("fetch")
+
+    if current_time is None:
+        now = datetime.now()
+    else:
+        parsed_time = parse_time(current_time)
+        if parsed_time is None:
+            return "Invalid time format. Please use HH:MM.", report_stage_timings(timings)
+        now = datetime.combine(datetime.now().date(), parsed_time)
+    day_of_week_full = now.strftime("%A")
+    day_of_week = get_day_abbreviation(day_of_week_full)
+    current_minute = to_minutes(now)
     status = []
 
     # Check if the faculty is free now
-    free_now = check_if_free_now.invoke({"input_name": faculty_name, "current_time": current_time})
-    status.append(free_now)
+    slot = week_index.busy_slot(matched_name, day_of_week, current_minute)
+    if slot:
+        status.append(f"{matched_name} is currently busy teaching {slot.subject} in {slot.class_name} at {slot.location}. "
+                      f"They will be free after {minutes_to_hhmm(slot.end)}.")
+    else:
+        status.append(f"{matched_name} is free now.")
+    end_stage("free_now")
 
-    # Get weekly timetable
-    weekly_tt = get_weekly_timetable.invoke({"input_name": faculty_name})
-    status.append(weekly_tt)
+    # Weekly timetable
+    status.append(format_weekly_timetable(matched_name, records))
+    end_stage("weekly")
 
-    # Get today's timetable
-    daily_tt = get_daily_timetable.invoke({"input_name": faculty_name})
-    status.append(daily_tt)
+    # Today's timetable
+    status.append(format_daily_timetable(matched_name, day_of_week,
+                                         [r for r in records if r['day'] == day_of_week]))
+    end_stage("daily")
 
-    # Get next free slot
-    if current_time:
-        next_free = get_next_free_slot.invoke({"input_name": faculty_name, "current_time": current_time})
-    else:
-        next_free = get_next_free_slot.invoke({"input_name": faculty_name})
-    status.append(next_free)
+    # Next free slot
+    status.append(describe_next_free_slot(week_index, matched_name, day_of_week, day_of_week_full, now))
+    end_stage("next_slot")
 
-    # Compile all information
+    # Compile all information; the stage timings are the tool artifact (and a span in the trace
+    # waterfall), so the text the LLM and the user see stays free of them
     availability_info = "\n\n".join(status)
-    return availability_info
+    return availability_info, report_stage_timings(timings)
 
 
 # ===================== End of Decorated Tool Functions =====================
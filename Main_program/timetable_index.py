@@ -0,0 +1,363 @@
+import mysql.connector
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+import logging
+import re
+import threading
+import time
+import db_pool
+from occupancy_matrix import OccupancyMatrix
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# How often (seconds) the cheap version query runs before serving from memory
+VERSION_CHECK_INTERVAL = 30
+# Force a full reload after this many seconds (a safety net; edits are detected by the version query)
+MAX_INDEX_AGE = 300
+
+# Regular expression pattern to extract start and end times
+TIME_SLOT_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})')
+
+# Canonical day order, as migration 001's day_code (MON = 1 ... SUN = 7, 0 if unrecognised)
+DAY_CODES = {day: code for code, day in enumerate(["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"], start=1)}
+
+# One scheduled class, with start/end stored as minutes since midnight
+TimetableSlot = namedtuple(
+    'TimetableSlot',
+    ['teacher_name', 'day', 'period_number', 'start', 'end', 'time_slot', 'subject', 'class_name', 'location']
+)
+
+
+def parse_time_slot(time_slot):
+    """
+    Converts a 'HH:MM-HH:MM' time slot into (start_minutes, end_minutes).
+    Returns None if the slot does not match the expected format.
+    """
+    match = TIME_SLOT_PATTERN.match(time_slot or "")
+    if not match:
+        return None
+    start_h, start_m, end_h, end_m = (int(part) for part in match.groups())
+    return start_h * 60 + start_m, end_h * 60 + end_m
+
+
+def to_minutes(time_obj):
+    return time_obj.hour * 60 + time_obj.minute
+
+
+def minutes_to_hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def day_code(day):
+    return DAY_CODES.get((day or "").strip()[:3].upper(), 0)
+
+
+def slot_order(day, time_slot):
+    """
+    Sort key matching ORDER BY day_code, start_min, for rows read without migration 001's columns
+    (slots that do not parse come first, like NULL start_min).
+    """
+    parsed = parse_time_slot(time_slot)
+    return day_code(day), parsed[0] if parsed else -1
+
+
+def execute_with_time_columns(cursor, query, legacy_query, params=()):
+    """
+    Runs `query`, which uses the generated columns of migration 001 (start_min, end_min,
+    day_code). On a database where only the dump was imported, runs `legacy_query` (the same
+    rows, start_min/end_min selected as NULL, no ORDER BY on the missing columns) and returns
+    False, so the caller sorts with slot_order() / parses time_slot itself.
+    """
+    try:
+        cursor.execute(query, params)
+        return True
+    except mysql.connector.Error as err:
+        logging.warning(f"timetable has no start_min/end_min/day_code columns (apply DB Files/migrations/001), "
+                        f"sorting by time_slot instead: {err}")
+    cursor.execute(legacy_query, params)
+    return False
+
+
+def fetch_timetable_version(conn):
+    """
+    Cheap change detector for the timetable table: (row count, highest id, change counter).
+    The counter is bumped by the triggers of migration 002 on every INSERT, UPDATE and DELETE;
+    without the migration it is None and only inserts and deletes are noticed.
+    """
+    cursor = conn.cursor()
+    try:
+        try:
+            cursor.execute("SELECT COUNT(*), MAX(id), (SELECT MAX(version) FROM timetable_version) FROM timetable")
+        except mysql.connector.Error as err:
+            logging.warning(f"timetable_version is missing (apply migration 002), in-place edits go unnoticed: {err}")
+            cursor.execute("SELECT COUNT(*), MAX(id), NULL FROM timetable")
+        return tuple(cursor.fetchone())
+    finally:
+        cursor.close()
+
+
+class TimetableIndex:
+    """
+    In-memory interval index over the timetable table.
+    Keeps per-(teacher, day) sorted start/end arrays and per-day interval lists,
+    so free/busy/next-gap questions are answered with binary search.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # version is what the name catalogue and response cache key on; db_version is the last
+        # fetch_timetable_version() result, compared on each check
+        self.version = None
+        self.db_version = None
+        self._loads = 0
+        # loaded stays False until the first successful refresh(); an empty index then means "no data",
+        # not "no classes". last_error is the error of the latest failed load or version check
+        self.loaded = False
+        self.last_error = None
+        self.loaded_at = 0.0
+        self.checked_at = 0.0
+        self.teacher_names = set()
+        # (teacher, day) -> sorted slots, start minutes, running max of end minutes
+        self._teacher_slots = {}
+        self._teacher_starts = {}
+        self._teacher_max_ends = {}
+        # (teacher, day) -> merged busy blocks (touching classes joined), used for gap search
+        self._teacher_blocks = {}
+        # day -> slots sorted by start, start minutes, longest slot length
+        self._day_slots = {}
+        self._day_starts = {}
+        self._day_max_length = {}
+        # Vectorised teachers x days x periods view for department-wide queries
+        self.occupancy = OccupancyMatrix.from_slots([])
+
+    # -------------------- Loading --------------------
+
+    def build(self, rows):
+        """
+        Rebuilds every structure from (teacher_name, day, period_number, time_slot,
+        subject, class_name, location, start_min, end_min) rows.
+        start_min/end_min come from the migrated schema; when they are NULL the
+        time_slot string is parsed instead.
+        """
+        teacher_slots = {}
+        day_slots = {}
+        teacher_names = set()
+        for teacher_name, day, period_number, time_slot, subject, class_name, location, start_min, end_min in rows:
+            teacher_names.add(teacher_name)
+            if start_min is None or end_min is None:
+                parsed = parse_time_slot(time_slot)
+                if parsed is None:
+                    logging.warning(f"Time slot '{time_slot}' does not match the expected format.")
+                    continue
+                start_min, end_min = parsed
+            slot = TimetableSlot(teacher_name, day, period_number, start_min, end_min,
+                                 time_slot, subject, class_name, location)
+            teacher_slots.setdefault((teacher_name, day), []).append(slot)
+            day_slots.setdefault(day, []).append(slot)
+
+        teacher_starts, teacher_max_ends, teacher_blocks = {}, {}, {}
+        for key, slots in teacher_slots.items():
+            slots.sort(key=lambda s: (s.start, s.end))
+            teacher_starts[key] = [s.start for s in slots]
+            max_ends, running = [], -1
+            blocks = []
+            for s in slots:
+                running = max(running, s.end)
+                max_ends.append(running)
+                if blocks and s.start <= blocks[-1][1]:
+                    blocks[-1][1] = max(blocks[-1][1], s.end)
+                else:
+                    blocks.append([s.start, s.end])
+            teacher_max_ends[key] = max_ends
+            teacher_blocks[key] = ([b[0] for b in blocks], [b[1] for b in blocks])
+
+        day_starts, day_max_length = {}, {}
+        for day, slots in day_slots.items():
+            slots.sort(key=lambda s: s.start)
+            day_starts[day] = [s.start for s in slots]
+            day_max_length[day] = max(s.end - s.start for s in slots)
+
+        occupancy = OccupancyMatrix.from_slots(
+            [s for slots in teacher_slots.values() for s in slots], teacher_names
+        )
+
+        with self._lock:
+            self.teacher_names = teacher_names
+            self._teacher_slots = teacher_slots
+            self._teacher_starts = teacher_starts
+            self._teacher_max_ends = teacher_max_ends
+            self._teacher_blocks = teacher_blocks
+            self._day_slots = day_slots
+            self._day_starts = day_starts
+            self._day_max_length = day_max_length
+            self.occupancy = occupancy
+
+    def refresh(self):
+        """
+        Reloads the whole timetable table into memory. On a database error (including pool
+        exhaustion) the current index is kept, the error is kept in last_error and False is returned.
+        """
+        try:
+            conn = db_pool.get_connection()
+        except mysql.connector.Error as err:
+            logging.error(f"Error loading timetable index: {err}")
+            self.last_error = str(err)
+            return False
+        cursor = conn.cursor()
+        try:
+            version = fetch_timetable_version(conn)
+            # build() sorts the slots itself and parses time_slot where start_min/end_min are NULL
+            execute_with_time_columns(cursor, """
+                SELECT teacher_name, day, period_number, time_slot, subject, class_name, location,
+                       start_min, end_min
+                FROM timetable
+                ORDER BY teacher_name, day, start_min
+            """, """
+                SELECT teacher_name, day, period_number, time_slot, subject, class_name, location,
+                       NULL, NULL
+                FROM timetable
+            """)
+            rows = cursor.fetchall()
+        except mysql.connector.Error as err:
+            logging.error(f"Error loading timetable index: {err}")
+            self.last_error = str(err)
+            return False
+        finally:
+            cursor.close()
+            conn.close()
+
+        self.build(rows)
+        with self._lock:
+            self._loads += 1
+            self.db_version = version
+            # Without the change counter a reload may carry unseen in-place edits, so it always
+            # counts as a new version for the caches that key on it
+            self.version = version if version[-1] is not None else version + (self._loads,)
+            self.loaded_at = self.checked_at = time.monotonic()
+            self.loaded = True
+            self.last_error = None
+        logging.info(f"Loaded timetable index with {len(rows)} rows.")
+        return True
+
+    def refresh_if_changed(self):
+        """
+        Reloads only when the version query reports a change or the index is too old.
+        The version query itself runs at most every VERSION_CHECK_INTERVAL seconds.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.version is None or now - self.loaded_at > MAX_INDEX_AGE:
+                return self.refresh()
+            if now - self.checked_at < VERSION_CHECK_INTERVAL:
+                return False
+            self.checked_at = now
+
+        try:
+            conn = db_pool.get_connection()
+        except mysql.connector.Error as err:
+            logging.error(f"Error checking timetable version: {err}")
+            self.last_error = str(err)
+            return False
+        try:
+            version = fetch_timetable_version(conn)
+        except mysql.connector.Error as err:
+            logging.error(f"Error checking timetable version: {err}")
+            self.last_error = str(err)
+            return False
+        finally:
+            conn.close()
+        if version != self.db_version:
+            logging.info("Timetable changed, rebuilding index.")
+            return self.refresh()
+        return False
+
+    # -------------------- Queries --------------------
+
+    def busy_slot(self, teacher_name, day, minute):
+        """
+        Returns the class the teacher is in at `minute` (inclusive bounds), or None.
+        """
+        key = (teacher_name, day)
+        starts = self._teacher_starts.get(key)
+        if not starts:
+            return None
+        i = bisect_right(starts, minute) - 1
+        if i < 0 or self._teacher_max_ends[key][i] < minute:
+            return None
+        slots = self._teacher_slots[key]
+        # Walk back over the (rare) overlapping classes until one covers the minute
+        while i >= 0:
+            if slots[i].end >= minute:
+                return slots[i]
+            i -= 1
+        return None
+
+    def is_busy(self, teacher_name, day, minute):
+        return self.busy_slot(teacher_name, day, minute) is not None
+
+    def is_free(self, teacher_name, day, minute):
+        return self.busy_slot(teacher_name, day, minute) is None
+
+    def busy_teachers(self, day, minute):
+        starts = self._day_starts.get(day)
+        if not starts:
+            return set()
+        # Only slots starting within one slot-length before `minute` can cover it
+        lo = bisect_left(starts, minute - self._day_max_length[day])
+        hi = bisect_right(starts, minute)
+        return {s.teacher_name for s in self._day_slots[day][lo:hi] if s.end >= minute}
+
+    def free_teachers(self, day, minute):
+        return self.teacher_names - self.busy_teachers(day, minute)
+
+    def next_gap(self, teacher_name, day, minute):
+        """
+        Finds the next free gap at or after `minute`.
+        Returns (busy_now, gap_start, gap_end); gap_end is None when the teacher
+        has no further classes that day.
+        """
+        block_starts, block_ends = self._teacher_blocks.get((teacher_name, day), ([], []))
+        i = bisect_right(block_starts, minute) - 1
+        if i >= 0 and block_ends[i] >= minute:
+            gap_start = block_ends[i]
+            gap_end = block_starts[i + 1] if i + 1 < len(block_starts) else None
+            return True, gap_start, gap_end
+        gap_end = block_starts[i + 1] if i + 1 < len(block_starts) else None
+        return False, minute, gap_end
+
+    def change_minutes(self, day):
+        """
+        Sorted minutes of `day` at which someone's free/busy state changes (class starts, and the
+        minute after each class ends, since end bounds are inclusive).
+        """
+        slots = self._day_slots.get(day, [])
+        return sorted({s.start for s in slots} | {s.end + 1 for s in slots})
+
+    def day_slots(self, teacher_name, day):
+        return list(self._teacher_slots.get((teacher_name, day), []))
+
+
+# ===================== Process-wide Index =====================
+timetable_index = TimetableIndex()
+
+
+def get_timetable_index():
+    """
+    Returns the shared index, loading it on first use and reloading it when the table changes.
+    """
+    timetable_index.refresh_if_changed()
+    return timetable_index
+
+
+def get_loaded_timetable_index():
+    """
+    Like get_timetable_index(), but returns None while the index has never loaded (database
+    unreachable), so callers can report that instead of answering from an empty timetable.
+    """
+    index = get_timetable_index()
+    return index if index.loaded else None
+
+
+def refresh_timetable_index():
+    return timetable_index.refresh()
@@ -0,0 +1,118 @@
+from collections import Counter, namedtuple
+from rapidfuzz import utils
+import logging
+import math
+import re
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Number of tools offered to the agent per question
+TOOL_SELECTION_K = 4
+# A question whose best tool scores below this gets every tool (nothing in it points at a tool)
+TOOL_SELECTION_MIN_SCORE = 0.5
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Words users say that the tool docstrings do not, appended to the indexed text of each tool
+TOOL_KEYWORD_HINTS = {
+    "get_faculty_by_research_area": "research expertise expert topic specialization works on domain",
+    "search_faculty_info_by_name": "contact email phone mobile cabin room office seat extension details",
+    "find_best_match_tool": "contact email phone photo details other department",
+    "check_if_free_now": "free now available currently busy right now",
+    "get_weekly_timetable": "weekly week timetable schedule classes",
+    "get_daily_timetable": "today daily timetable schedule classes lectures",
+    "get_free_teachers": "who free available teachers faculty now",
+    "get_busy_teachers": "who busy teaching teachers faculty now",
+    "get_teachers_free_during_periods": "periods period range free during between",
+    "get_next_free_slot": "next free slot when later",
+    "get_faculty_availability": "availability available status",
+}
+STOP_WORDS = {"a", "about", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "e", "for", "from",
+              "g", "given", "i", "if", "in", "is", "it", "like", "me", "of", "on", "or", "please", "the", "their",
+              "them", "this", "to", "too", "u", "what", "whats", "with", "you"}
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Rough token count of a prompt (words and punctuation), to compare prompt sizes
+PROMPT_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+ToolSelection = namedtuple('ToolSelection', ['tools', 'scores', 'fallback'])
+
+
+def singular(word):
+    if word.endswith("sses"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """
+    Lowercase words without stop words, with plurals reduced ("teachers" -> "teacher", "classes" -> "class").
+    """
+    words = WORD_PATTERN.findall(utils.default_process(text.replace("_", " ")))
+    return [singular(w) for w in words if w not in STOP_WORDS]
+
+
+def count_prompt_tokens(text):
+    return len(PROMPT_TOKEN_PATTERN.findall(text))
+
+
+class ToolSelector:
+    """
+    BM25 index over the tool names, docstrings and keyword hints. select() returns the top-k
+    tools for a question (in their original order), or every tool when none of them match.
+    """
+
+    def __init__(self, tools, k=TOOL_SELECTION_K, min_score=TOOL_SELECTION_MIN_SCORE):
+        self.tools = list(tools)
+        self.k = k
+        self.min_score = min_score
+        self._documents = [Counter(tokenize(f"{tool.name} {tool.description} "
+                                            f"{TOOL_KEYWORD_HINTS.get(tool.name, '')}"))
+                           for tool in self.tools]
+        self._lengths = [sum(document.values()) for document in self._documents]
+        self._average_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        document_frequency = Counter(term for document in self._documents for term in document)
+        count = len(self._documents)
+        self._idf = {term: math.log(1 + (count - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+        self._lock = threading.Lock()
+        self.stats = {"selections": 0, "fallbacks": 0, "tools_offered": 0}
+
+    def score(self, question):
+        terms = tokenize(question)
+        scores = []
+        for document, length in zip(self._documents, self._lengths):
+            total = 0.0
+            for term in terms:
+                frequency = document.get(term, 0)
+                if frequency:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self._average_length)
+                    total += self._idf[term] * frequency * (BM25_K1 + 1) / (frequency + norm)
+            scores.append(total)
+        return scores
+
+    def select(self, question):
+        scores = self.score(question)
+        ranked = sorted(range(len(self.tools)), key=lambda i: scores[i], reverse=True)
+        fallback = not ranked or scores[ranked[0]] < self.min_score
+        if fallback:
+            chosen = set(range(len(self.tools)))
+        else:
+            chosen = {i for i in ranked[:self.k] if scores[i] > 0}
+        tools = [tool for i, tool in enumerate(self.tools) if i in chosen]
+        with self._lock:
+            self.stats["selections"] += 1
+            self.stats["fallbacks"] += int(fallback)
+            self.stats["tools_offered"] += len(tools)
+        logging.info(f"Tool selection for '{question}': {[tool.name for tool in tools]}"
+                     f"{' (fallback to all tools)' if fallback else ''}")
+        return ToolSelection(tools, {self.tools[i].name: round(scores[i], 2) for i in ranked[:self.k]}, fallback)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["avg_tools_offered"] = round(stats["tools_offered"] / stats["selections"], 1) if stats["selections"] else 0.0
+        return stats